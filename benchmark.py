@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark for the scraper, run against the local mock CNPq server.
+
+Each case (corpus size x latency profile) starts mock_cnpq_server.py in its own
+process, runs the full search → detail → store pipeline in a fresh child
+process, and reports throughput, request latency percentiles, parse CPU time,
+DB write time and peak RSS as JSON. A previous report can be given as a
+baseline to see whether a change actually made the crawler faster.
+
+Usage:
+    python benchmark.py --sizes 1000 10000 --profiles lan cnpq --output bench.json
+    python benchmark.py --sizes 1000 --baseline bench.json --fail-on-regression 10
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+
+MOCK_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_cnpq_server.py')
+
+# Mock server latency / fault settings per profile
+LATENCY_PROFILES = {
+    'local': {'latency': 0.0, 'latency_jitter': 0.0, 'rate_429': 0.0, 'captcha_rate': 0.0},
+    'lan': {'latency': 0.02, 'latency_jitter': 0.005, 'rate_429': 0.0, 'captcha_rate': 0.0},
+    'cnpq': {'latency': 0.35, 'latency_jitter': 0.15, 'rate_429': 0.01, 'captcha_rate': 0.01},
+    'degraded': {'latency': 1.0, 'latency_jitter': 0.5, 'rate_429': 0.05, 'captcha_rate': 0.05},
+}
+
+# Metrics compared against a baseline: name -> True if higher is better
+COMPARED_METRICS = {
+    'researchers_per_minute': True,
+    'requests_per_second': True,
+    'latency_p50_ms': False,
+    'latency_p95_ms': False,
+    'latency_p99_ms': False,
+    'parse_cpu_seconds': False,
+    'db_write_seconds': False,
+    'peak_rss_mb': False,
+    'peak_child_rss_mb': False,
+}
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    """Peak resident set size in MB of this process, or of its largest finished child with RUSAGE_CHILDREN
+
+    ru_maxrss is KB on Linux, bytes on macOS.
+    """
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextlib.contextmanager
+def mock_server(size, profile, seed, match_ratio):
+    """Run mock_cnpq_server.py in a separate process so it doesn't compete for the scraper's GIL"""
+    port = free_port()
+    settings = LATENCY_PROFILES[profile]
+    command = [
+        sys.executable, MOCK_SERVER, '--port', str(port), '--researchers', str(size), '--seed', str(seed),
+        '--match-ratio', str(match_ratio), '--latency', str(settings['latency']),
+        '--latency-jitter', str(settings['latency_jitter']), '--rate-429', str(settings['rate_429']),
+        '--captcha-rate', str(settings['captcha_rate']),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    stats_url = f"http://127.0.0.1:{port}/__stats"
+
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                urllib.request.urlopen(stats_url, timeout=1).read()
+                break
+            except OSError:
+                if process.poll() is not None or time.time() > deadline:
+                    raise RuntimeError(f"Mock server did not start on port {port}")
+                time.sleep(0.1)
+        yield f"http://127.0.0.1:{port}", stats_url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def run_case(case):
+    """Run one benchmark case in this process and return its measurements (called in a child process)"""
+    import main  # Imported here so the parent process stays small
+
+    logging.getLogger().setLevel(logging.WARNING)
+    db_path = os.path.join(case['workdir'], 'benchmark.db')
+    scraper = main.CNPqScraper(
+        max_workers=case['max_workers'],
+        base_url=f"{case['server_url']}/buscatextual",
+        lattes_url=f"{case['server_url']}/lattes",
+        # Measure the pipeline, not the politeness settings
+        rate_limits=None if case['rate_limits'] else {name: None for name in main.TokenBucketRateLimiter.DEFAULT_RATES},
+        # No cache, archive or parse memo: every case starts cold and writes nothing outside workdir
+        cache_dir=None,
+        archive_dir=None,
+        memo_dir=None,
+        db_path=db_path,
+    )
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            cnpq_ids = scraper.scrape_all(
+                search_terms=main.SEARCH_TERMS[:case['terms']], get_details=True, batch_size=case['batch_size']
+            )
+    finally:
+        scraper.close()
+    wall = time.perf_counter() - started
+    process_cpu = time.process_time() - cpu_started
+
+    metrics = scraper.metrics.snapshot()
+    server_stats = json.load(urllib.request.urlopen(case['stats_url'], timeout=10))
+
+    def ms(seconds):
+        return round(seconds * 1000, 2) if seconds is not None else None
+
+    return {
+        'size': case['size'],
+        'profile': case['profile'],
+        'terms': case['terms'],
+        'researchers': len(cnpq_ids),
+        'wall_seconds': round(wall, 3),
+        'researchers_per_minute': round(len(cnpq_ids) / (wall / 60), 1) if wall else None,
+        'requests': metrics['requests'],
+        'requests_per_second': round(metrics['requests'] / wall, 2) if wall else None,
+        'latency_p50_ms': ms(metrics['latency_p50']),
+        'latency_p95_ms': ms(metrics['latency_p95']),
+        'latency_p99_ms': ms(metrics['latency_p99']),
+        'parse_cpu_seconds': round(sum(metrics['parse_cpu_seconds'].values()), 3),
+        'parse_cpu_by_parser': metrics['parse_cpu_seconds'],
+        'parse_calls': metrics['parse_calls'],
+        'db_write_seconds': round(metrics['db_write_seconds'], 3),
+        'db_batches': metrics['db_batches'],
+        'process_cpu_seconds': round(process_cpu, 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        # The parse pool workers, shut down by scraper.close()
+        'peak_child_rss_mb': round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        'final_concurrency': scraper.concurrency.snapshot()['limit'],
+        'server': server_stats,
+    }
+
+
+def run_case_in_child(case):
+    """Run a case in a fresh interpreter so peak RSS and warm caches don't leak between cases"""
+    result_path = os.path.join(case['workdir'], 'result.json')
+    case_path = os.path.join(case['workdir'], 'case.json')
+    with open(case_path, 'w') as f:
+        json.dump(case, f)
+
+    # Run inside workdir, so debug HTML dumps and other relative paths land in it
+    subprocess.run([sys.executable, os.path.abspath(__file__), '--run-case', case_path], check=True,
+                   cwd=case['workdir'])
+    with open(result_path) as f:
+        return json.load(f)
+
+
+def compare(report, baseline, threshold):
+    """Compare each case with the baseline case of the same size and profile"""
+    baseline_cases = {(case['size'], case['profile']): case for case in baseline.get('cases', [])}
+    comparison = []
+
+    for case in report['cases']:
+        previous = baseline_cases.get((case['size'], case['profile']))
+        if previous is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), case.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            improvement = change if higher_is_better else -change
+            comparison.append({
+                'size': case['size'], 'profile': case['profile'], 'metric': metric,
+                'baseline': old, 'current': new, 'change_pct': round(change, 1),
+                'verdict': 'better' if improvement > threshold else 'worse' if improvement < -threshold else 'same',
+            })
+
+    return comparison
+
+
+def print_report(report):
+    print(f"\n📊 Benchmark results ({report['git_commit'] or 'unknown commit'})")
+    print("-" * 70)
+    for case in report['cases']:
+        print(f"🔬 {case['size']} researchers / {case['profile']} profile")
+        print(f"   🚀 {case['researchers_per_minute']} researchers/min, {case['requests_per_second']} requests/s "
+              f"({case['researchers']} researchers, {case['requests']} requests in {case['wall_seconds']}s)")
+        print(f"   ⏱️ latency p50/p95/p99: {case['latency_p50_ms']} / {case['latency_p95_ms']} / {case['latency_p99_ms']} ms")
+        print(f"   🧠 parse CPU {case['parse_cpu_seconds']}s, DB writes {case['db_write_seconds']}s "
+              f"({case['db_batches']} batches), peak RSS {case['peak_rss_mb']} MB main process, "
+              f"{case.get('peak_child_rss_mb')} MB largest parse worker")
+
+    if report.get('comparison'):
+        print("\n📈 Compared with baseline")
+        print("-" * 70)
+        icons = {'better': '✅', 'worse': '❌', 'same': '➖'}
+        for row in report['comparison']:
+            print(f"   {icons[row['verdict']]} {row['size']}/{row['profile']} {row['metric']}: "
+                  f"{row['baseline']} → {row['current']} ({row['change_pct']:+.1f}%)")
+
+
+def parse_args(argv=None):
+    """Parse command line options for the benchmark"""
+    parser = argparse.ArgumentParser(description="End-to-end scraper throughput benchmark against the mock CNPq server")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000],
+                        help="synthetic corpus sizes to run, e.g. 1000 10000 100000")
+    parser.add_argument('--profiles', nargs='+', default=['lan'], choices=sorted(LATENCY_PROFILES),
+                        help="mock server latency profiles to run")
+    parser.add_argument('--terms', type=int, default=10, help="number of search term pairs to crawl")
+    parser.add_argument('--match-ratio', type=float, default=0.3, help="fraction of the corpus matching each term")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-workers', type=int, default=8, help="starting concurrency of the scraper")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--rate-limits', action='store_true', help="keep the default per-endpoint rate limits")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    parser.add_argument('--baseline', help="compare against a previous JSON report")
+    parser.add_argument('--threshold', type=float, default=5.0,
+                        help="percentage change below which a metric counts as unchanged")
+    parser.add_argument('--fail-on-regression', type=float, metavar='PCT',
+                        help="exit with status 1 if researchers/minute drops by more than PCT percent")
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.fail_on_regression is not None and not args.baseline:
+        parser.error("--fail-on-regression needs --baseline to compare against")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if args.run_case:
+        with open(args.run_case) as f:
+            case = json.load(f)
+        result = run_case(case)
+        with open(os.path.join(case['workdir'], 'result.json'), 'w') as f:
+            json.dump(result, f)
+        return
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {
+            'terms': args.terms, 'match_ratio': args.match_ratio, 'seed': args.seed,
+            'max_workers': args.max_workers, 'batch_size': args.batch_size, 'rate_limits': args.rate_limits,
+        },
+        'cases': [],
+    }
+
+    for size in args.sizes:
+        for profile in args.profiles:
+            print(f"🔬 Running {size} researchers / {profile} profile...", flush=True)
+            with tempfile.TemporaryDirectory(prefix='cnpq-bench-') as workdir, \
+                    mock_server(size, profile, args.seed, args.match_ratio) as (server_url, stats_url):
+                report['cases'].append(run_case_in_child({
+                    'size': size, 'profile': profile, 'terms': args.terms, 'workdir': workdir,
+                    'server_url': server_url, 'stats_url': stats_url, 'max_workers': args.max_workers,
+                    'batch_size': args.batch_size, 'rate_limits': args.rate_limits,
+                }))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['baseline'] = args.baseline
+            report['comparison'] = compare(report, json.load(f), args.threshold)
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.fail_on_regression is not None:
+        regressions = [
+            row for row in report.get('comparison', [])
+            if row['metric'] == 'researchers_per_minute' and row['change_pct'] < -args.fail_on_regression
+        ]
+        if regressions:
+            print(f"\n❌ Throughput regressed by more than {args.fail_on_regression}%")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,19 @@ import time
 import asyncio
 import aiohttp
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import itertools
+import bisect
+import functools
+from collections import deque, OrderedDict, Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed
+import queue
+import multiprocessing
 from bs4 import BeautifulSoup
-from urllib.parse import urlencode, quote
+try:
+    from lxml import etree, html as lxml_html  # Fast path for results pages
+except ImportError:
+    lxml_html = None
+from urllib.parse import urlencode, quote, urlparse, parse_qsl
 import logging
 import urllib3
 from requests.adapters import HTTPAdapter
@@ -17,6 +27,13 @@ from urllib3.util.ssl_ import create_urllib3_context
 from datetime import datetime
 import json
 import sys
+import argparse
+import os
+import zlib
+import hashlib
+import inspect
+import pickle
+import unicodedata
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -69,6 +86,223 @@ INDUSTRY_KEYWORDS = [
     'siemens', 'bosch', 'volkswagen', 'ford', 'general motors'
 ]
 
+# Technology companies and institutions (for cooperation detection in summaries)
+TECH_COMPANIES = [
+    'Microsoft', 'Google', 'IBM', 'Oracle', 'SAP', 'Amazon', 'Facebook', 'Meta',
+    'Apple', 'Intel', 'NVIDIA', 'Samsung', 'Huawei', 'Siemens', 'Bosch',
+    'Motorola', 'Nokia', 'Ericsson', 'Cisco', 'VMware', 'Adobe', 'Salesforce',
+    'Embraer', 'Petrobras', 'Vale', 'Itaú', 'Bradesco', 'Banco do Brasil',
+    'TIM', 'Vivo', 'Claro', 'NET', 'Porto Seguro', 'Globo', 'Record'
+]
+
+# Funding agencies (Brazilian and international)
+FUNDING_AGENCIES = [
+    'CNPq', 'CAPES', 'FAPESP', 'FAPERJ', 'FAPEMIG', 'FINEP', 'BNDES',
+    'European Commission', 'European Union', 'Comunidade Europeia', 'FP7', 'H2020',
+    'NSF', 'NIH', 'DARPA', 'NASA', 'IEEE', 'ACM'
+]
+
+# Institution mentions in a preview bio, tried in order
+BIO_INSTITUTION_PATTERNS = [
+    re.compile(r'(?:do|da|na)\s+(Centro de Informática.*?(?:UFPE|da UFPE))', re.IGNORECASE),
+    re.compile(r'(?:do|da|na)\s+(Universidade[^.]*)', re.IGNORECASE),
+    re.compile(r'(?:do|da|na)\s+(Instituto[^.]*)', re.IGNORECASE),
+    re.compile(r'(?:do|da|na)\s+(Faculdade[^.]*)', re.IGNORECASE),
+    re.compile(r'(UFPE|USP|UNICAMP|UFRJ|UFRGS|UFMG|UnB)', re.IGNORECASE),
+]
+
+# Pragmas the DB writer sets on the researchers DB. WAL lets the viewers read while
+# a crawl commits, and with it synchronous=NORMAL only fsyncs at checkpoints
+SQLITE_PRAGMAS = {
+    'default': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64 * 1024,  # KiB, i.e. 64 MB of page cache
+        'mmap_size': 256 * 1024 ** 2,
+        'temp_store': 'MEMORY',
+    },
+}
+# Initial loads trade durability on power loss for speed (a crash still cannot corrupt the DB)
+SQLITE_PRAGMAS['bulk'] = dict(SQLITE_PRAGMAS['default'], synchronous='OFF')
+
+# UPSERT ... RETURNING and ALTER TABLE ... DROP COLUMN (the search_term migration) need SQLite 3.35
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+def check_sqlite_version():
+    """Fail early with a clear message when the sqlite3 module links an SQLite older than MIN_SQLITE_VERSION"""
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        required = '.'.join(map(str, MIN_SQLITE_VERSION))
+        raise RuntimeError(
+            f"SQLite {sqlite3.sqlite_version} is too old: the researchers database needs SQLite {required} or newer "
+            f"(UPSERT ... RETURNING, ALTER TABLE ... DROP COLUMN). Use a Python built against a newer SQLite."
+        )
+
+# Indexes no write needs; a bulk load drops them and builds each once at the end
+DEFERRED_INDEXES = {
+    'idx_researcher_cnpq_id': 'researchers (cnpq_id)',
+    'idx_projects_formal_methods': 'projects (is_formal_methods_related)',
+    'idx_crawl_frontier_status': 'crawl_frontier (status)',
+}
+
+# FTS5 full-text indexes the viewers search with, over these columns of each table
+SEARCH_INDEXES = {
+    'researchers_fts': ('researchers', ('name', 'institution', 'area')),
+    'projects_fts': ('projects', ('title', 'description', 'formal_methods_concepts', 'formal_methods_tools')),
+}
+
+class KeywordMatcher:
+    """Find the keywords of several named lists in a text in a single pass
+    
+    All keywords are compiled once into one regex whose alternation is factored
+    into a prefix trie, so the C regex engine walks it like an Aho–Corasick
+    automaton instead of Python looping over every keyword. Matches must sit on
+    word boundaries: 'spin' does not match inside 'spinning', nor 'vale' inside
+    'equivalente'. Overlapping keywords are all reported.
+    """
+    
+    def __init__(self, keyword_lists):
+        self.keywords = {}  # lowercase keyword -> [(category, keyword as listed)]
+        self.rank = {}  # (category, keyword) -> position in its list, for stable output order
+        for category, keywords in keyword_lists.items():
+            for keyword in keywords:
+                entry = (category, keyword)
+                if entry not in self.rank:
+                    self.rank[entry] = len(self.rank)
+                    self.keywords.setdefault(keyword.lower(), []).append(entry)
+        
+        # The regex reports one (the longest) keyword per start position; keep the
+        # shorter ones that end on a word boundary inside it, e.g. 'model' in 'model checking'
+        self.nested = {}
+        for keyword in self.keywords:
+            for other in self.keywords:
+                if len(other) < len(keyword) and keyword.startswith(other) and not keyword[len(other)].isalnum():
+                    self.nested.setdefault(keyword, []).append(other)
+        
+        # Zero-width lookahead so that overlapping keywords at later positions are found too
+        self.pattern = re.compile(r'(?<!\w)(?=(' + self._trie_pattern(self.keywords) + r')(?!\w))')
+        # Changes whenever a keyword list does; part of the ParseMemo version stamp
+        self.fingerprint = hashlib.sha256(repr(list(self.rank)).encode('utf-8')).hexdigest()[:16]
+    
+    @staticmethod
+    def _trie_pattern(words):
+        """Build a regex alternation for the words, factored by common prefixes"""
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # Greedy optional suffix: the longest keyword is tried first at each position
+            return f'(?:{body})?' if '' in node else body
+        
+        return build(trie)
+    
+    def scan(self, text_lower):
+        """Yield (start, category, keyword) for every keyword occurrence in an already lowercased text"""
+        for match in self.pattern.finditer(text_lower):
+            found = match.group(1)
+            for keyword in [found] + self.nested.get(found, []):
+                for category, listed in self.keywords[keyword]:
+                    yield match.start(), category, listed
+    
+    def match(self, text):
+        """Return {category: [keywords found, in list order]} for a text"""
+        found = {category: set() for category, _ in self.rank}
+        for _, category, keyword in self.scan(text.lower()):
+            found[category].add(keyword)
+        return {
+            category: sorted(keywords, key=lambda keyword: self.rank[(category, keyword)])
+            for category, keywords in found.items()
+        }
+
+# Compiled once; rebuild it if the keyword lists are changed at runtime
+KEYWORD_MATCHER = KeywordMatcher({
+    'concepts': FORMAL_METHODS_CONCEPTS,
+    'tools': FORMAL_METHODS_TOOLS,
+    'industry': INDUSTRY_KEYWORDS,
+})
+
+ORGANIZATION_MATCHER = KeywordMatcher({
+    'companies': TECH_COMPANIES,
+    'agencies': FUNDING_AGENCIES,
+})
+
+class TextAnalysis:
+    """Sentence boundaries and keyword→sentence index of one document, built once and shared by the extractors
+    
+    Sentences are split on the given delimiter characters (the extractors use
+    '.!?' or just '.'); spans are offsets into the lowercased text and are
+    computed once per delimiter set, as are the keyword hits per matcher.
+    """
+    
+    def __init__(self, text):
+        self.text = text or ''
+        self.lower = self.text.lower()
+        # Offsets come from the lowercased text; only slice the original when lowercasing kept them aligned
+        self._source = self.text if len(self.lower) == len(self.text) else self.lower
+        self._sentences = {}
+        self._hits = {}
+        self._index = {}
+    
+    def sentence_spans(self, delimiters='.!?'):
+        """Return ([(start, end), ...], [start, ...]) of the sentences between delimiter runs"""
+        if delimiters not in self._sentences:
+            spans = [m.span() for m in re.finditer(f'[^{re.escape(delimiters)}]+', self.lower)]
+            self._sentences[delimiters] = (spans, [span[0] for span in spans])
+        return self._sentences[delimiters]
+    
+    def sentence_index_at(self, position, delimiters='.!?'):
+        _, starts = self.sentence_spans(delimiters)
+        return bisect.bisect_right(starts, position) - 1
+    
+    def sentence(self, index, delimiters='.!?'):
+        """Text of a sentence (original case, stripped)"""
+        start, end = self.sentence_spans(delimiters)[0][index]
+        return self._source[start:end].strip()
+    
+    def sentence_lower(self, index, delimiters='.!?'):
+        start, end = self.sentence_spans(delimiters)[0][index]
+        return self.lower[start:end].strip()
+    
+    def keyword_hits(self, matcher):
+        """[(start, category, keyword), ...] for every match of the matcher, in text order"""
+        if matcher not in self._hits:
+            self._hits[matcher] = list(matcher.scan(self.lower))
+        return self._hits[matcher]
+    
+    def keyword_sentences(self, matcher, delimiters='.!?'):
+        """Inverted index {(category, keyword): [sentence indexes]}, keywords in order of first occurrence"""
+        key = (matcher, delimiters)
+        if key not in self._index:
+            index = {}
+            for start, category, keyword in self.keyword_hits(matcher):
+                sentences = index.setdefault((category, keyword), [])
+                sentence = self.sentence_index_at(start, delimiters)
+                if not sentences or sentences[-1] != sentence:
+                    sentences.append(sentence)
+            self._index[key] = index
+        return self._index[key]
+    
+    def keywords(self, matcher):
+        """Return {category: [keywords found, in list order]}"""
+        found = {category: [] for category, _ in matcher.rank}
+        for category, keyword in self.keyword_sentences(matcher):
+            found[category].append(keyword)
+        for category, keywords in found.items():
+            keywords.sort(key=lambda keyword: matcher.rank[(category, keyword)])
+        return found
+    
+    def first_sentence_with(self, matcher, category, keyword, delimiters='.!?'):
+        """First sentence mentioning the keyword, or None"""
+        sentences = self.keyword_sentences(matcher, delimiters).get((category, keyword))
+        return self.sentence(sentences[0], delimiters) if sentences else None
+
 class ProgressIndicator:
     """Enhanced progress indicator for better user feedback"""
     
@@ -113,230 +347,1389 @@ class ProgressIndicator:
         elapsed = time.time() - self.start_time
         print(f"\n{emoji} [{int(elapsed//60)}:{int(elapsed%60):02d}] {message}")
 
-class CNPqScraper:
-    def __init__(self, max_workers=5):
-        self.session = requests.Session()
-        self.base_url = "https://buscatextual.cnpq.br/buscatextual"
-        self.max_workers = max_workers
-        self.db_lock = threading.Lock()  # Thread-safe database operations
-        self.progress = ProgressIndicator()
-        self.setup_session()
-        self.setup_database()
+class AdaptiveConcurrencyController:
+    """AIMD concurrency limit shared by the sync, threaded and async request paths
     
-    def setup_session(self):
-        """Setup session with headers and cookies"""
-        # Disable SSL warnings for problematic sites
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
-        # Create a custom SSL context that's more permissive
-        class CustomHTTPSAdapter(HTTPAdapter):
-            def init_poolmanager(self, *args, **kwargs):
-                ctx = create_urllib3_context()
-                ctx.set_ciphers('DEFAULT@SECLEVEL=1')
-                ctx.check_hostname = False
-                ctx.verify_mode = ssl.CERT_NONE
-                kwargs['ssl_context'] = ctx
-                return super().init_poolmanager(*args, **kwargs)
-        
-        # Setup retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
+    The limit grows by about one slot per round of successful requests while
+    responses stay fast, and is cut multiplicatively when CNPq answers with
+    429/5xx, a captcha page, a transport error or a latency spike. Degraded
+    responses also open a cooldown window that callers wait out instead of
+    sleeping for a fixed time.
+    """
+    
+    def __init__(self, initial_limit=8, min_limit=1, max_limit=64, decrease_factor=0.5,
+                 latency_tolerance=2.0, base_cooldown=2.0, max_cooldown=60.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        
+        self.in_flight = 0
+        self.latency_ewma = None
+        self.baseline_latency = None
+        self.cooldown_until = 0.0
+        self._consecutive_backoffs = 0
+        self._last_decrease = 0.0
+        self._last_backoff = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters = deque()  # (loop, future) pairs waiting for a slot
+        self.stats = {'ok': 0, 'throttled': 0, 'server_errors': 0, 'captchas': 0,
+                      'errors': 0, 'slow': 0, 'increases': 0, 'decreases': 0}
+    
+    def _has_slot(self):
+        return self.in_flight < int(self.limit)
+    
+    def _grant(self, future):
+        """Hand a reserved slot to an async waiter (runs on the waiter's loop)"""
+        if not future.done():
+            future.set_result(None)
+        else:
+            # The waiter was cancelled after the slot was reserved for it
+            self.release()
+    
+    def _wake_waiters(self):
+        # Caller holds self._cond
+        while self._async_waiters and self._has_slot():
+            loop, future = self._async_waiters.popleft()
+            self.in_flight += 1
+            loop.call_soon_threadsafe(self._grant, future)
+        self._cond.notify_all()
+    
+    def acquire(self):
+        """Block the calling thread until a request slot is free"""
+        with self._cond:
+            while not self._has_slot():
+                self._cond.wait()
+            self.in_flight += 1
+    
+    async def acquire_async(self):
+        """Wait on the event loop until a request slot is free"""
+        with self._cond:
+            if self._has_slot() and not self._async_waiters:
+                self.in_flight += 1
+                return
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._async_waiters.append((loop, future))
         
-        # Setup adapter with retry strategy and custom SSL
-        adapter = CustomHTTPSAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", HTTPAdapter(max_retries=retry_strategy))
-        self.session.mount("https://", adapter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._cond:
+                if (loop, future) in self._async_waiters:
+                    self._async_waiters.remove((loop, future))
+                # Otherwise the slot was already reserved and _grant returns it
+            raise
+    
+    def release(self):
+        """Return a request slot"""
+        with self._cond:
+            self.in_flight -= 1
+            self._wake_waiters()
+    
+    def record(self, latency=None, status=None, captcha=False, error=False):
+        """Feed back the outcome of one request and adjust the limit"""
+        now = time.monotonic()
+        
+        with self._cond:
+            slow = False
+            if latency is not None and not error:
+                self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+                if self.baseline_latency is None:
+                    self.baseline_latency = self.latency_ewma
+                else:
+                    # Track the fastest recent latency, drifting up slowly if the server gets slower for good
+                    self.baseline_latency = min(self.baseline_latency * 1.001, self.latency_ewma)
+                slow = self.latency_ewma > self.baseline_latency * self.latency_tolerance
+            
+            throttled = status == 429
+            server_error = status is not None and status >= 500
+            
+            if throttled:
+                self.stats['throttled'] += 1
+            elif server_error:
+                self.stats['server_errors'] += 1
+            elif captcha:
+                self.stats['captchas'] += 1
+            elif error:
+                self.stats['errors'] += 1
+            elif slow:
+                self.stats['slow'] += 1
+            else:
+                self.stats['ok'] += 1
+            
+            if throttled or server_error or captcha or error or slow:
+                # Cut and back off at most once per round trip, so one congestion event
+                # (a burst of concurrent failures) counts once
+                window = max(self.latency_ewma or 0.0, 1.0)
+                if now - self._last_decrease >= window:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self.stats['decreases'] += 1
+                
+                if (throttled or captcha or server_error) and now - self._last_backoff >= window:
+                    cooldown = min(self.max_cooldown, self.base_cooldown * (2 ** self._consecutive_backoffs))
+                    self._consecutive_backoffs += 1
+                    self._last_backoff = now
+                    self.cooldown_until = max(self.cooldown_until, now + cooldown)
+            else:
+                # Additive increase: roughly +1 slot per limit's worth of healthy responses
+                previous = int(self.limit)
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self._consecutive_backoffs = 0
+                if int(self.limit) > previous:
+                    self.stats['increases'] += 1
+                    self._wake_waiters()
+    
+    def cooldown_remaining(self):
+        """Seconds left in the current backoff window"""
+        return max(0.0, self.cooldown_until - time.monotonic())
+    
+    def wait_for_cooldown(self):
+        """Sleep (thread) until the backoff window opened by degraded responses has passed"""
+        remaining = self.cooldown_remaining()
+        if remaining > 0:
+            time.sleep(remaining)
+    
+    async def cooldown_async(self):
+        """Async version of wait_for_cooldown"""
+        remaining = self.cooldown_remaining()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+    
+    def snapshot(self):
+        """Current limit, in-flight count and counters for progress reporting"""
+        with self._cond:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'latency_ewma': self.latency_ewma,
+                'baseline_latency': self.baseline_latency,
+                **self.stats,
+            }
+
+class TokenBucketRateLimiter:
+    """Requests-per-second caps per CNPq endpoint, shared by threads and coroutines
+    
+    Each endpoint (busca.do, preview.do, visualizacv.do, lattes) has its own
+    token bucket. Callers reserve a token under a lock and then sleep outside
+    it (time.sleep or asyncio.sleep), so both threads and coroutines get
+    precise spacing without holding the lock. Wait times are accumulated per
+    endpoint for reporting.
+    """
+    
+    # Default requests/second per endpoint; None disables the cap
+    DEFAULT_RATES = {
+        'busca.do': 4.0,
+        'preview.do': 8.0,
+        'visualizacv.do': 1.0,
+        'lattes': 1.0,
+        'other': None,
+    }
+    
+    def __init__(self, rates=None, burst=1.0):
+        self.rates = dict(self.DEFAULT_RATES)
+        if rates:
+            self.rates.update(rates)
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._last_refill = {}
+        self.stats = {}
+    
+    @staticmethod
+    def endpoint_for(url):
+        """Map a request URL to the endpoint whose budget it spends"""
+        parsed = urlparse(url)
+        name = parsed.path.rstrip('/').rsplit('/', 1)[-1]
+        if name.endswith('.do'):
+            return name
+        if (parsed.hostname or '').startswith('lattes.') or parsed.path.startswith('/lattes/'):
+            return 'lattes'
+        return 'other'
+    
+    def reserve(self, endpoint):
+        """Take a token for the endpoint and return how long the caller must wait before using it"""
+        rate = self.rates.get(endpoint)
+        now = time.monotonic()
+        
+        with self._lock:
+            stats = self.stats.setdefault(endpoint, {'requests': 0, 'waited': 0.0, 'max_wait': 0.0})
+            stats['requests'] += 1
+            if not rate:
+                return 0.0
+            
+            tokens = self._tokens.get(endpoint, self.burst)
+            last = self._last_refill.get(endpoint, now)
+            tokens = min(self.burst, tokens + (now - last) * rate)
+            
+            # Tokens may go negative: each caller queues behind the ones already reserved
+            tokens -= 1.0
+            self._tokens[endpoint] = tokens
+            self._last_refill[endpoint] = now
+            
+            wait = -tokens / rate if tokens < 0 else 0.0
+            stats['waited'] += wait
+            stats['max_wait'] = max(stats['max_wait'], wait)
+            return wait
+    
+    def acquire(self, url):
+        """Block the calling thread until the URL's endpoint budget allows a request"""
+        wait = self.reserve(self.endpoint_for(url))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self, url):
+        """Async version of acquire"""
+        wait = self.reserve(self.endpoint_for(url))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def snapshot(self):
+        """Per-endpoint request counts and time spent waiting for the rate limit"""
+        with self._lock:
+            return {
+                endpoint: {**stats, 'rate': self.rates.get(endpoint)}
+                for endpoint, stats in self.stats.items()
+            }
+
+class ResponseCache:
+    """Persistent on-disk cache of GET response bodies, shared by the sync and async clients
+    
+    Entries are addressed by a SHA-256 of the normalized URL plus sorted query
+    parameters. Bodies are stored zlib-compressed under objects/, and a small
+    SQLite index tracks endpoint, size and last access. Each endpoint has its
+    own TTL (None means never cache it). Once the cache grows past max_size
+    bytes, the least recently used entries are evicted. Hits record their
+    access time in memory; the index is updated in batches of
+    ACCESS_FLUSH_SIZE, and on put, evict and close.
+    """
+    
+    # Hits buffered before their last_access updates are written
+    ACCESS_FLUSH_SIZE = 500
+    
+    # Seconds a cached body stays fresh per endpoint (see TokenBucketRateLimiter.endpoint_for)
+    DEFAULT_TTLS = {
+        'busca.do': 12 * 3600,
+        'preview.do': 24 * 3600,
+        'visualizacv.do': 24 * 3600,
+        'lattes': 24 * 3600,
+        'other': None,
+    }
+    
+    def __init__(self, cache_dir='.http_cache', ttls=None, max_size=1024 ** 3):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_size = max_size
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._accessed = {}  # key -> last access time not yet written to the index
+        
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                endpoint TEXT,
+                size INTEGER,
+                created_at REAL,
+                last_access REAL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)')
+        self.conn.commit()
+        self.total_size = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+    
+    @staticmethod
+    def normalize_url(url, params=None):
+        """Normalize scheme/host case and merge params into a sorted query string"""
+        parsed = urlparse(url)
+        query = parse_qsl(parsed.query, keep_blank_values=True)
+        if params:
+            query.extend((str(k), str(v)) for k, v in params.items())
+        return f"{parsed.scheme.lower()}://{(parsed.netloc or '').lower()}{parsed.path or '/'}?{urlencode(sorted(query))}"
+    
+    def _key(self, url, params):
+        normalized = self.normalize_url(url, params)
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest(), normalized
+    
+    def _path(self, key):
+        return os.path.join(self.objects_dir, key[:2], f"{key}.z")
+    
+    def get(self, url, params=None):
+        """Return the cached body for a GET request, or None if missing or expired"""
+        endpoint = TokenBucketRateLimiter.endpoint_for(url)
+        ttl = self.ttls.get(endpoint)
+        if not ttl:
+            return None
         
-        # Set session timeout
-        self.session.timeout = 30
+        key, _ = self._key(url, params)
+        now = time.time()
         
-        # Configure SSL settings
-        self.session.verify = False
+        with self._lock:
+            row = self.conn.execute('SELECT created_at FROM entries WHERE key = ?', (key,)).fetchone()
+            if not row or now - row[0] > ttl:
+                self.stats['misses'] += 1
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= self.ACCESS_FLUSH_SIZE:
+                self._flush_accessed()
+                self.conn.commit()
         
-        self.session.cookies.update({
-            'JSESSIONID': '9796D8BC1349A10F8BABBFA4CCAB997F.buscatextual_0',
-            'fontSize': '10',
-            'imp': 'cnpqrestritos',
-            'idioma': 'PT',
-            'BIGipServerpool_buscatextual.cnpq.br': '84541450.36895.0000',
-            '__utma': '259604505.635986498.1748306865.1748306865.1748306865.1',
-            '__utmc': '259604505',
-            '__utmz': '259604505.1748306865.1.1.utmcsr=memoria.cnpq.br|utmccn=(referral)|utmcmd=referral|utmcct=/',
-            '__utmb': '259604505.30.10.1748306865',
-        })
+        try:
+            with open(self._path(key), 'rb') as f:
+                body = zlib.decompress(f.read()).decode('utf-8')
+        except (OSError, zlib.error) as e:
+            logger.warning(f"Dropping unreadable cache entry for {url}: {e}")
+            self._delete(key)
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
         
-        self.session.headers.update({
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Cache-Control': 'max-age=0',
-            'Connection': 'keep-alive',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'same-origin',
-            'Sec-Fetch-User': '?1',
-            'Upgrade-Insecure-Requests': '1',
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36',
-            'sec-ch-ua': '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Linux"',
-        })
+        with self._lock:
+            self.stats['hits'] += 1
+        return body
     
-    def setup_database(self):
-        """Create SQLite database and tables for detailed researcher and project information"""
-        self.conn = sqlite3.connect('cnpq_researchers.db')
-        self.cursor = self.conn.cursor()
+    def put(self, url, params, body):
+        """Store a GET response body if its endpoint is cacheable"""
+        endpoint = TokenBucketRateLimiter.endpoint_for(url)
+        if not self.ttls.get(endpoint):
+            return
         
-        # Main researchers table with additional fields
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS researchers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                cnpq_id TEXT UNIQUE,
-                name TEXT,
-                institution TEXT,
-                area TEXT,
-                city TEXT,
-                state TEXT,
-                country TEXT,
-                lattes_url TEXT,
-                search_term TEXT,
-                last_update_date TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        key, normalized = self._key(url, params)
+        data = zlib.compress(body.encode('utf-8'), 6)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # Write to a temp file first so readers never see a partial body
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        
+        now = time.time()
+        with self._lock:
+            self._flush_accessed()
+            old = self.conn.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            self.conn.execute(
+                'INSERT OR REPLACE INTO entries (key, url, endpoint, size, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, normalized, endpoint, len(data), now, now)
             )
-        ''')
+            self.conn.commit()
+            self.total_size += len(data) - (old[0] if old else 0)
+            self.stats['stores'] += 1
+            over_limit = self.total_size > self.max_size
         
-        # Projects table for detailed project information
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS projects (
+        if over_limit:
+            self.evict()
+    
+    def _flush_accessed(self):
+        # Caller holds self._lock and commits
+        if self._accessed:
+            self.conn.executemany('UPDATE entries SET last_access = ? WHERE key = ?',
+                                  [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+    
+    def _delete(self, key):
+        with self._lock:
+            self._accessed.pop(key, None)
+            row = self.conn.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            self.conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self.conn.commit()
+            if row:
+                self.total_size -= row[0]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+    
+    def evict(self, target_ratio=0.9):
+        """Drop least recently used entries until the cache is below target_ratio of max_size"""
+        target = self.max_size * target_ratio
+        with self._lock:
+            self._flush_accessed()
+            rows = self.conn.execute('SELECT key, size FROM entries ORDER BY last_access').fetchall()
+            victims = []
+            for key, size in rows:
+                if self.total_size <= target:
+                    break
+                victims.append(key)
+                self.total_size -= size
+            self.conn.executemany('DELETE FROM entries WHERE key = ?', [(key,) for key in victims])
+            self.conn.commit()
+            self.stats['evictions'] += len(victims)
+        
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+    
+    def close(self):
+        """Write buffered access times and close the cache index"""
+        with self._lock:
+            self._flush_accessed()
+            self.conn.commit()
+        self.conn.close()
+
+class HtmlArchive:
+    """Append-only archive of every fetched page, so the extractors can be re-run offline
+    
+    Bodies are zlib-compressed and appended to numbered segment files; a new
+    segment starts once the current one passes segment_size bytes. A SQLite
+    index maps cnpq_id, endpoint and fetch time to each body's segment,
+    offset and length. Nothing is ever rewritten or evicted.
+    """
+    
+    # Endpoint -> PAGE_PARSERS type used when reparsing
+    PAGE_TYPES = {
+        'busca.do': 'search_results',
+        'preview.do': 'preview',
+        'visualizacv.do': 'cv',
+        'lattes': 'cv',
+    }
+    
+    def __init__(self, archive_dir='html_archive', segment_size=256 * 1024 ** 2):
+        self.archive_dir = archive_dir
+        self.segment_size = segment_size
+        self.stats = {'pages': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+        self._writer = None
+        self._readers = {}
+        
+        os.makedirs(archive_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(archive_dir, 'index.db'), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                researcher_id INTEGER,
                 cnpq_id TEXT,
-                title TEXT,
-                start_date TEXT,
-                end_date TEXT,
-                status TEXT,
-                description TEXT,
-                funding_sources TEXT,
-                coordinator_name TEXT,
-                team_members TEXT,
-                industry_cooperation TEXT,
-                formal_methods_concepts TEXT,
-                formal_methods_tools TEXT,
-                is_formal_methods_related BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (researcher_id) REFERENCES researchers (id),
-                FOREIGN KEY (cnpq_id) REFERENCES researchers (cnpq_id)
+                endpoint TEXT,
+                url TEXT,
+                fetched_at REAL,
+                segment INTEGER,
+                offset INTEGER,
+                length INTEGER
             )
         ''')
-        
-        # Index for better performance
-        self.cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_researcher_cnpq_id 
-            ON researchers (cnpq_id)
-        ''')
-        
-        self.cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_projects_cnpq_id 
-            ON projects (cnpq_id)
-        ''')
-        
-        self.cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_projects_formal_methods 
-            ON projects (is_formal_methods_related)
-        ''')
-        
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_cnpq_id ON pages (cnpq_id, endpoint, fetched_at)')
         self.conn.commit()
+        self.segment = self.conn.execute('SELECT COALESCE(MAX(segment), 1) FROM pages').fetchone()[0]
     
-    def test_connection(self):
-        """Test connection to CNPq website"""
-        try:
-            logger.info("Testing connection to CNPq...")
-            response = self.session.get("https://buscatextual.cnpq.br/", timeout=10)
-            response.raise_for_status()
-            logger.info("Connection test successful!")
-            
-            logger.info("Connection test successful!")
-            
-            return True
-        except Exception as e:
-            logger.error(f"Connection test failed: {e}")
-            return False
+    def _segment_path(self, segment):
+        return os.path.join(self.archive_dir, f"segment-{segment:06d}.z")
     
-    def extract_pagination_info(self, html_content):
-        """Extract pagination information from the HTML"""
-        try:
-            # Look for the JavaScript variables that contain pagination info
-            total_match = re.search(r'var intLTotReg = (\d+);', html_content)
-            current_start_match = re.search(r'var intLRegInicio = (\d+);', html_content)
-            page_size_match = re.search(r'var intLRegPagina = (\d+);', html_content)
-            
-            if total_match and current_start_match and page_size_match:
-                total_records = int(total_match.group(1))
-                current_start = int(current_start_match.group(1))
-                page_size = int(page_size_match.group(1))
-                
-                return {
-                    'total_records': total_records,
-                    'current_start': current_start,
-                    'page_size': page_size,
-                    'has_more': current_start + page_size < total_records
-                }
-        except Exception as e:
-            logger.error(f"Error extracting pagination info: {e}")
-        
+    @staticmethod
+    def cnpq_id_for(url, params=None, data=None):
+        """The researcher a request is about: the 'id' parameter, or the last path part of a Lattes URL"""
+        for fields in (params, data):
+            if isinstance(fields, dict) and fields.get('id'):
+                return str(fields['id'])
+        if TokenBucketRateLimiter.endpoint_for(url) == 'lattes':
+            return urlparse(url).path.rstrip('/').rsplit('/', 1)[-1] or None
         return None
-
-    def identify_formal_methods_concepts(self, text):
-        """Identify formal methods concepts in text"""
-        if not text:
-            return []
-        
-        text_lower = text.lower()
-        found_concepts = []
-        
-        for concept in FORMAL_METHODS_CONCEPTS:
-            if concept.lower() in text_lower:
-                found_concepts.append(concept)
-        
-        return list(set(found_concepts))  # Remove duplicates
     
-    def identify_formal_methods_tools(self, text):
-        """Identify formal methods tools in text"""
-        if not text:
-            return []
-        
-        text_lower = text.lower()
-        found_tools = []
-        
-        for tool in FORMAL_METHODS_TOOLS:
-            if tool.lower() in text_lower:
-                found_tools.append(tool)
-        
-        return list(set(found_tools))  # Remove duplicates
+    def put(self, url, params, data, body):
+        """Append a fetched body to the current segment and index it"""
+        blob = zlib.compress(body.encode('utf-8'), 6)
+        
+        with self._lock:
+            if self._writer is None or self._writer.tell() >= self.segment_size:
+                if self._writer is not None:
+                    self._writer.close()
+                    self.segment += 1
+                self._writer = open(self._segment_path(self.segment), 'ab')
+            offset = self._writer.tell()
+            self._writer.write(blob)
+            self._writer.flush()
+            
+            self.conn.execute(
+                'INSERT INTO pages (cnpq_id, endpoint, url, fetched_at, segment, offset, length) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (self.cnpq_id_for(url, params, data), TokenBucketRateLimiter.endpoint_for(url),
+                 ResponseCache.normalize_url(url, params), time.time(), self.segment, offset, len(blob))
+            )
+            self.conn.commit()
+            self.stats['pages'] += 1
+            self.stats['bytes'] += len(blob)
     
-    def identify_industry_cooperation(self, text):
-        """Identify industry cooperation mentions in text"""
-        if not text:
-            return []
+    def read_blob(self, segment, offset, length):
+        """Return the compressed body stored at segment/offset"""
+        with self._lock:
+            reader = self._readers.get(segment)
+            if reader is None:
+                reader = self._readers[segment] = open(self._segment_path(segment), 'rb')
+            reader.seek(offset)
+            return reader.read(length)
+    
+    def get(self, segment, offset, length):
+        """Return the decompressed body stored at segment/offset"""
+        return zlib.decompress(self.read_blob(segment, offset, length)).decode('utf-8')
+    
+    def latest_pages(self):
+        """Map cnpq_id -> {endpoint: (segment, offset, length)} of the most recent fetch per endpoint"""
+        with self._lock:
+            rows = self.conn.execute('''
+                SELECT cnpq_id, endpoint, segment, offset, length FROM pages
+                WHERE cnpq_id IS NOT NULL
+                ORDER BY fetched_at, id
+            ''').fetchall()
+        latest = {}
+        for cnpq_id, endpoint, segment, offset, length in rows:
+            latest.setdefault(cnpq_id, {})[endpoint] = (segment, offset, length)
+        return latest
+    
+    def close(self):
+        """Close the segment files and the index"""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+            self.conn.close()
+
+class ParseMemo:
+    """Memo of parse results keyed by a hash of the page body, the parse context and the extractor version
+    
+    Recent results live in an in-memory LRU of max_entries; up to
+    max_disk_entries are also kept zlib-compressed in a SQLite file under
+    memo_dir, the oldest dropped first. The version stamp (see parser_version)
+    changes with the parser code and the keyword lists, so stale entries are
+    never returned and are pruned on open.
+    """
+    
+    # Puts between checks of the disk tier's size
+    TRIM_INTERVAL = 1000
+    
+    def __init__(self, memo_dir='.parse_memo', max_entries=4096, max_disk_entries=200000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._puts = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()  # key -> pickled records
+        
+        os.makedirs(memo_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(memo_dir, 'memo.db'), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                page_type TEXT,
+                version TEXT,
+                records BLOB,
+                created_at REAL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_results_created_at ON results (created_at)')
+        self.prune()
+    
+    @staticmethod
+    def key(page_type, body, context=None):
+        """Hash of the page type, its extractor version, the parse context and the body"""
+        digest = hashlib.sha256(f"{page_type}\0{parser_version(page_type)}\0{sorted((context or {}).items())}\0".encode('utf-8'))
+        digest.update(body if isinstance(body, bytes) else body.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def prune(self):
+        """Drop disk entries written by another extractor version, then the oldest beyond max_disk_entries"""
+        with self._lock:
+            for page_type in PAGE_PARSERS:
+                self.conn.execute('DELETE FROM results WHERE page_type = ? AND version != ?',
+                                  (page_type, parser_version(page_type)))
+            self._trim()
+            self.conn.commit()
+    
+    def _trim(self):
+        # Caller holds self._lock
+        excess = self.conn.execute('SELECT COUNT(*) FROM results').fetchone()[0] - self.max_disk_entries
+        if excess > 0:
+            self.conn.execute('DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY created_at LIMIT ?)',
+                              (excess,))
+    
+    def get(self, key):
+        """Return a fresh copy of the memoized records, or None"""
+        with self._lock:
+            data = self._lru.get(key)
+            if data is not None:
+                self._lru.move_to_end(key)
+                self.stats['memory_hits'] += 1
+            else:
+                row = self.conn.execute('SELECT records FROM results WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    self.stats['misses'] += 1
+                    return None
+                data = zlib.decompress(row[0])
+                self._remember(key, data)
+                self.stats['disk_hits'] += 1
+        return pickle.loads(data)
+    
+    def put(self, key, page_type, records):
+        """Memoize the records parsed from a page"""
+        data = pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, data)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO results (key, page_type, version, records, created_at) VALUES (?, ?, ?, ?, ?)',
+                (key, page_type, parser_version(page_type), zlib.compress(data, 6), time.time())
+            )
+            self._puts += 1
+            if self._puts % self.TRIM_INTERVAL == 0:
+                self._trim()
+            self.conn.commit()
+    
+    def _remember(self, key, data):
+        self._lru[key] = data
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+    
+    def close(self):
+        """Close the disk tier"""
+        self.conn.close()
+
+class ElementProbe:
+    """An element pattern registered with DocumentVisitor, mirroring soup.find(names, class_=..., string=...)
+    
+    Keeps the first matching element, or all of them in document order with collect_all.
+    """
+    
+    def __init__(self, names, class_=None, string=None, collect_all=False):
+        self.names = (names,) if isinstance(names, str) else tuple(names)
+        self.class_ = class_
+        self.string = re.compile(string, re.I) if isinstance(string, str) else string
+        self.collect_all = collect_all
+    
+    def __repr__(self):
+        string = self.string.pattern if self.string is not None else None
+        return f"ElementProbe({self.names!r}, class_={self.class_!r}, string={string!r}, collect_all={self.collect_all})"
+    
+    def matches(self, element, string):
+        if self.class_ is not None:
+            classes = element.get('class') or []
+            if self.class_ not in classes and ' '.join(classes) != self.class_:
+                return False
+        if self.string is not None:
+            return string is not None and self.string.search(string) is not None
+        return True
+
+class DocumentVisitor:
+    """Walk a BeautifulSoup tree once, dispatching each element to the probes registered for its tag
+    
+    Probes are grouped by field; visit() returns {field: [result per probe]}, each
+    result being the first matching element (or None), or a list with collect_all.
+    """
+    
+    def __init__(self, probe_groups):
+        self.probe_groups = probe_groups
+        self.by_name = {}
+        for field, probes in probe_groups.items():
+            for position, probe in enumerate(probes):
+                for name in probe.names:
+                    self.by_name.setdefault(name, []).append((field, position, probe))
+    
+    def visit(self, soup):
+        results = {
+            field: [[] if probe.collect_all else None for probe in probes]
+            for field, probes in self.probe_groups.items()
+        }
+        
+        for element in soup.descendants:
+            registered = self.by_name.get(element.name)  # Text nodes have no name
+            if not registered:
+                continue
+            
+            string = element.string  # What soup.find(..., string=...) matches against
+            for field, position, probe in registered:
+                result = results[field][position]
+                if result is not None and not probe.collect_all:
+                    continue  # Only the first match counts, as with soup.find
+                if probe.matches(element, string):
+                    if probe.collect_all:
+                        result.append(element)
+                    else:
+                        results[field][position] = element
         
-        text_lower = text.lower()
-        industry_mentions = []
-        
-        for keyword in INDUSTRY_KEYWORDS:
-            if keyword.lower() in text_lower:
-                # Try to extract the specific company/organization name around the keyword
-                # This is a simple approach - could be improved with NLP
-                sentences = re.split(r'[.!?]+', text)
-                for sentence in sentences:
-                    if keyword.lower() in sentence.lower():
-                        industry_mentions.append(sentence.strip())
+        return results
+
+# Field extractors of parse_cv_details, in priority order within each field
+CV_PROJECT_SECTION_PATTERNS = [
+    r'Projetos?\s+de\s+pesquisa',
+    r'Projetos?\s+de\s+desenvolvimento',
+    r'Research\s+projects?',
+    r'Development\s+projects?',
+    r'Projetos?',
+    r'Pesquisa',
+    r'Research'
+]
+
+CV_VISITOR = DocumentVisitor({
+    'name': [
+        ElementProbe('div', class_='nome'),
+        ElementProbe('h1'),
+        ElementProbe('h2'),
+        ElementProbe('div', string=r'Nome'),
+        ElementProbe('td', string=r'Nome'),
+        ElementProbe('span', class_='nome'),
+        ElementProbe('b', string=r'^[A-Z][a-z]+ [A-Z]'),
+    ],
+    'institution': [
+        ElementProbe('div', class_='instituicao'),
+        ElementProbe('div', class_='inst'),
+        ElementProbe('span', class_='instituicao'),
+        ElementProbe('td', string=r'Instituição'),
+        ElementProbe('div', string=r'Instituição'),
+    ],
+    'project_sections': [
+        ElementProbe(['h1', 'h2', 'h3', 'h4', 'td', 'div', 'span'], string=pattern, collect_all=True)
+        for pattern in CV_PROJECT_SECTION_PATTERNS
+    ],
+    'tables': [ElementProbe('table', collect_all=True)],
+    'project_blocks': [ElementProbe(['div', 'p'], string=r'(projeto|project|pesquisa|research)', collect_all=True)],
+    'area': [
+        ElementProbe('div', class_='area-atuacao'),
+        ElementProbe('div', string=r'Área.*atuação'),
+        ElementProbe('td', string=r'Área.*atuação'),
+    ],
+    'location': [ElementProbe('div', class_='endereco')],
+})
+
+class PipelineMetrics:
+    """Timing samples collected while scraping (summarised by benchmark.py)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latencies = []
+        self.parse_cpu = {}  # parser name -> [calls, thread CPU seconds]
+        self.db_write_seconds = 0.0
+        self.db_batches = 0
+        self.db_records = 0
+    
+    def record_request(self, latency):
+        with self._lock:
+            self.request_latencies.append(latency)
+    
+    def record_parse(self, name, cpu_seconds):
+        with self._lock:
+            totals = self.parse_cpu.setdefault(name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += cpu_seconds
+    
+    def record_db_write(self, seconds, records):
+        with self._lock:
+            self.db_write_seconds += seconds
+            self.db_batches += 1
+            self.db_records += records
+    
+    @staticmethod
+    def percentile(sorted_values, pct):
+        """Nearest-rank percentile of an already sorted list"""
+        if not sorted_values:
+            return None
+        rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+        return sorted_values[rank]
+    
+    def snapshot(self):
+        """Summary of everything recorded so far"""
+        with self._lock:
+            latencies = sorted(self.request_latencies)
+            return {
+                'requests': len(latencies),
+                'latency_p50': self.percentile(latencies, 50),
+                'latency_p95': self.percentile(latencies, 95),
+                'latency_p99': self.percentile(latencies, 99),
+                'parse_cpu_seconds': {name: round(cpu, 4) for name, (_, cpu) in self.parse_cpu.items()},
+                'parse_calls': {name: calls for name, (calls, _) in self.parse_cpu.items()},
+                'db_write_seconds': self.db_write_seconds,
+                'db_batches': self.db_batches,
+                'db_records': self.db_records,
+            }
+
+def timed_parse(name):
+    """Charge the thread CPU time of a CNPqScraper parse method to self.metrics"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            started = time.thread_time()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                self.metrics.record_parse(name, time.thread_time() - started)
+        return wrapper
+    return decorator
+
+class DatabaseWriter:
+    """Single thread that owns the researchers DB connection and applies every write
+    
+    submit() queues a write (a callable taking a cursor) and returns a Future
+    without touching SQLite. The thread group-commits whatever is queued, up to
+    max_batch writes or max_delay seconds after the first one, in a single
+    transaction; a failing write is rolled back to its own savepoint and only
+    its Future fails. Writes are applied in submission order. The connection is
+    opened with the SQLITE_PRAGMAS profile named by profile. If the thread itself
+    dies (connect, BEGIN or COMMIT fails), every outstanding Future gets the error
+    and submit() raises from then on.
+    """
+    
+    def __init__(self, db_path, max_batch=200, max_delay=0.5, metrics=None, profile='default'):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.metrics = metrics
+        self.pragmas = SQLITE_PRAGMAS[profile]
+        self.stats = {'commits': 0, 'writes': 0, 'failed': 0, 'max_queue_depth': 0,
+                      'commit_seconds': 0.0, 'max_commit_seconds': 0.0}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+    
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+    
+    def submit(self, func, records=0, urgent=False):
+        """Queue func(cursor) for the next group commit; records counts toward PipelineMetrics
+        
+        An urgent write commits its group right away instead of waiting for it to fill.
+        """
+        future = Future()
+        with self._lock:
+            if self._error is not None:
+                raise RuntimeError(f"Database writer stopped: {self._error}") from self._error
+            self._queue.put((func, records, future, urgent))
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self._queue.qsize())
+        return future
+    
+    def execute(self, func):
+        """Run func(cursor) on the writer thread after every queued write and return its result"""
+        return self.submit(func, urgent=True).result()
+    
+    def flush(self):
+        """Wait until everything queued so far is committed"""
+        self.execute(lambda cursor: None)
+    
+    def close(self):
+        """Commit what is queued and stop the thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+    
+    def _run(self):
+        conn = None
+        batch = []
+        try:
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            cursor = conn.cursor()
+            for name, value in self.pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+            stopping = False
+            while not stopping:
+                batch = []
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.max_delay
+                while len(batch) < self.max_batch and not batch[-1][3]:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
                         break
+                    batch.append(item)
+                self._commit(cursor, batch)
+            batch = []
+        except BaseException as e:
+            logger.error(f"Database writer stopped: {e}")
+            self._fail_pending(batch, e)
+        finally:
+            if conn is not None:
+                conn.close()
+    
+    def _fail_pending(self, batch, error):
+        """Fail the batch in progress and everything still queued, and refuse later writes"""
+        with self._lock:
+            self._error = error
+        for _, _, future, _ in batch:
+            if not future.done():
+                future.set_exception(error)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[2].set_exception(error)
+    
+    def _commit(self, cursor, batch):
+        started = time.perf_counter()
+        results = []
+        cursor.execute('BEGIN')
+        try:
+            for func, _, future, _ in batch:
+                cursor.execute('SAVEPOINT write')
+                try:
+                    results.append((future, func(cursor), None))
+                    cursor.execute('RELEASE write')
+                except Exception as e:
+                    logger.error(f"Database write failed: {e}")
+                    cursor.execute('ROLLBACK TO write')
+                    cursor.execute('RELEASE write')
+                    results.append((future, None, e))
+            cursor.execute('COMMIT')
+        except BaseException:
+            if cursor.connection.in_transaction:
+                cursor.execute('ROLLBACK')
+            raise
+        
+        seconds = time.perf_counter() - started
+        self.stats['commits'] += 1
+        self.stats['writes'] += len(batch)
+        self.stats['commit_seconds'] += seconds
+        self.stats['max_commit_seconds'] = max(self.stats['max_commit_seconds'], seconds)
+        if self.metrics:
+            self.metrics.record_db_write(seconds, sum(item[1] for item in batch))
+        
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                self.stats['failed'] += 1
+                future.set_exception(error)
+
+def split_search_terms(search_term):
+    """The distinct terms of a researcher's comma-joined search_term field, in order"""
+    return list(dict.fromkeys(term.strip() for term in (search_term or '').split(',') if term.strip()))
+
+class CrawlState:
+    """Checkpoint of a crawl, kept in the crawl_pages/crawl_frontier tables of the researchers DB
+    
+    Search pages are recorded as they are fetched, and each researcher moves
+    through pending → in_flight → done/failed with an attempt count, so an
+    interrupted crawl can resume without repeating finished requests. The terms
+    that found each researcher are in crawl_frontier_terms, keyed by search_terms id.
+    """
+    
+    def __init__(self, writer):
+        self.writer = writer
+    
+    def _execute(self, func):
+        """Run func(cursor) on the DatabaseWriter and wait for its result"""
+        return self.writer.execute(func)
+    
+    def _submit(self, func):
+        """Queue a checkpoint update without waiting for it"""
+        return self.writer.submit(func)
+    
+    def reset(self):
+        """Forget the previous crawl (called when a new, non-resumed crawl starts)"""
+        def run(cursor):
+            cursor.execute('DELETE FROM crawl_pages')
+            cursor.execute('DELETE FROM crawl_frontier_terms')
+            cursor.execute('DELETE FROM crawl_frontier')
+        self._execute(run)
+    
+    def record_page(self, search_term, query, page, total_pages, researchers, dispatched_ids):
+        """Record a fetched results page, its researchers (all found by search_term) and which of them were dispatched"""
+        def run(cursor):
+            cursor.execute('''
+                INSERT OR REPLACE INTO crawl_pages (search_term, query, page, total_pages, researchers_found)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (search_term, query, page, total_pages, len(researchers)))
+            
+            cursor.executemany('''
+                INSERT OR IGNORE INTO crawl_frontier (cnpq_id, name, institution) VALUES (?, ?, ?)
+            ''', [(r['cnpq_id'], r.get('name'), r.get('institution')) for r in researchers])
+            
+            cursor.execute('INSERT OR IGNORE INTO search_terms (term) VALUES (?)', (search_term,))
+            term_id = cursor.execute('SELECT id FROM search_terms WHERE term = ?', (search_term,)).fetchone()[0]
+            cursor.executemany('INSERT OR IGNORE INTO crawl_frontier_terms (cnpq_id, term_id) VALUES (?, ?)',
+                               [(r['cnpq_id'], term_id) for r in researchers])
+            
+            self._mark_dispatched(cursor, dispatched_ids)
+        self._submit(run)
+    
+    def _mark_dispatched(self, cursor, cnpq_ids):
+        cursor.executemany('''
+            UPDATE crawl_frontier
+            SET status = 'in_flight', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE cnpq_id = ?
+        ''', [(cnpq_id,) for cnpq_id in cnpq_ids])
+    
+    def mark_dispatched(self, cnpq_ids):
+        """Mark researchers as handed to the detail stage"""
+        self._submit(lambda cursor: self._mark_dispatched(cursor, cnpq_ids))
+    
+    @staticmethod
+    def mark_done_with(cursor, cnpq_ids):
+        """Mark researchers done within the caller's write, so it commits or rolls back with their records"""
+        cursor.executemany('''
+            UPDATE crawl_frontier SET status = 'done', last_error = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE cnpq_id = ?
+        ''', [(cnpq_id,) for cnpq_id in cnpq_ids])
+    
+    def mark_done(self, cnpq_ids):
+        """Mark researchers whose records are committed to the database"""
+        self._submit(lambda cursor: self.mark_done_with(cursor, cnpq_ids))
+    
+    def mark_failed(self, cnpq_id, error):
+        """Mark a researcher whose detail fetch failed"""
+        self._submit(lambda cursor: cursor.execute('''
+            UPDATE crawl_frontier SET status = 'failed', last_error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE cnpq_id = ?
+        ''', (str(error), cnpq_id)))
+    
+    def term_progress(self, search_term):
+        """Return {'pages', 'total_pages', 'found', 'complete'} for a term, or None if never fetched"""
+        def run(cursor):
+            cursor.execute(
+                'SELECT page, total_pages, researchers_found FROM crawl_pages WHERE search_term = ?',
+                (search_term,)
+            )
+            return cursor.fetchall()
+        rows = self._execute(run)
+        if not rows:
+            return None
+        
+        pages = {row[0] for row in rows}
+        total_pages = max(row[1] or 0 for row in rows)
+        return {
+            'pages': pages,
+            'total_pages': total_pages,
+            'found': sum(row[2] or 0 for row in rows),
+            'complete': total_pages > 0 and len(pages) >= total_pages,
+        }
+    
+    def frontier(self):
+        """Return (cnpq_id, status, attempts) for every researcher seen by the crawl"""
+        def run(cursor):
+            cursor.execute('SELECT cnpq_id, status, attempts FROM crawl_frontier')
+            return cursor.fetchall()
+        return self._execute(run)
+    
+    def unfinished(self, max_attempts=3):
+        """Researchers still to be processed: pending, interrupted in flight, or failed with attempts left"""
+        def run(cursor):
+            cursor.execute('''
+                SELECT cnpq_id, name, institution,
+                       (SELECT group_concat(t.term, ', ') FROM crawl_frontier_terms ft
+                        JOIN search_terms t ON t.id = ft.term_id WHERE ft.cnpq_id = crawl_frontier.cnpq_id)
+                FROM crawl_frontier
+                WHERE status IN ('pending', 'in_flight') OR (status = 'failed' AND attempts < ?)
+                ORDER BY updated_at
+            ''', (max_attempts,))
+            return cursor.fetchall()
+        return [
+            {'cnpq_id': cnpq_id, 'name': name, 'institution': institution or '', 'area': '',
+             'location': '', 'search_term': search_term or ''}
+            for cnpq_id, name, institution, search_term in self._execute(run)
+        ]
+    
+    def exhausted(self, max_attempts=3):
+        """cnpq_ids that failed max_attempts times, which a resumed crawl leaves alone"""
+        def run(cursor):
+            cursor.execute("SELECT cnpq_id FROM crawl_frontier WHERE status = 'failed' AND attempts >= ?",
+                           (max_attempts,))
+            return [row[0] for row in cursor.fetchall()]
+        return self._execute(run)
+    
+    def summary(self):
+        """Count researchers per status"""
+        def run(cursor):
+            cursor.execute('SELECT status, COUNT(*) FROM crawl_frontier GROUP BY status')
+            return dict(cursor.fetchall())
+        return self._execute(run)
+
+class ProjectDeduplicator:
+    """Near-linear engine behind LattesParser.deduplicate_projects
+    
+    Keeps the pairwise rules: a project is dropped, or replaces the first kept
+    project it duplicates (same title, one title containing the other, or word
+    Jaccard above 0.7), with the more descriptive title winning. Instead of
+    scanning every kept project, candidates come from three indexes over titles
+    tokenized once: lowercase title, character q-grams (containment) and the
+    rarest-first word prefix of each title (prefix filtering for the Jaccard
+    threshold). Candidates are then checked with the original rules, in order.
+    """
+    
+    QGRAM = 8
+    CONTAINMENT_MIN_LENGTH = 15
+    SIMILARITY_THRESHOLD = 0.7
+    
+    def __init__(self, is_more_descriptive):
+        self.is_more_descriptive = is_more_descriptive
+    
+    def deduplicate(self, projects):
+        """Return the unique projects, in the order the pairwise algorithm would keep them"""
+        entries = []  # (project, title, lowercase title, word set)
+        for project in projects:
+            title = project.get('title', '').strip()
+            if title:
+                lower = title.lower()
+                entries.append((project, title, lower, set(lower.split())))
+        
+        grams = [self._qgrams(title, lower) for _, title, lower, _ in entries]
+        gram_df = Counter(gram for entry_grams in grams for gram in entry_grams)
+        word_df = Counter(word for *_, words in entries for word in words)
+        
+        # Rarest q-gram of each title, and its shortest word prefix that must
+        # overlap any set with Jaccard >= SIMILARITY_THRESHOLD (rounded to be safe)
+        rare_grams = [min(entry_grams, key=lambda gram: (gram_df[gram], gram)) if entry_grams else None
+                      for entry_grams in grams]
+        prefixes = []
+        for *_, words in entries:
+            ordered = sorted(words, key=lambda word: (word_df[word], word))
+            prefixes.append(ordered[:len(ordered) - int(self.SIMILARITY_THRESHOLD * len(ordered)) + 1])
+        
+        kept = {}  # entry index -> True, in kept order
+        by_lower = {}
+        gram_index = defaultdict(set)  # every q-gram of a kept title
+        rare_gram_index = defaultdict(set)  # rarest q-gram of a kept title
+        prefix_index = defaultdict(set)
+        
+        def add(i):
+            kept[i] = True
+            by_lower[entries[i][2]] = i
+            for gram in grams[i]:
+                gram_index[gram].add(i)
+            if rare_grams[i] is not None:
+                rare_gram_index[rare_grams[i]].add(i)
+            for word in prefixes[i]:
+                prefix_index[word].add(i)
+        
+        def remove(i):
+            del kept[i]
+            del by_lower[entries[i][2]]
+            for gram in grams[i]:
+                gram_index[gram].discard(i)
+            if rare_grams[i] is not None:
+                rare_gram_index[rare_grams[i]].discard(i)
+            for word in prefixes[i]:
+                prefix_index[word].discard(i)
+        
+        for i, (_, title, lower, words) in enumerate(entries):
+            candidates = set()
+            if lower in by_lower:
+                candidates.add(by_lower[lower])
+            if rare_grams[i] is not None:
+                candidates |= gram_index.get(rare_grams[i], set())  # this title inside a kept one
+                for gram in grams[i]:
+                    candidates |= rare_gram_index.get(gram, set())  # a kept title inside this one
+            for word in prefixes[i]:
+                candidates |= prefix_index.get(word, set())
+            
+            is_duplicate = False
+            for j in sorted(candidates):
+                verdict = self._compare(entries[i], entries[j])
+                if verdict == 'duplicate':
+                    is_duplicate = True
+                    break
+                if verdict == 'replace':
+                    remove(j)
+                    break
+            
+            if not is_duplicate:
+                add(i)
+        
+        return [entries[i][0] for i in kept]
+    
+    def _qgrams(self, title, lower):
+        if len(title) < self.CONTAINMENT_MIN_LENGTH:
+            return set()
+        return {lower[k:k + self.QGRAM] for k in range(len(lower) - self.QGRAM + 1)}
+    
+    def _compare(self, entry, existing):
+        """The pairwise rules: 'duplicate', 'replace' (the kept project) or None"""
+        _, title, lower, words = entry
+        _, existing_title, existing_lower, existing_words = existing
+        
+        if lower == existing_lower:
+            return 'duplicate'
+        
+        if len(title) >= self.CONTAINMENT_MIN_LENGTH and len(existing_title) >= self.CONTAINMENT_MIN_LENGTH:
+            if lower in existing_lower or existing_lower in lower:
+                return 'replace' if len(title) > len(existing_title) else 'duplicate'
+        
+        similarity = len(words & existing_words) / len(words | existing_words)
+        if similarity > self.SIMILARITY_THRESHOLD:
+            return 'replace' if self.is_more_descriptive(title, existing_title) else 'duplicate'
+        return None
+
+def project_title_key(title):
+    """Case-, accent- and punctuation-insensitive form of a project title, shared across researchers"""
+    decomposed = unicodedata.normalize('NFKD', (title or '').lower())
+    return ' '.join(re.findall(r'\w+', ''.join(char for char in decomposed if not unicodedata.combining(char))))
+
+# Columns of a projects row taken from the parsed project dict, in table order
+PROJECT_FIELDS = ('title', 'start_date', 'end_date', 'status', 'description', 'funding_sources', 'coordinator_name',
+                  'team_members', 'industry_cooperation', 'formal_methods_concepts', 'formal_methods_tools',
+                  'is_formal_methods_related')
+
+def project_content_hash(project):
+    """Stable hash of a project's whitespace-normalized fields; equal hashes mean nothing to rewrite
+    
+    The title is hashed as displayed, so a case or accent fix is written; sync_projects
+    matches rows by project_title_key only to update them in place.
+    """
+    values = []
+    for field in PROJECT_FIELDS[:-1]:
+        values.append(' '.join(str(project.get(field) or '').split()))
+    values.append(int(bool(project.get('is_formal_methods_related'))))
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+class ProjectClusterer:
+    """Groups canonical projects whose title keys are near-duplicates across the whole corpus
+    
+    Two keys are linked when their word sets have Jaccard similarity >= threshold,
+    and linked projects merge transitively. Candidate pairs come from blocking on
+    the rarest words of each key (prefix filtering), so a key is only compared
+    with keys sharing one of those words. Blocks over max_block keys, made of
+    words nearly every title has, are not scanned, to keep the job linear.
+    """
+    
+    def __init__(self, threshold=0.8, max_block=5000):
+        self.threshold = threshold
+        self.max_block = max_block
+    
+    def clusters(self, keys):
+        """keys: (title_key, canonical_project_id) pairs; return the sets of canonical ids to merge"""
+        word_sets = [set(title_key.split()) for title_key, _ in keys]
+        word_df = Counter(word for words in word_sets for word in words)
+        parent = {canonical_id: canonical_id for _, canonical_id in keys}
+        
+        def find(canonical_id):
+            root = canonical_id
+            while parent[root] != root:
+                root = parent[root]
+            while parent[canonical_id] != root:
+                parent[canonical_id], canonical_id = root, parent[canonical_id]
+            return root
+        
+        blocks = defaultdict(list)
+        for i, words in enumerate(word_sets):
+            ordered = sorted(words, key=lambda word: (word_df[word], word))
+            prefix = ordered[:len(ordered) - int(self.threshold * len(ordered)) + 1]
+            compared = set()
+            for word in prefix:
+                block = blocks[word]
+                if len(block) <= self.max_block:
+                    for j in block:
+                        if j in compared:
+                            continue
+                        compared.add(j)
+                        other = word_sets[j]
+                        if min(len(words), len(other)) < self.threshold * max(len(words), len(other)):
+                            continue
+                        if len(words & other) >= self.threshold * len(words | other):
+                            parent[find(keys[i][1])] = find(keys[j][1])
+                block.append(i)
+        
+        groups = defaultdict(set)
+        for canonical_id in parent:
+            groups[find(canonical_id)].add(canonical_id)
+        return [group for group in groups.values() if len(group) > 1]
+
+# Content only a real results, preview or CV page carries (lowercased)
+PAGE_CONTENT_MARKERS = [
+    'intltotreg', 'class="resultado"', 'nenhum resultado',
+    'class="infpessoa"', 'certificado pelo autor',
+    'dados pessoais', 'personal data', 'formação acadêmica', 'academic background',
+    'projetos de pesquisa', 'research projects', 'última atualização', 'last update'
+]
+
+# A form that asks for a challenge answer; a bare tokenCaptchar input or the reCAPTCHA script is not one
+CAPTCHA_FORM_PATTERN = re.compile(
+    r'<form\b[^>]*>(?:(?!</form>).)*?'
+    r'(?:g-recaptcha|código de segurança|security code|verificação de segurança|security verification)',
+    re.DOTALL
+)
+
+class LattesParser:
+    """Parsing and extraction for buscatextual/Lattes pages, free of network and database state
+    
+    CNPqScraper inherits these methods; parse_page() runs them in worker processes.
+    """
+    
+    def __init__(self):
+        self.metrics = PipelineMetrics()
+    
+    def extract_pagination_info(self, html_content):
+        """Extract pagination information from the HTML"""
+        try:
+            # Look for the JavaScript variables that contain pagination info
+            total_match = re.search(r'var intLTotReg = (\d+);', html_content)
+            current_start_match = re.search(r'var intLRegInicio = (\d+);', html_content)
+            page_size_match = re.search(r'var intLRegPagina = (\d+);', html_content)
+            
+            if total_match and current_start_match and page_size_match:
+                total_records = int(total_match.group(1))
+                current_start = int(current_start_match.group(1))
+                page_size = int(page_size_match.group(1))
+                
+                return {
+                    'total_records': total_records,
+                    'current_start': current_start,
+                    'page_size': page_size,
+                    'has_more': current_start + page_size < total_records
+                }
+        except Exception as e:
+            logger.error(f"Error extracting pagination info: {e}")
+        
+        return None
+    
+    def identify_keywords(self, text, analysis=None):
+        """Find formal methods concepts, tools and industry cooperation mentions in a single pass
+        
+        Returns {'concepts': [...], 'tools': [...], 'industry': [...]}, where each
+        industry entry is the first sentence mentioning an industry keyword.
+        Pass the document's TextAnalysis to share its sentence index.
+        """
+        result = {'concepts': [], 'tools': [], 'industry': []}
+        if not text:
+            return result
+        
+        analysis = analysis or TextAnalysis(text)
+        found = analysis.keywords(KEYWORD_MATCHER)
+        result['concepts'] = found['concepts']
+        result['tools'] = found['tools']
+        
+        for (category, _), sentences in analysis.keyword_sentences(KEYWORD_MATCHER).items():
+            if category == 'industry':
+                sentence = analysis.sentence(sentences[0])
+                if sentence not in result['industry']:
+                    result['industry'].append(sentence)
         
-        return list(set(industry_mentions))  # Remove duplicates
+        return result
+    
+    def identify_formal_methods_concepts(self, text):
+        """Identify formal methods concepts in text"""
+        return self.identify_keywords(text)['concepts']
+    
+    def identify_formal_methods_tools(self, text):
+        """Identify formal methods tools in text"""
+        return self.identify_keywords(text)['tools']
+    
+    def identify_industry_cooperation(self, text):
+        """Identify industry cooperation mentions in text"""
+        return self.identify_keywords(text)['industry']
     
     def is_formal_methods_related(self, title, description):
         """Check if a project is related to formal methods"""
@@ -388,280 +1781,101 @@ class CNPqScraper:
                         return f"{groups[2]}-{groups[1].zfill(2)}-{groups[0].zfill(2)}"
         
         return date_str  # Return as-is if no pattern matches
-
-    async def search_researchers_async(self, search_term="metodos formais", max_pages=None, max_concurrent=5):
-        """Async version of search_researchers with parallel page fetching"""
-        self.progress.print_status(f"🚀 Async searching for: '{search_term}' (max {max_concurrent} concurrent)", "🚀")
-        
-        # Build the search query URL
-        terms = search_term.split()
-        if len(terms) >= 2:
-            query = f"(+idx_assunto:({terms[0]})+idx_assunto:({terms[1]})+idx_particao:1)"
-        else:
-            query = f"(+idx_assunto:({terms[0]})+idx_particao:1)"
-        
-        # First, get the total number of pages from page 1
-        first_page_data = await self.fetch_page_async(0, query, search_term)
-        if not first_page_data:
-            return []
-        
-        researchers, pagination_info = first_page_data
-        total_records = pagination_info.get('total_records', 0) if pagination_info else 0
-        page_size = pagination_info.get('page_size', 10) if pagination_info else 10
-        total_pages = (total_records + page_size - 1) // page_size if total_records > 0 else 1
+    
+    @timed_parse('search_results')
+    def parse_search_results(self, html_content, search_term):
+        """Parse the search results HTML to extract researcher IDs and basic info
+        
+        Uses the lxml fast path when lxml is installed, and the BeautifulSoup
+        parser whenever the page doesn't look like a regular results list.
+        """
+        if lxml_html is not None:
+            researchers = self.parse_search_results_fast(html_content, search_term)
+            if researchers is not None:
+                return researchers
+        return self.parse_search_results_soup(html_content, search_term)
+    
+    def parse_search_results_fast(self, html_content, search_term):
+        """Parse only the results <ol> with lxml; returns None if the structure is unexpected"""
+        expected_links = html_content.count('javascript:abreDetalhe(')
+        if not expected_links:
+            return None  # Let the full parser work out (and log) what kind of page this is
+        
+        # Restrict parsing to the results list when there is one
+        list_start = html_content.find('<ol')
+        list_end = html_content.rfind('</ol>')
+        if list_start != -1 and list_end > list_start:
+            html_content = html_content[list_start:list_end + len('</ol>')]
         
-        self.progress.print_status(f"📊 Found {total_records} total records ({total_pages} pages) for '{search_term}'", "📊")
+        try:
+            root = lxml_html.fromstring(html_content)
+        except (etree.ParserError, ValueError):
+            return None
         
-        # Apply max_pages limit if specified
-        if max_pages and total_pages > max_pages:
-            total_pages = max_pages
-            estimated_records = max_pages * page_size
-            self.progress.print_status(f"⚠️ Limiting to {max_pages} pages ({estimated_records} records) as requested", "⚠️")
-        else:
-            self.progress.print_status(f"🎯 Will fetch ALL {total_pages} pages ({total_records} records) in parallel", "🎯")
+        researcher_links = root.xpath("//a[contains(@href, 'javascript:abreDetalhe(')]")
+        if len(researcher_links) != expected_links:
+            return None
         
-        all_researchers = researchers  # Start with page 1 results
+        logger.info(f"Found {len(researcher_links)} potential researcher links")
+        researchers = []
         
-        if total_pages > 1:
-            # Create semaphore to limit concurrent requests
-            semaphore = asyncio.Semaphore(max_concurrent)
+        for link in researcher_links:
+            id_match = re.search(r'abreDetalhe\(\'([^\']+)\',\'([^\']+)\'', link.get('href'))
+            if not id_match:
+                continue
             
-            # Create tasks for remaining pages
-            tasks = []
-            for page in range(1, total_pages):  # Skip page 0 (already fetched)
-                task = self.fetch_page_with_semaphore(semaphore, page, query, search_term)
-                tasks.append(task)
+            cnpq_id = id_match.group(1)
+            # Same text as BeautifulSoup's get_text(strip=True)
+            name = ''.join(text.strip() for text in link.itertext())
+            logger.info(f"Found researcher: {name} (ID: {cnpq_id})")
             
-            # Execute all tasks in parallel with progress tracking
-            self.progress.print_status(f"🧵 Fetching {len(tasks)} pages in parallel (max {max_concurrent} concurrent)", "🧵")
+            li_parent = next(link.iterancestors('li'), None)
+            text_content = li_parent.text_content() if li_parent is not None else ''
             
-            completed = 0
-            async for task in asyncio.as_completed(tasks):
-                try:
-                    result = await task
-                    if result:
-                        page_researchers, _ = result
-                        all_researchers.extend(page_researchers)
-                    
-                    completed += 1
-                    # Show progress every 10 completions or at key intervals
-                    if completed % 10 == 0 or completed == len(tasks) or completed <= 5:
-                        percentage = (completed / len(tasks)) * 100
-                        self.progress.print_status(f"📄 Progress: {completed}/{len(tasks)} pages ({percentage:.1f}%) - Total researchers: {len(all_researchers)}", "📄")
-                
-                except Exception as e:
-                    logger.error(f"Error fetching page: {e}")
-                    completed += 1
-        
-        if total_records:
-            percentage = (len(all_researchers) / total_records) * 100
-            self.progress.print_status(f"✅ Collected {len(all_researchers)} researchers out of {total_records} total available ({percentage:.1f}%) for '{search_term}'", "✅")
+            researchers.append({
+                'cnpq_id': cnpq_id,
+                'name': name,
+                'institution': self.extract_institution_from_result(text_content),
+                'area': '',
+                'location': '',
+                'search_term': search_term
+            })
         
-        return all_researchers
+        return researchers
     
-    async def fetch_page_with_semaphore(self, semaphore, page, query, search_term):
-        """Fetch a single page with semaphore limiting"""
-        async with semaphore:
-            return await self.fetch_page_async(page, query, search_term)
+    def extract_institution_from_result(self, text_content):
+        """Guess the institution from the text of a results list item"""
+        institution = ""
+        lines = [line.strip() for line in text_content.split('\n') if line.strip()]
+        
+        # Look for patterns like "Doutorado em..." or "MBA em..."
+        for line in lines:
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in ('doutorado', 'mestrado', 'mba', 'graduação')):
+                if 'pela' in line_lower:
+                    parts = line.split('pela')
+                    if len(parts) > 1:
+                        institution = parts[1].split(',')[0].strip()
+            elif any(keyword in line_lower for keyword in ('professor', 'trabalha', 'analista')):
+                if 'do ' in line or 'da ' in line or 'na ' in line:
+                    # Extract institution from work description
+                    for prep in [' do ', ' da ', ' na ']:
+                        if prep in line:
+                            institution = line.split(prep)[1].split(',')[0].strip()
+                            break
+        
+        return institution
     
-    async def fetch_page_async(self, page, query, search_term):
-        """Fetch a single page asynchronously"""
-        start_record = page * 10
-        url = f"{self.base_url}/busca.do"
+    def parse_search_results_soup(self, html_content, search_term):
+        """Parse the search results with BeautifulSoup (the original, structure-tolerant parser)"""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        researchers = []
         
-        params = {
-            'metodo': 'forwardPaginaResultados',
-            'registros': f'{start_record};10',
-            'query': query,
-            'analise': 'cv',
-            'tipoOrdenacao': 'null',
-            'paginaOrigem': 'index.do',
-            'mostrarScore': 'true',
-            'mostrarBandeira': 'true',
-            'modoIndAdhoc': 'null'
-        }
+        # Look for researcher links with the correct pattern
+        # Pattern: javascript:abreDetalhe('K4219769E2','Alexandre_Filgueiras',14714388,)
+        researcher_links = soup.find_all('a', href=re.compile(r'javascript:abreDetalhe\('))
         
-        try:
-            # Create SSL context similar to sync version
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.set_ciphers('DEFAULT@SECLEVEL=1')
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            # Create aiohttp connector with custom SSL
-            connector = aiohttp.TCPConnector(
-                ssl=ssl_context,
-                limit=100,
-                limit_per_host=20
-            )
-            
-            # Create aiohttp session with proper headers and SSL config
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                headers=self.session.headers,
-                cookies=self.session.cookies,
-                connector=connector
-            ) as session:
-                async with session.get(url, params=params) as response:
-                    response.raise_for_status()
-                    html_content = await response.text()
-                    
-                    # Parse results
-                    researchers = self.parse_search_results(html_content, search_term)
-                    pagination_info = self.extract_pagination_info(html_content)
-                    
-                    return researchers, pagination_info
-        
-        except Exception as e:
-            logger.error(f"Error fetching page {page + 1}: {e}")
-            return None
-    
-    def search_researchers(self, search_term="metodos formais", max_pages=None):
-        """Enhanced search with async support - wrapper for backward compatibility"""
-        # Try async version first for better performance
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If we're already in an async context, use the sync version
-                return self.search_researchers_sync(search_term, max_pages)
-            else:
-                # Use async version for better performance
-                return loop.run_until_complete(
-                    self.search_researchers_async(search_term, max_pages, max_concurrent=8)
-                )
-        except RuntimeError:
-            # Fallback to sync version if async fails
-            return self.search_researchers_sync(search_term, max_pages)
-    
-    def search_researchers_sync(self, search_term="metodos formais", max_pages=None):
-        """Search for researchers based on the search term"""
-        self.progress.print_status(f"🔍 Searching for: '{search_term}'", "🔍")
-        
-        # Test connection first
-        if not self.test_connection():
-            logger.error("Cannot connect to CNPq website. Please check your internet connection.")
-            return []
-        
-        # Build the search query URL - use simpler format that works
-        terms = search_term.split()
-        if len(terms) >= 2:
-            # For multiple terms, search for both
-            query = f"(+idx_assunto:({terms[0]})+idx_assunto:({terms[1]})+idx_particao:1)"
-        else:
-            # For single term
-            query = f"(+idx_assunto:({terms[0]})+idx_particao:1)"
-        
-        all_researchers = []
-        total_records = None
-        total_pages = None
-        spinner_count = 0
-        page = 0
-        
-        while True:
-            start_record = page * 10
-            url = f"{self.base_url}/busca.do"
-            
-            params = {
-                'metodo': 'forwardPaginaResultados',
-                'registros': f'{start_record};10',
-                'query': query,
-                'analise': 'cv',
-                'tipoOrdenacao': 'null',
-                'paginaOrigem': 'index.do',
-                'mostrarScore': 'true',
-                'mostrarBandeira': 'true',
-                'modoIndAdhoc': 'null'
-            }
-            
-            try:
-                # Show progress while fetching
-                progress_msg = f"Fetching page {page + 1}"
-                if total_pages:
-                    progress_msg += f"/{total_pages}"
-                progress_msg += f" for '{search_term}'"
-                self.progress.show_spinner(progress_msg, spinner_count)
-                spinner_count += 1
-                
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                # Extract pagination info from the first page
-                if page == 0:
-                    pagination_info = self.extract_pagination_info(response.text)
-                    if pagination_info:
-                        total_records = pagination_info['total_records']
-                        page_size = pagination_info['page_size']
-                        total_pages = (total_records + page_size - 1) // page_size  # Round up
-                        
-                        self.progress.print_status(f"📊 Found {total_records} total records ({total_pages} pages) for '{search_term}'", "📊")
-                        
-                        # Apply max_pages limit only if specified by user
-                        if max_pages and total_pages > max_pages:
-                            total_pages = max_pages
-                            estimated_records = max_pages * page_size
-                            self.progress.print_status(f"⚠️ Limiting to {max_pages} pages ({estimated_records} records) as requested", "⚠️")
-                        else:
-                            self.progress.print_status(f"🎯 Will fetch ALL {total_pages} pages ({total_records} records)", "🎯")
-                
-                researchers = self.parse_search_results(response.text, search_term)
-                
-                # Check if we have pagination info to make better decisions
-                pagination_info = self.extract_pagination_info(response.text)
-                
-                if not researchers:
-                    # If we have pagination info, check if there should be more pages
-                    if pagination_info and pagination_info['has_more']:
-                        self.progress.print_status(f"⚠️ Expected more results but found none on page {page + 1}. Continuing...", "⚠️")
-                        time.sleep(2)
-                        page += 1
-                        continue
-                    else:
-                        self.progress.print_status(f"✅ Reached end of results on page {page + 1}", "✅")
-                        break
-                
-                all_researchers.extend(researchers)
-                self.progress.print_status(f"📋 Found {len(researchers)} researchers on page {page + 1} (Total: {len(all_researchers)})", "📋")
-                
-                # Check if we should continue based on pagination info
-                if pagination_info and not pagination_info['has_more']:
-                    self.progress.print_status(f"🏁 Reached last page ({page + 1}) based on pagination info", "🏁")
-                    break
-                
-                # Check if we've reached the user-specified max_pages limit
-                if max_pages and page + 1 >= max_pages:
-                    self.progress.print_status(f"🛑 Reached user-specified limit of {max_pages} pages", "🛑")
-                    break
-                
-                # Check if we've reached the total pages available
-                if total_pages and page + 1 >= total_pages:
-                    self.progress.print_status(f"🏁 Reached all available pages ({total_pages})", "🏁")
-                    break
-                
-                # Be respectful to the server
-                time.sleep(2)
-                page += 1
-                
-            except requests.RequestException as e:
-                self.progress.print_status(f"❌ Error fetching page {page + 1}: {e}", "❌")
-                break
-        
-        if total_records:
-            percentage = (len(all_researchers) / total_records) * 100
-            self.progress.print_status(f"✅ Collected {len(all_researchers)} researchers out of {total_records} total available ({percentage:.1f}%) for '{search_term}'", "✅")
-        
-        return all_researchers
-    
-    def parse_search_results(self, html_content, search_term):
-        """Parse the search results HTML to extract researcher IDs and basic info"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        researchers = []
-        
-        # Look for researcher links with the correct pattern
-        # Pattern: javascript:abreDetalhe('K4219769E2','Alexandre_Filgueiras',14714388,)
-        researcher_links = soup.find_all('a', href=re.compile(r'javascript:abreDetalhe\('))
-        
-        logger.info(f"Found {len(researcher_links)} potential researcher links")
+        logger.info(f"Found {len(researcher_links)} potential researcher links")
         
         # Also check for any parsing issues by looking at the HTML structure
         if len(researcher_links) == 0:
@@ -708,23 +1922,7 @@ class CNPqScraper:
                 
                 if li_parent:
                     # Extract institution and other details from the list item
-                    text_content = li_parent.get_text()
-                    lines = [line.strip() for line in text_content.split('\n') if line.strip()]
-                    
-                    # Look for patterns like "Doutorado em..." or "MBA em..."
-                    for line in lines:
-                        if any(keyword in line.lower() for keyword in ['doutorado', 'mestrado', 'mba', 'graduação']):
-                            if 'pela' in line.lower():
-                                parts = line.split('pela')
-                                if len(parts) > 1:
-                                    institution = parts[1].split(',')[0].strip()
-                        elif any(keyword in line.lower() for keyword in ['professor', 'trabalha', 'analista']):
-                            if 'do ' in line or 'da ' in line or 'na ' in line:
-                                # Extract institution from work description
-                                for prep in [' do ', ' da ', ' na ']:
-                                    if prep in line:
-                                        institution = line.split(prep)[1].split(',')[0].strip()
-                                        break
+                    institution = self.extract_institution_from_result(li_parent.get_text())
                 
                 researcher = {
                     'cnpq_id': cnpq_id,
@@ -739,214 +1937,21 @@ class CNPqScraper:
         
         return researchers
     
-    def get_researcher_details(self, cnpq_id):
-        """Get detailed information from the researcher's CV page using multiple approaches"""
-        try:
-            # First approach: Try the preview page which already has all the info we need
-            # This bypasses the reCaptcha issue completely
-            logger.info(f"Trying preview-based extraction for {cnpq_id}")
-            preview_details = self.get_researcher_details_from_preview(cnpq_id)
-            
-            if preview_details and preview_details.get('name'):
-                logger.info(f"Successfully extracted details from preview for {cnpq_id}")
-                return preview_details
-            
-            # If preview extraction fails, fall back to the complex reCaptcha approach
-            logger.info(f"Preview extraction failed, trying reCaptcha approach for {cnpq_id}")
-            return self.get_researcher_details_with_captcha(cnpq_id)
-            
-        except Exception as e:
-            logger.error(f"Error in get_researcher_details for {cnpq_id}: {e}")
-            return {}
-    
-    def get_researcher_details_with_captcha(self, cnpq_id):
-        """Original method that deals with reCaptcha - kept as fallback"""
-        try:
-            # First, try to access the CV directly using the simple GET method (sometimes works)
-            logger.info(f"Attempting direct CV access for {cnpq_id}")
-            direct_cv_url = f"{self.base_url}/visualizacv.do"
-            direct_params = {
-                'metodo': 'apresentar',
-                'id': cnpq_id
-            }
-            
-            try:
-                direct_response = self.session.get(direct_cv_url, params=direct_params, timeout=15)
-                direct_response.raise_for_status()
-                
-                # Check if this is a valid CV page (not a captcha page)
-                if self.is_valid_cv_page(direct_response.text):
-                    logger.info(f"Direct access successful for {cnpq_id}")
-                    return self.parse_cv_details(direct_response.text)
-                else:
-                    logger.info(f"Direct access returned captcha page for {cnpq_id}")
-            except Exception as e:
-                logger.warning(f"Direct access failed for {cnpq_id}: {e}")
-            
-            # If direct access fails, try the preview + token approach
-            logger.info(f"Trying preview + token approach for {cnpq_id}")
-            preview_url = f"{self.base_url}/preview.do"
-            preview_params = {
-                'metodo': 'apresentar',
-                'id': cnpq_id
-            }
-            
-            preview_response = self.session.get(preview_url, params=preview_params, timeout=15)
-            preview_response.raise_for_status()
-            
-            # Check if preview page is also showing captcha
-            if not self.is_valid_cv_page(preview_response.text):
-                logger.warning(f"Preview page also shows captcha for {cnpq_id}")
-                # Save the HTML for debugging
-                self.save_debug_html(preview_response.text, f"debug_preview_{cnpq_id}.html")
-            
-            # Try multiple token extraction patterns
-            token = self.extract_token_from_html(preview_response.text)
-            
-            if not token:
-                logger.warning(f"No token found for {cnpq_id}, attempting without token")
-                token = ""
-            
-            # Now make the POST request to get the full CV using multipart form-data
-            cv_url = f"{self.base_url}/visualizacv.do"
-            
-            # Prepare the multipart form data based on the curl example
-            form_data = {
-                'metodo': 'apresentar',
-                'id': cnpq_id,
-                'idiomaExibicao': '',
-                'tipo': '',
-                'tokenCaptchar': token,
-                'nomeCaptchar': 'V2',
-                'mostrarNroCitacoesScielo': '',
-                'mostrarNroCitacoesScopus': '',
-                'mostrarNroCitacoesISI': '',
-                # Add all the filter fields with default values
-                'filtros.paisAtividade': '0',
-                'filtros.regiaoAtividade': '0',
-                'filtros.ufAtividade': '0',
-                'filtros.siglaInstAtividade': '',
-                'filtros.nomeInstAtividade': '',
-                'filtros.naturezaAtividade': '0',
-                'filtros.atividadeAtual': 'false',
-                'filtros.paisFormacao': '0',
-                'filtros.regiaoFormacao': '0',
-                'filtros.ufFormacao': '0',
-                'filtros.siglaInstFormacao': '',
-                'filtros.nomeInstFormacao': '',
-                'filtros.nivelFormacao': '0',
-                'filtros.grdAreaFormacao': '0',
-                'filtros.areaFormacao': '0',
-                'filtros.idioma': '0',
-                'filtros.proeficienciaLeitura': '',
-                'filtros.proeficienciaEscrita': '',
-                'filtros.proeficienciaFala': '',
-                'filtros.proeficienciaCompreensao': '',
-                'filtros.grandeAreaAtuacao': '0',
-                'filtros.areaAtuacao': '0',
-                'filtros.subareaAtuacao': '0',
-                'filtros.especialidadeAtuacao': '0',
-                'filtros.codigoGrandeAreaAtuacao': '0',
-                'filtros.codigoAreaAtuacao': '0',
-                'filtros.codigoSubareaAtuacao': '0',
-                'filtros.codigoEspecialidadeAtuacao': '0',
-                'filtros.grandeAreaProducao': '0',
-                'filtros.areaProducao': '0',
-                'filtros.setorProducao': '0',
-                'filtros.subSetorProducao': '0',
-                'filtros.tipoRelacao': 'AND',
-                'filtros.categoriaNivelBolsa': '',
-                'filtros.orientadorCNPq': '',
-                'filtros.conceitoCurso': '',
-                'filtros.participaDGP': 'false',
-                'filtros.modalidadeBolsa': '0',
-                'filtros.buscaNome': 'false',
-                'filtros.buscaAssunto': 'false',
-                'filtros.buscaCPF': 'false',
-                'filtros.buscaAtuacao': 'false',
-                'filtros.tipoOrdenacao': 'SCR',
-                'filtros.atualizacaoCurriculo': '48',
-                'filtros.quantidadeRegistros': '25',
-                'filtros.registroInicial': '1',
-                'filtros.registroFinal': '25',
-                'textoBuscaTodas': '',
-                'textoBuscaFrase': '',
-                'textoBuscaQualquer': '',
-                'textoBuscaNenhuma': '',
-                'textoExpressao': '',
-                'particaoProcura': '',
-                'buscarDoutores': 'false',
-                'buscarDemais': 'false',
-                'buscarDoutoresAvancada': 'false',
-                'buscarDemaisAvancada': 'false',
-                'textoBuscaAssunto': '',
-                'tipoConector': 'AND',
-                'resumoFormacao': '',
-                'resumoAtividade': '',
-                'resumoAtuacao': '',
-                'resumoProducao': '',
-                'resumoPesquisador': '',
-                'resumoIdioma': '',
-                'resumoPresencaDGP': '',
-                'resumoModalidade': '',
-                'intCPaginaAtual': '1',
-                'parametrosBusca': '',
-                'strCNavegador': '',
-                'strCSistemaOperacional': '',
-                'strCIP': '',
-                'buscaAvancada': '0',
-                'moduloIndicacaoAdhoc': 'false',
-                'query': '',
-                'modoIndAdhoc': '',
-                'tipoFuncaoIndicacaoAdHoc': '',
-                'buscarBrasileirosAvancada': 'false',
-                'buscarEstrangeirosAvancada': 'false',
-                'buscarBrasileiros': 'false',
-                'buscarEstrangeiros': 'false',
-                'g-recaptcha-response': token  # Use the same token for reCaptcha
-            }
-            
-            # Set the correct content-type for multipart form-data
-            cv_response = self.session.post(cv_url, data=form_data, timeout=30)
-            cv_response.raise_for_status()
-            
-            # Check if the response is valid
-            if self.is_valid_cv_page(cv_response.text):
-                logger.info(f"Successfully fetched CV for {cnpq_id} using POST method")
-                return self.parse_cv_details(cv_response.text)
-            else:
-                logger.warning(f"POST method returned captcha page for {cnpq_id}")
-                # Save the HTML for debugging
-                self.save_debug_html(cv_response.text, f"debug_post_{cnpq_id}.html")
-                
-                # Try alternative approach: use the Lattes direct URL
-                return self.try_alternative_access(cnpq_id)
-            
-        except requests.RequestException as e:
-            logger.error(f"Error fetching details for {cnpq_id}: {e}")
-            return self.try_alternative_access(cnpq_id)
-        
-        return {}
+    def is_captcha_page(self, html_content):
+        """Check if the HTML content is a captcha challenge instead of the requested page"""
+        html_lower = html_content.lower()
+        if any(marker in html_lower for marker in PAGE_CONTENT_MARKERS):
+            return False
+        return CAPTCHA_FORM_PATTERN.search(html_lower) is not None
     
     def is_valid_cv_page(self, html_content):
         """Check if the HTML content is a valid CV page (not a captcha page)"""
-        # Signs that this is a captcha page
-        captcha_indicators = [
-            'código de segurança',
-            'security code',
-            'recaptcha',
-            'g-recaptcha',
-            'captcha',
-            'verificação de segurança',
-            'security verification'
-        ]
-        
-        html_lower = html_content.lower()
-        
         # If it contains captcha indicators, it's not a valid CV
-        if any(indicator in html_lower for indicator in captcha_indicators):
+        if self.is_captcha_page(html_content):
             return False
         
+        html_lower = html_content.lower()
+        
         # Signs that this is a valid CV page
         cv_indicators = [
             'curriculum lattes',
@@ -986,92 +1991,21 @@ class CNPqScraper:
         
         return None
     
-    def save_debug_html(self, html_content, filename):
-        """Save HTML content for debugging purposes"""
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            logger.info(f"Debug HTML saved to {filename}")
-        except Exception as e:
-            logger.warning(f"Failed to save debug HTML: {e}")
-    
-    def try_alternative_access(self, cnpq_id):
-        """Try alternative methods to access the CV"""
-        logger.info(f"Trying alternative access methods for {cnpq_id}")
+    @timed_parse('cv')
+    def parse_cv_details(self, html_content):
+        """Parse the CV page to extract detailed information including projects
+        
+        The tree is walked once by CV_VISITOR, which hands every field extractor
+        the elements it registered for; the results are resolved below.
+        """
+        soup = BeautifulSoup(html_content, 'html.parser')
+        details = {'projects': []}
         
-        # Method 1: Try direct Lattes URL
         try:
-            lattes_url = f"http://lattes.cnpq.br/{cnpq_id}"
-            logger.info(f"Trying direct Lattes URL: {lattes_url}")
+            found = CV_VISITOR.visit(soup)
             
-            response = self.session.get(lattes_url, timeout=15)
-            response.raise_for_status()
-            
-            if self.is_valid_cv_page(response.text):
-                logger.info(f"Direct Lattes access successful for {cnpq_id}")
-                return self.parse_cv_details(response.text)
-            else:
-                logger.warning(f"Direct Lattes also shows captcha for {cnpq_id}")
-                self.save_debug_html(response.text, f"debug_lattes_{cnpq_id}.html")
-                
-        except Exception as e:
-            logger.error(f"Direct Lattes access failed for {cnpq_id}: {e}")
-        
-        # Method 2: Try different user agent
-        try:
-            logger.info(f"Trying with different user agent for {cnpq_id}")
-            old_user_agent = self.session.headers.get('User-Agent')
-            
-            # Use a simpler user agent
-            self.session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            
-            cv_url = f"{self.base_url}/visualizacv.do"
-            params = {
-                'metodo': 'apresentar',
-                'id': cnpq_id
-            }
-            
-            response = self.session.get(cv_url, params=params, timeout=15)
-            response.raise_for_status()
-            
-            # Restore original user agent
-            if old_user_agent:
-                self.session.headers.update({'User-Agent': old_user_agent})
-            
-            if self.is_valid_cv_page(response.text):
-                logger.info(f"Alternative user agent successful for {cnpq_id}")
-                return self.parse_cv_details(response.text)
-                
-        except Exception as e:
-            logger.error(f"Alternative user agent failed for {cnpq_id}: {e}")
-            # Restore original user agent
-            if old_user_agent:
-                self.session.headers.update({'User-Agent': old_user_agent})
-        
-        logger.error(f"All access methods failed for {cnpq_id}")
-        return {}
-    
-    def parse_cv_details(self, html_content):
-        """Parse the CV page to extract detailed information including projects"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        details = {'projects': []}
-        
-        try:
             # Extract researcher name - try multiple patterns
-            name_patterns = [
-                soup.find('div', class_='nome'),
-                soup.find('h1'),
-                soup.find('h2'),
-                soup.find('div', string=re.compile(r'Nome', re.I)),
-                soup.find('td', string=re.compile(r'Nome', re.I)),
-                # Try to find name in spans or other elements
-                soup.find('span', class_='nome'),
-                soup.find('b', string=re.compile(r'^[A-Z][a-z]+ [A-Z]', re.I))
-            ]
-            
-            for name_elem in name_patterns:
+            for name_elem in found['name']:
                 if name_elem:
                     name_text = name_elem.get_text(strip=True)
                     if name_text and len(name_text) > 5 and not any(x in name_text.lower() for x in ['curriculum', 'lattes', 'cnpq']):
@@ -1097,20 +2031,7 @@ class CNPqScraper:
                     break
             
             # Extract institution - try multiple approaches
-            institution_selectors = [
-                ('div', {'class': 'instituicao'}),
-                ('div', {'class': 'inst'}),
-                ('span', {'class': 'instituicao'}),
-                ('td', {'string': re.compile(r'Instituição', re.I)}),
-                ('div', {'string': re.compile(r'Instituição', re.I)}),
-            ]
-            
-            for tag, attrs in institution_selectors:
-                if 'string' in attrs:
-                    elem = soup.find(tag, string=attrs['string'])
-                else:
-                    elem = soup.find(tag, attrs)
-                
+            for elem in found['institution']:
                 if elem:
                     if elem.name == 'td':
                         next_td = elem.find_next_sibling('td')
@@ -1123,23 +2044,9 @@ class CNPqScraper:
             # Enhanced project extraction - try multiple approaches
             logger.info("Starting project extraction...")
             
-            # Approach 1: Look for specific project section headers
-            project_section_patterns = [
-                r'Projetos?\s+de\s+pesquisa',
-                r'Projetos?\s+de\s+desenvolvimento',
-                r'Research\s+projects?',
-                r'Development\s+projects?',
-                r'Projetos?',
-                r'Pesquisa',
-                r'Research'
-            ]
-            
+            # Approach 1: Look for specific project section headers (CV_PROJECT_SECTION_PATTERNS order)
             projects_found = False
-            for pattern in project_section_patterns:
-                # Find section headers
-                section_headers = soup.find_all(['h1', 'h2', 'h3', 'h4', 'td', 'div', 'span'], 
-                                                string=re.compile(pattern, re.I))
-                
+            for section_headers in found['project_sections']:
                 for header in section_headers:
                     logger.info(f"Found potential project section: {header.get_text()}")
                     projects = self.extract_projects_from_section(header)
@@ -1151,7 +2058,7 @@ class CNPqScraper:
             # Approach 2: If no projects found in sections, try table-based extraction
             if not projects_found:
                 logger.info("No projects found in sections, trying table extraction...")
-                tables = soup.find_all('table')
+                tables = found['tables'][0]
                 for i, table in enumerate(tables):
                     projects = self.extract_projects_from_table(table)
                     if projects:
@@ -1162,8 +2069,7 @@ class CNPqScraper:
             if not details['projects']:
                 logger.info("No projects found in tables, trying text block extraction...")
                 # Look for div or p elements that might contain project information
-                potential_project_blocks = soup.find_all(['div', 'p'], 
-                    string=re.compile(r'(projeto|project|pesquisa|research)', re.I))
+                potential_project_blocks = found['project_blocks'][0]
                 
                 for block in potential_project_blocks:
                     parent = block.find_parent(['div', 'td', 'li'])
@@ -1173,13 +2079,7 @@ class CNPqScraper:
                             details['projects'].append(project)
             
             # Extract other fields (area, location, etc.)
-            area_patterns = [
-                soup.find('div', class_='area-atuacao'),
-                soup.find('div', string=re.compile(r'Área.*atuação', re.I)),
-                soup.find('td', string=re.compile(r'Área.*atuação', re.I))
-            ]
-            
-            for elem in area_patterns:
+            for elem in found['area']:
                 if elem:
                     if elem.name == 'td':
                         next_td = elem.find_next_sibling('td')
@@ -1190,7 +2090,7 @@ class CNPqScraper:
                     break
             
             # Extract location information
-            location_elem = soup.find('div', class_='endereco')
+            location_elem = found['location'][0]
             if location_elem:
                 location_text = location_elem.get_text(strip=True)
                 location_parts = location_text.split(',')
@@ -1389,14 +2289,14 @@ class CNPqScraper:
                     project['team_members'] = match.group(1).strip()
                     break
             
-            # Identify industry cooperation
-            industry_mentions = self.identify_industry_cooperation(text_content)
+            # Identify industry cooperation, formal methods concepts and tools in one pass
+            keywords = self.identify_keywords(text_content)
+            industry_mentions = keywords['industry']
             if industry_mentions:
                 project['industry_cooperation'] = '; '.join(industry_mentions)
             
-            # Identify formal methods concepts and tools
-            concepts = self.identify_formal_methods_concepts(text_content)
-            tools = self.identify_formal_methods_tools(text_content)
+            concepts = keywords['concepts']
+            tools = keywords['tools']
             
             if concepts:
                 project['formal_methods_concepts'] = ', '.join(concepts)
@@ -1415,328 +2315,115 @@ class CNPqScraper:
         
         return project
     
-    def process_researcher_with_details(self, researcher):
-        """Process a single researcher with details (for threading)"""
-        try:
-            # Get detailed information
-            details = self.get_researcher_details(researcher['cnpq_id'])
-            researcher.update(details)
-            
-            # Save to database (including projects)
-            self.save_researcher(researcher)
-            
-            project_count = len(details.get('projects', []))
-            fm_projects = sum(1 for p in details.get('projects', []) if p.get('is_formal_methods_related'))
-            
-            return {
-                'researcher': researcher,
-                'project_count': project_count,
-                'fm_projects': fm_projects,
-                'success': True
-            }
-        except Exception as e:
-            logger.error(f"Error processing researcher {researcher.get('name', 'Unknown')}: {e}")
-            return {
-                'researcher': researcher,
-                'project_count': 0,
-                'fm_projects': 0,
-                'success': False,
-                'error': str(e)
-            }
-    
-    def save_researcher(self, researcher_data):
-        """Save researcher data and projects to the database (thread-safe)"""
-        with self.db_lock:  # Ensure thread-safe database operations
-            try:
-                # Create a new connection for thread safety
-                conn = sqlite3.connect('cnpq_researchers.db')
-                cursor = conn.cursor()
-                
-                # Check if researcher already exists
-                cursor.execute('SELECT id, cnpq_id FROM researchers WHERE cnpq_id = ?', 
-                                  (researcher_data.get('cnpq_id'),))
-                existing = cursor.fetchone()
-                
-                researcher_id = None
-                
-                if existing:
-                    researcher_id = existing[0]
-                    # Update existing record with new search term if different
-                    cursor.execute('''
-                        UPDATE researchers 
-                        SET search_term = CASE 
-                            WHEN search_term LIKE '%' || ? || '%' THEN search_term
-                            ELSE search_term || ', ' || ?
-                        END,
-                        name = COALESCE(?, name),
-                        institution = COALESCE(?, institution),
-                        area = COALESCE(?, area),
-                        city = COALESCE(?, city),
-                        state = COALESCE(?, state),
-                        country = COALESCE(?, country),
-                        last_update_date = COALESCE(?, last_update_date),
-                        updated_at = CURRENT_TIMESTAMP
-                        WHERE cnpq_id = ?
-                    ''', (
-                        researcher_data.get('search_term'),
-                        researcher_data.get('search_term'),
-                        researcher_data.get('name'),
-                        researcher_data.get('institution'),
-                        researcher_data.get('area'),
-                        researcher_data.get('city'),
-                        researcher_data.get('state'),
-                        researcher_data.get('country'),
-                        researcher_data.get('last_update_date'),
-                        researcher_data.get('cnpq_id')
-                    ))
-                    logger.info(f"Updated researcher: {researcher_data.get('name')} ({researcher_data.get('cnpq_id')})")
-                else:
-                    # Insert new researcher
-                    cursor.execute('''
-                        INSERT INTO researchers 
-                        (cnpq_id, name, institution, area, city, state, country, lattes_url, search_term, last_update_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        researcher_data.get('cnpq_id'),
-                        researcher_data.get('name'),
-                        researcher_data.get('institution'),
-                        researcher_data.get('area'),
-                        researcher_data.get('city'),
-                        researcher_data.get('state'),
-                        researcher_data.get('country'),
-                        f"http://lattes.cnpq.br/{researcher_data.get('cnpq_id')}" if researcher_data.get('cnpq_id') else None,
-                        researcher_data.get('search_term'),
-                        researcher_data.get('last_update_date')
-                    ))
-                    researcher_id = cursor.lastrowid
-                    logger.info(f"Saved new researcher: {researcher_data.get('name')} ({researcher_data.get('cnpq_id')})")
-                
-                # Save projects if they exist
-                projects = researcher_data.get('projects', [])
-                if projects and researcher_id:
-                    # First, delete existing projects for this researcher to avoid duplicates
-                    cursor.execute('DELETE FROM projects WHERE cnpq_id = ?', (researcher_data.get('cnpq_id'),))
-                    
-                    # Insert new projects
-                    for project in projects:
-                        cursor.execute('''
-                            INSERT INTO projects 
-                            (researcher_id, cnpq_id, title, start_date, end_date, status, description, 
-                             funding_sources, coordinator_name, team_members, industry_cooperation, 
-                             formal_methods_concepts, formal_methods_tools, is_formal_methods_related)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            researcher_id,
-                            researcher_data.get('cnpq_id'),
-                            project.get('title'),
-                            project.get('start_date'),
-                            project.get('end_date'),
-                            project.get('status'),
-                            project.get('description'),
-                            project.get('funding_sources'),
-                            project.get('coordinator_name'),
-                            project.get('team_members'),
-                            project.get('industry_cooperation'),
-                            project.get('formal_methods_concepts'),
-                            project.get('formal_methods_tools'),
-                            project.get('is_formal_methods_related', False)
-                        ))
-                    
-                    formal_methods_projects = sum(1 for p in projects if p.get('is_formal_methods_related'))
-                    logger.info(f"Saved {len(projects)} projects for {researcher_data.get('name')} ({formal_methods_projects} formal methods related)")
-                
-                conn.commit()
-                conn.close()
-            except sqlite3.Error as e:
-                logger.error(f"Database error: {e}")
-                if conn:
-                    conn.close()
-    
-    def scrape_all(self, search_terms=None, max_pages_per_term=None, get_details=True, use_threading=True, batch_size=100):
-        """Main method to scrape all researchers with enhanced performance optimizations"""
-        print("\n🚀 Starting CNPq Lattes Enhanced Research Aggregator v3.0 (TURBO)")
-        print("=" * 70)
-        
-        if search_terms is None:
-            search_terms = SEARCH_TERMS
-        
-        self.progress.print_status(f"🎯 Will process {len(search_terms)} search term pairs", "🎯")
-        
-        if max_pages_per_term:
-            self.progress.print_status(f"📄 Limited to max {max_pages_per_term} pages per term", "📄")
-        else:
-            self.progress.print_status(f"🌐 Will fetch ALL available pages per term (ASYNC PARALLEL)", "🌐")
-            
-        if use_threading:
-            self.progress.print_status(f"🧵 Using {self.max_workers} threads with batch processing (batch size: {batch_size})", "🧵")
-        else:
-            self.progress.print_status(f"🔄 Sequential processing with batch saves", "🔄")
-        
-        all_researchers = []
-        
-        # Phase 1: Search for researchers (OPTIMIZED WITH ASYNC)
-        print(f"\n📍 PHASE 1: Searching for Researchers (TURBO MODE)")
-        print("-" * 50)
-        
-        term_progress = 0
-        for english_term, portuguese_term in search_terms:
-            term_progress += 1
-            
-            print(f"\n🔍 [{term_progress}/{len(search_terms)}] Processing: '{english_term}' / '{portuguese_term}'")
-            
-            # Try Portuguese term first, then English if no results
-            for term_lang, term in [("PT", portuguese_term.lower()), ("EN", english_term.lower())]:
-                self.progress.print_status(f"🌐 Trying {term_lang}: '{term}' (ASYNC)", "🌐")
-                researchers = self.search_researchers(term, max_pages_per_term)
-                
-                if researchers:
-                    self.progress.print_status(f"✅ Found {len(researchers)} researchers for '{term}' ({term_lang})", "✅")
-                    all_researchers.extend(researchers)
-                    break  # Found results, no need to try the other language
-                else:
-                    self.progress.print_status(f"❌ No results for '{term}' ({term_lang})", "❌")
-        
-        # Remove duplicates
-        print(f"\n🔄 Removing duplicates...")
-        unique_researchers = {}
-        for researcher in all_researchers:
-            cnpq_id = researcher['cnpq_id']
-            if cnpq_id not in unique_researchers:
-                unique_researchers[cnpq_id] = researcher
-            else:
-                # Merge search terms
-                existing_terms = unique_researchers[cnpq_id]['search_term']
-                new_term = researcher['search_term']
-                if new_term not in existing_terms:
-                    unique_researchers[cnpq_id]['search_term'] = f"{existing_terms}, {new_term}"
-        
-        researchers_list = list(unique_researchers.values())
-        self.progress.print_status(f"📊 Found {len(researchers_list)} unique researchers total (removed {len(all_researchers) - len(researchers_list)} duplicates)", "📊")
-        
-        if not get_details:
-            # Just save basic info without details using batch save
-            self.save_researchers_batch(researchers_list)
-            self.progress.print_status("💾 Basic information saved to database (BATCH)", "💾")
-            return researchers_list
-        
-        # Phase 2: Extract detailed information (OPTIMIZED WITH BATCHING)
-        print(f"\n📍 PHASE 2: Extracting Detailed Project Information (BATCH MODE)")
-        print("-" * 50)
-        
-        self.progress.print_status(f"🔄 Processing {len(researchers_list)} researchers in batches of {batch_size}", "🔄")
+    def extract_certification_date(self, html_content):
+        """Extract the "Certificado pelo autor em" date from a preview page without parsing it"""
+        update_patterns = [
+            r'Certificado pelo autor em\s*(\d{1,2}/\d{1,2}/\d{4})',
+            r'última\s+atualização.*?(\d{1,2}/\d{1,2}/\d{4})',
+            r'last\s+update.*?(\d{1,2}/\d{1,2}/\d{4})',
+            r'(\d{1,2}/\d{1,2}/\d{4})',
+        ]
         
-        # Use the optimized batch processing
-        all_results = self.process_researchers_batch(researchers_list, batch_size)
+        for pattern in update_patterns:
+            match = re.search(pattern, html_content, re.IGNORECASE)
+            if match:
+                return match.group(1)
+        return None
+    
+    def extract_preview_fields_fast(self, html_content):
+        """Return (name, certification date, bio) from one lxml tree, or None if lxml can't parse the page"""
+        try:
+            root = lxml_html.fromstring(html_content)
+        except (etree.ParserError, ValueError):
+            return None
         
-        # Calculate final statistics
-        completed_count = len(all_results)
-        successful_results = [r for r in all_results if r['success']]
-        total_projects = sum(r['project_count'] for r in successful_results)
-        total_fm_projects = sum(r['fm_projects'] for r in successful_results)
-        errors = len(all_results) - len(successful_results)
+        def first_text(xpath):
+            # Same text as BeautifulSoup's get_text(strip=True)
+            elements = root.xpath(xpath)
+            return ''.join(text.strip() for text in elements[0].itertext()) if elements else None
         
-        # Final summary
-        print(f"\n📍 COMPLETION SUMMARY (TURBO MODE)")
-        print("-" * 50)
-        elapsed_total = time.time() - self.progress.start_time
+        name = first_text("//h1[contains(concat(' ', normalize-space(@class), ' '), ' name ')]")
+        resumo_text = first_text("//p[contains(concat(' ', normalize-space(@class), ' '), ' resumo ')]")
         
-        self.progress.print_status(f"✅ Processing completed!", "✅")
-        self.progress.print_status(f"👥 Researchers: {len(successful_results)}/{completed_count} processed successfully", "👥")
-        self.progress.print_status(f"📋 Projects: {total_projects} extracted", "📋")
-        self.progress.print_status(f"🎯 FM Projects: {total_fm_projects} identified", "🎯")
-        self.progress.print_status(f"❌ Errors: {errors}", "❌" if errors > 0 else "✅")
-        self.progress.print_status(f"⏱️ Total time: {int(elapsed_total//60)}:{int(elapsed_total%60):02d}", "⏱️")
-        self.progress.print_status(f"🚀 Speed: {len(researchers_list)/(elapsed_total/60):.1f} researchers/minute", "🚀")
-        self.progress.print_status(f"💾 Data saved to 'cnpq_researchers.db' (BATCH MODE)", "💾")
+        # Only the text holding the certification line is searched; the raw-HTML patterns are the fallback
+        last_update_date = None
+        for text in root.xpath("//text()[contains(., 'Certificado pelo autor em')]"):
+            match = re.search(r'Certificado pelo autor em\s*(\d{1,2}/\d{1,2}/\d{4})', text)
+            if match:
+                last_update_date = match.group(1)
+                break
+        if last_update_date is None:
+            last_update_date = self.extract_certification_date(
+                html_content if isinstance(html_content, str) else html_content.decode('utf-8', 'replace')
+            )
         
-        return researchers_list
+        return name, last_update_date, resumo_text
     
-    def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
-
-    def get_researcher_details_from_preview(self, cnpq_id):
-        """Extract researcher details from the preview page which has all the info we need"""
-        try:
-            logger.info(f"Extracting details from preview page for {cnpq_id}")
-            
-            preview_url = f"{self.base_url}/preview.do"
-            preview_params = {
-                'metodo': 'apresentar',
-                'id': cnpq_id
-            }
-            
-            response = self.session.get(preview_url, params=preview_params, timeout=15)
-            response.raise_for_status()
-            
-            return self.parse_preview_details(response.text, cnpq_id)
-            
-        except Exception as e:
-            logger.error(f"Error fetching preview details for {cnpq_id}: {e}")
-            return {}
+    def extract_preview_fields_soup(self, html_content):
+        """Return (name, certification date, bio) using BeautifulSoup and the raw-HTML date patterns"""
+        if isinstance(html_content, bytes):
+            html_content = html_content.decode('utf-8', 'replace')
+        soup = BeautifulSoup(html_content, 'html.parser')
+        name_elem = soup.find('h1', class_='name')
+        resumo_elem = soup.find('p', class_='resumo')
+        return (
+            name_elem.get_text(strip=True) if name_elem else None,
+            self.extract_certification_date(html_content),
+            resumo_elem.get_text(strip=True) if resumo_elem else None,
+        )
     
+    def extract_preview_fields(self, html_content):
+        """Return (name, certification date, bio), from lxml when it is installed"""
+        fields = self.extract_preview_fields_fast(html_content) if lxml_html is not None else None
+        return fields or self.extract_preview_fields_soup(html_content)
+    
+    @timed_parse('preview')
     def parse_preview_details(self, html_content, cnpq_id):
-        """Parse the preview page to extract researcher information"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        """Parse the preview page (text or response bytes) to extract researcher information
+        
+        h1.name, p.resumo and the certification line are taken from a single lxml
+        tree when lxml is installed; the bio is then analysed once.
+        """
         details = {'projects': []}
         
         try:
+            name, last_update_date, resumo_text = self.extract_preview_fields(html_content)
+            
             # Extract researcher name from h1.name
-            name_elem = soup.find('h1', class_='name')
-            if name_elem:
-                details['name'] = name_elem.get_text(strip=True)
+            if name is not None:
+                details['name'] = name
                 logger.info(f"Found researcher name: {details['name']}")
             
             # Extract last update date - look for "Certificado pelo autor em XX/XX/XXXX"
-            update_patterns = [
-                r'Certificado pelo autor em\s*(\d{1,2}/\d{1,2}/\d{4})',
-                r'última\s+atualização.*?(\d{1,2}/\d{1,2}/\d{4})',
-                r'last\s+update.*?(\d{1,2}/\d{1,2}/\d{4})',
-                r'(\d{1,2}/\d{1,2}/\d{4})',
-            ]
-            
-            for pattern in update_patterns:
-                match = re.search(pattern, html_content, re.IGNORECASE)
-                if match:
-                    details['last_update_date'] = match.group(1)
-                    logger.info(f"Found last update date: {details['last_update_date']}")
-                    break
+            if last_update_date:
+                details['last_update_date'] = last_update_date
+                logger.info(f"Found last update date: {details['last_update_date']}")
             
             # Extract the researcher's summary/bio
-            resumo_elem = soup.find('p', class_='resumo')
-            if resumo_elem:
-                resumo_text = resumo_elem.get_text(strip=True)
+            if resumo_text is not None:
                 details['summary'] = resumo_text
+                analysis = TextAnalysis(resumo_text)
                 
                 # Extract institution from bio (usually mentions UFPE, USP, etc.)
-                institution_patterns = [
-                    r'(?:do|da|na)\s+(Centro de Informática.*?(?:UFPE|da UFPE))',
-                    r'(?:do|da|na)\s+(Universidade[^.]*)',
-                    r'(?:do|da|na)\s+(Instituto[^.]*)',
-                    r'(?:do|da|na)\s+(Faculdade[^.]*)',
-                    r'(UFPE|USP|UNICAMP|UFRJ|UFRGS|UFMG|UnB)',
-                ]
-                
-                for pattern in institution_patterns:
-                    match = re.search(pattern, resumo_text, re.IGNORECASE)
+                for pattern in BIO_INSTITUTION_PATTERNS:
+                    match = pattern.search(resumo_text)
                     if match:
                         details['institution'] = match.group(1)
                         logger.info(f"Found institution: {details['institution']}")
                         break
                 
                 # Extract area from bio 
-                if 'engenharia de software' in resumo_text.lower():
+                if 'engenharia de software' in analysis.lower:
                     details['area'] = 'Engenharia de Software'
-                elif 'ciência da computação' in resumo_text.lower():
+                elif 'ciência da computação' in analysis.lower:
                     details['area'] = 'Ciência da Computação'
-                elif 'métodos formais' in resumo_text.lower():
+                elif 'métodos formais' in analysis.lower:
                     details['area'] = 'Métodos Formais'
-                elif 'inteligência artificial' in resumo_text.lower():
+                elif 'inteligência artificial' in analysis.lower:
                     details['area'] = 'Inteligência Artificial'
                 
                 # Try to extract projects from the summary text
-                projects = self.extract_projects_from_summary(resumo_text)
+                projects = self.extract_projects_from_summary(resumo_text, analysis)
                 if projects:
                     details['projects'] = projects
                     logger.info(f"Extracted {len(projects)} projects from summary")
@@ -1764,7 +2451,7 @@ class CNPqScraper:
         
         return details
     
-    def extract_projects_from_summary(self, summary_text):
+    def extract_projects_from_summary(self, summary_text, analysis=None):
         """Extract project information from researcher's summary using generic patterns for technology/computing"""
         projects = []
         
@@ -1788,21 +2475,9 @@ class CNPqScraper:
                 r'(?i)(?:pesquisa|research)\s+(?:em\s+|in\s+|sobre\s+|on\s+)?([^.,;]{15,80}(?:software|system|algorithm|network|data|artificial|machine|computer|computing|programming|development|technology|digital|information|cyber|security|database|web|mobile|cloud|sistemas|algoritmo|dados|inteligência|computação|tecnologia|segurança)[^.,;]{0,40})',
             ]
             
-            # Technology companies and institutions (for cooperation detection)
-            tech_companies = [
-                'Microsoft', 'Google', 'IBM', 'Oracle', 'SAP', 'Amazon', 'Facebook', 'Meta',
-                'Apple', 'Intel', 'NVIDIA', 'Samsung', 'Huawei', 'Siemens', 'Bosch',
-                'Motorola', 'Nokia', 'Ericsson', 'Cisco', 'VMware', 'Adobe', 'Salesforce',
-                'Embraer', 'Petrobras', 'Vale', 'Itaú', 'Bradesco', 'Banco do Brasil',
-                'TIM', 'Vivo', 'Claro', 'NET', 'Porto Seguro', 'Globo', 'Record'
-            ]
-            
-            # Funding agencies (Brazilian and international)
-            funding_agencies = [
-                'CNPq', 'CAPES', 'FAPESP', 'FAPERJ', 'FAPEMIG', 'FINEP', 'BNDES',
-                'European Commission', 'European Union', 'Comunidade Europeia', 'FP7', 'H2020',
-                'NSF', 'NIH', 'DARPA', 'NASA', 'IEEE', 'ACM'
-            ]
+            # Sentence index and organization mentions, shared by the extractors below
+            analysis = analysis or TextAnalysis(summary_text)
+            organizations = analysis.keywords(ORGANIZATION_MATCHER)
             
             # Extract projects using patterns
             extracted_titles = set()  # Avoid duplicates
@@ -1823,23 +2498,21 @@ class CNPqScraper:
                         projects.append(project)
             
             # Look for company cooperations
-            for company in tech_companies:
-                if re.search(rf'\b{re.escape(company)}\b', summary_text, re.IGNORECASE):
-                    # Try to extract more context about this cooperation
-                    cooperation_project = self.extract_company_cooperation(company, summary_text)
-                    if cooperation_project:
-                        projects.append(cooperation_project)
+            for company in organizations['companies']:
+                # Try to extract more context about this cooperation
+                cooperation_project = self.extract_company_cooperation(company, summary_text, analysis)
+                if cooperation_project:
+                    projects.append(cooperation_project)
             
             # Look for funded projects
-            for agency in funding_agencies:
-                if re.search(rf'\b{re.escape(agency)}\b', summary_text, re.IGNORECASE):
-                    funded_project = self.extract_funded_project(agency, summary_text)
-                    if funded_project:
-                        projects.append(funded_project)
+            for agency in organizations['agencies']:
+                funded_project = self.extract_funded_project(agency, summary_text, analysis)
+                if funded_project:
+                    projects.append(funded_project)
             
             # Extract dates and periods for all projects
             for project in projects:
-                self.extract_project_dates(project, summary_text)
+                self.extract_project_dates(project, summary_text, analysis)
             
             # Remove duplicates based on title similarity
             projects = self.deduplicate_projects(projects)
@@ -1907,10 +2580,11 @@ class CNPqScraper:
         # Analyze if it's formal methods related
         project['is_formal_methods_related'] = self.is_formal_methods_related(title, title)
         
-        # Extract concepts and tools
-        concepts = self.identify_formal_methods_concepts(title)
-        tools = self.identify_formal_methods_tools(title)
-        industry = self.identify_industry_cooperation(title)
+        # Extract concepts, tools and industry mentions
+        keywords = self.identify_keywords(title)
+        concepts = keywords['concepts']
+        tools = keywords['tools']
+        industry = keywords['industry']
         
         if concepts:
             project['formal_methods_concepts'] = ', '.join(concepts)
@@ -1921,14 +2595,13 @@ class CNPqScraper:
         
         return project
     
-    def extract_company_cooperation(self, company, summary_text):
-        """Extract cooperation project with a specific company"""
-        # Look for context around the company mention
-        pattern = rf'([^.]*\b{re.escape(company)}\b[^.]*)'
-        match = re.search(pattern, summary_text, re.IGNORECASE)
+    def extract_company_cooperation(self, company, summary_text, analysis=None):
+        """Extract cooperation project with a specific company (a name from TECH_COMPANIES)"""
+        # Look for context around the company mention: its sentence, split on '.'
+        analysis = analysis or TextAnalysis(summary_text)
+        context = analysis.first_sentence_with(ORGANIZATION_MATCHER, 'companies', company, '.')
         
-        if match:
-            context = match.group(1).strip()
+        if context:
             if len(context) > 20 and any(keyword in context.lower() for keyword in 
                                        ['cooperação', 'colaboração', 'parceria', 'projeto', 'cooperation', 'collaboration']):
                 return {
@@ -1940,14 +2613,13 @@ class CNPqScraper:
                 }
         return None
     
-    def extract_funded_project(self, agency, summary_text):
-        """Extract project funded by a specific agency"""
-        # Look for context around the funding agency mention
-        pattern = rf'([^.]*\b{re.escape(agency)}\b[^.]*)'
-        match = re.search(pattern, summary_text, re.IGNORECASE)
+    def extract_funded_project(self, agency, summary_text, analysis=None):
+        """Extract project funded by a specific agency (a name from FUNDING_AGENCIES)"""
+        # Look for context around the funding agency mention: its sentence, split on '.'
+        analysis = analysis or TextAnalysis(summary_text)
+        context = analysis.first_sentence_with(ORGANIZATION_MATCHER, 'agencies', agency, '.')
         
-        if match:
-            context = match.group(1).strip()
+        if context:
             if len(context) > 20 and any(keyword in context.lower() for keyword in 
                                        ['financiado', 'apoiado', 'projeto', 'pesquisa', 'funded', 'grant']):
                 return {
@@ -1959,13 +2631,14 @@ class CNPqScraper:
                 }
         return None
     
-    def extract_project_dates(self, project, summary_text):
+    def extract_project_dates(self, project, summary_text, analysis=None):
         """Try to extract dates for a project from the summary"""
         # Look for date patterns near the project title
         title = project.get('title', '')
+        summary_lower = analysis.lower if analysis else summary_text.lower()
         
         # Find the project mention in the text
-        title_pos = summary_text.lower().find(title.lower())
+        title_pos = summary_lower.find(title.lower())
         if title_pos != -1:
             # Look in a window around the title for dates
             window_start = max(0, title_pos - 100)
@@ -2000,224 +2673,2222 @@ class CNPqScraper:
         if not projects:
             return projects
         
-        unique_projects = []
+        return ProjectDeduplicator(self.is_more_descriptive).deduplicate(projects)
+    
+    def is_more_descriptive(self, title1, title2):
+        """Check if title1 is more descriptive than title2"""
+        # Longer titles are generally more descriptive
+        if len(title1) > len(title2) + 10:  # Significantly longer
+            return True
+        elif len(title2) > len(title1) + 10:
+            return False
+        
+        # Count technical terms
+        tech_terms = ['software', 'system', 'algorithm', 'network', 'data', 'artificial', 
+                     'machine', 'computer', 'computing', 'programming', 'development', 
+                     'technology', 'digital', 'information', 'cyber', 'security', 'database',
+                     'sistemas', 'algoritmo', 'dados', 'inteligência', 'computação', 'tecnologia']
+        
+        title1_tech_count = sum(1 for term in tech_terms if term in title1.lower())
+        title2_tech_count = sum(1 for term in tech_terms if term in title2.lower())
+        
+        return title1_tech_count > title2_tech_count
+    
+    def title_similarity(self, title1, title2):
+        """Calculate similarity between two titles (simple word overlap)"""
+        if not title1 or not title2:
+            return 0
+        
+        words1 = set(title1.lower().split())
+        words2 = set(title2.lower().split())
+        
+        if not words1 or not words2:
+            return 0
+        
+        intersection = words1.intersection(words2)
+        union = words1.union(words2)
+        
+        return len(intersection) / len(union) if union else 0
+
+
+def _parse_search_results_page(parser, html_content, context):
+    return (parser.parse_search_results(html_content, context.get('search_term', '')),
+            parser.extract_pagination_info(html_content))
+
+def _parse_preview_page(parser, html_content, context):
+    known_update_date = context.get('known_update_date')
+    if known_update_date and not parser.is_captcha_page(html_content):
+        # The same extractor as parse_preview_details, so the stored date compares equal
+        last_update_date = parser.extract_preview_fields(html_content)[1]
+        if last_update_date == known_update_date:
+            return {'unchanged': True, 'last_update_date': last_update_date}
+    return parser.parse_preview_details(html_content, context.get('cnpq_id'))
+
+def _parse_cv_page(parser, html_content, context):
+    return parser.parse_cv_details(html_content)
+
+def _parse_summary(parser, summary_text, context):
+    return parser.extract_projects_from_summary(summary_text)
+
+# Page type -> parse function; the names double as PipelineMetrics parse names
+PAGE_PARSERS = {
+    'search_results': _parse_search_results_page,
+    'preview': _parse_preview_page,
+    'cv': _parse_cv_page,
+    'summary': _parse_summary,
+}
+
+# Code and patterns the extractors run; any edit to them changes parser_version() and drops memoized results
+PARSER_CODE = (KeywordMatcher, TextAnalysis, ElementProbe, DocumentVisitor, ProjectDeduplicator, LattesParser,
+               *PAGE_PARSERS.values())
+PARSER_PATTERNS = (
+    [pattern.pattern for pattern in BIO_INSTITUTION_PATTERNS],
+    CV_VISITOR.probe_groups,
+    PAGE_CONTENT_MARKERS,
+    CAPTCHA_FORM_PATTERN.pattern,
+)
+
+@functools.lru_cache(maxsize=None)
+def parser_code_fingerprint():
+    """Hash of the source of PARSER_CODE and of PARSER_PATTERNS"""
+    digest = hashlib.sha256()
+    for code in PARSER_CODE:
+        digest.update(inspect.getsource(code).encode('utf-8'))
+    digest.update(repr(PARSER_PATTERNS).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def parser_version(page_type):
+    """Version stamp of a page type's extractor: its code fingerprint plus the keyword lists it uses"""
+    if page_type == 'search_results':
+        return parser_code_fingerprint()
+    return f"{parser_code_fingerprint()}-{KEYWORD_MATCHER.fingerprint}-{ORGANIZATION_MATCHER.fingerprint}"
+
+_worker_parser = None
+
+def parse_page(page_type, body, context=None):
+    """Process-pool entry point: parse one fetched page into plain, picklable records
+    
+    body may be raw bytes or text. Returns (records, cpu_seconds) so the caller
+    can charge the worker's CPU time to its own PipelineMetrics.
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = LattesParser()
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', errors='replace')
+    started = time.process_time()
+    records = PAGE_PARSERS[page_type](_worker_parser, body, context or {})
+    return records, time.process_time() - started
+
+def parse_archived_page(page_type, blob, context=None):
+    """parse_page() for a compressed HtmlArchive body, decompressed in the worker"""
+    return parse_page(page_type, zlib.decompress(blob), context)
+
+class CNPqScraper(LattesParser):
+    # CV pages answer every request with a reCaptcha, so a captcha there says nothing about load
+    CAPTCHA_GATED_ENDPOINTS = frozenset({'visualizacv.do', 'lattes'})
+    
+    def __init__(self, max_workers=5, pool_size=100, pool_size_per_host=20, host_concurrency=None,
+                 min_concurrency=1, max_concurrency=64, rate_limits=None, cache_dir='.http_cache', cache_ttls=None,
+                 base_url="https://buscatextual.cnpq.br/buscatextual", lattes_url="http://lattes.cnpq.br",
+                 db_path='cnpq_researchers.db', parse_workers=None, archive_dir='html_archive',
+                 memo_dir='.parse_memo', db_batch_size=200, db_commit_delay=0.5, bulk_load=False):
+        self.session = requests.Session()
+        # Both can point at a stand-in such as mock_cnpq_server.py
+        self.base_url = base_url.rstrip('/')
+        self.lattes_url = lattes_url.rstrip('/')
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.pool_size = pool_size  # Max pooled keep-alive connections for the async client
+        self.pool_size_per_host = pool_size_per_host
+        # Max in-flight async requests per host, e.g. {'buscatextual.cnpq.br': 200}
+        # (raise pool_size_per_host along with it, or requests queue in the connector)
+        self.host_concurrency = host_concurrency or {}
+        self._host_semaphores = {}
+        self.progress = ProgressIndicator()
+        # Shared by search and detail requests; max_workers is only the starting point
+        self.concurrency = AdaptiveConcurrencyController(
+            initial_limit=max_workers, min_limit=min_concurrency, max_limit=max_concurrency
+        )
+        # Every outgoing request spends a token from its endpoint's budget, e.g. {'preview.do': 10.0}
+        self.rate_limiter = TokenBucketRateLimiter(rate_limits)
+        # Disk cache for GET responses; cache_dir=None disables it
+        self.cache = ResponseCache(cache_dir, cache_ttls) if cache_dir else None
+        # Every page fetched from the network, for offline reparses; archive_dir=None disables it
+        self.archive = HtmlArchive(archive_dir) if archive_dir else None
+        # Parse results of pages seen before; memo_dir=None disables it
+        self.memo = ParseMemo(memo_dir) if memo_dir else None
+        self._loop = None  # Event loop that owns the shared aiohttp session
+        self._aio_session = None
+        self.metrics = PipelineMetrics()  # Request latency, parse CPU and DB write timings
+        # Project rows written by sync_projects: inserted, updated, deleted, unchanged
+        self.project_changes = Counter()
+        # Initial loads skip DEFERRED_INDEXES maintenance and fsyncs until finish_bulk_load()
+        self.bulk_load = bulk_load
+        # Owns the researchers DB connection; every write is queued to it
+        check_sqlite_version()
+        self.db_writer = DatabaseWriter(self.db_path, max_batch=db_batch_size, max_delay=db_commit_delay,
+                                        metrics=self.metrics, profile='bulk' if bulk_load else 'default')
+        # Worker processes for the async parse stage; 0 parses inline on the event loop
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self._parse_pool = None
+        self.setup_session()
+        self.setup_database()
+        self.crawl_state = CrawlState(self.db_writer)
+    
+    def setup_session(self):
+        """Setup session with headers and cookies"""
+        # Disable SSL warnings for problematic sites
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        
+        # Create a custom SSL context that's more permissive
+        class CustomHTTPSAdapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                ctx = create_urllib3_context()
+                ctx.set_ciphers('DEFAULT@SECLEVEL=1')
+                ctx.check_hostname = False
+                ctx.verify_mode = ssl.CERT_NONE
+                kwargs['ssl_context'] = ctx
+                return super().init_poolmanager(*args, **kwargs)
+        
+        # Setup retry strategy; 429s are left to the rate limiter and the AIMD controller,
+        # which would never see them if urllib3 retried them here
+        retry_strategy = Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=[500, 502, 503, 504],
+        )
+        
+        # Setup adapter with retry strategy and custom SSL
+        adapter = CustomHTTPSAdapter(max_retries=retry_strategy)
+        self.session.mount("http://", HTTPAdapter(max_retries=retry_strategy))
+        self.session.mount("https://", adapter)
+        
+        # Set session timeout
+        self.session.timeout = 30
+        
+        # Configure SSL settings
+        self.session.verify = False
+        
+        self.session.cookies.update({
+            'JSESSIONID': '9796D8BC1349A10F8BABBFA4CCAB997F.buscatextual_0',
+            'fontSize': '10',
+            'imp': 'cnpqrestritos',
+            'idioma': 'PT',
+            'BIGipServerpool_buscatextual.cnpq.br': '84541450.36895.0000',
+            '__utma': '259604505.635986498.1748306865.1748306865.1748306865.1',
+            '__utmc': '259604505',
+            '__utmz': '259604505.1748306865.1.1.utmcsr=memoria.cnpq.br|utmccn=(referral)|utmcmd=referral|utmcct=/',
+            '__utmb': '259604505.30.10.1748306865',
+        })
+        
+        self.session.headers.update({
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Cache-Control': 'max-age=0',
+            'Connection': 'keep-alive',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'same-origin',
+            'Sec-Fetch-User': '?1',
+            'Upgrade-Insecure-Requests': '1',
+            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36',
+            'sec-ch-ua': '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
+            'sec-ch-ua-mobile': '?0',
+            'sec-ch-ua-platform': '"Linux"',
+        })
+    
+    def setup_database(self):
+        """Create SQLite database and tables for detailed researcher and project information"""
+        self.db_writer.execute(self.create_tables)
+    
+    def create_tables(self, cursor):
+        """Create the researcher, project and crawl checkpoint tables (runs on the DB writer)"""
+        # Main researchers table with additional fields
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS researchers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cnpq_id TEXT UNIQUE,
+                name TEXT,
+                institution TEXT,
+                area TEXT,
+                city TEXT,
+                state TEXT,
+                country TEXT,
+                lattes_url TEXT,
+                last_update_date TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Every search term once, and which researchers each one found
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_terms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                term TEXT UNIQUE
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS researcher_terms (
+                researcher_id INTEGER,
+                term_id INTEGER,
+                PRIMARY KEY (researcher_id, term_id),
+                FOREIGN KEY (researcher_id) REFERENCES researchers (id),
+                FOREIGN KEY (term_id) REFERENCES search_terms (id)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_researcher_terms_term 
+            ON researcher_terms (term_id, researcher_id)
+        ''')
+        
+        # Projects table for detailed project information
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS projects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                researcher_id INTEGER,
+                cnpq_id TEXT,
+                title TEXT,
+                start_date TEXT,
+                end_date TEXT,
+                status TEXT,
+                description TEXT,
+                funding_sources TEXT,
+                coordinator_name TEXT,
+                team_members TEXT,
+                industry_cooperation TEXT,
+                formal_methods_concepts TEXT,
+                formal_methods_tools TEXT,
+                is_formal_methods_related BOOLEAN DEFAULT 0,
+                content_hash TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (researcher_id) REFERENCES researchers (id),
+                FOREIGN KEY (cnpq_id) REFERENCES researchers (cnpq_id)
+            )
+        ''')
+        
+        # Index for better performance
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_projects_cnpq_id 
+            ON projects (cnpq_id)
+        ''')
+        
+        cursor.execute('PRAGMA table_info(researchers)')
+        if 'search_term' in {row[1] for row in cursor.fetchall()}:
+            self.migrate_search_terms(cursor)
+        
+        cursor.execute('PRAGMA table_info(projects)')
+        if 'content_hash' not in {row[1] for row in cursor.fetchall()}:
+            self.migrate_project_hashes(cursor)
+        
+        # One row per distinct project across all researchers (see link_canonical_projects)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS canonical_projects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT,
+                start_date TEXT,
+                end_date TEXT,
+                status TEXT,
+                description TEXT,
+                funding_sources TEXT,
+                industry_cooperation TEXT,
+                formal_methods_concepts TEXT,
+                formal_methods_tools TEXT,
+                is_formal_methods_related BOOLEAN DEFAULT 0,
+                researcher_count INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Every project_title_key seen, and the canonical project it belongs to
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS project_title_keys (
+                title_key TEXT PRIMARY KEY,
+                canonical_project_id INTEGER,
+                FOREIGN KEY (canonical_project_id) REFERENCES canonical_projects (id)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS researcher_projects (
+                cnpq_id TEXT,
+                canonical_project_id INTEGER,
+                project_id INTEGER,
+                PRIMARY KEY (cnpq_id, canonical_project_id),
+                FOREIGN KEY (canonical_project_id) REFERENCES canonical_projects (id),
+                FOREIGN KEY (project_id) REFERENCES projects (id)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_researcher_projects_canonical 
+            ON researcher_projects (canonical_project_id)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_project_title_keys_canonical 
+            ON project_title_keys (canonical_project_id)
+        ''')
+        
+        # Crawl checkpoint: results pages already fetched per search term
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_pages (
+                search_term TEXT,
+                query TEXT,
+                page INTEGER,
+                total_pages INTEGER,
+                researchers_found INTEGER,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (search_term, page)
+            )
+        ''')
+        
+        # Crawl checkpoint: every researcher seen and how far its detail fetch got
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_frontier (
+                cnpq_id TEXT PRIMARY KEY,
+                name TEXT,
+                institution TEXT,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Crawl checkpoint: the search terms each frontier researcher was found by
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_frontier_terms (
+                cnpq_id TEXT,
+                term_id INTEGER,
+                PRIMARY KEY (cnpq_id, term_id),
+                FOREIGN KEY (cnpq_id) REFERENCES crawl_frontier (cnpq_id),
+                FOREIGN KEY (term_id) REFERENCES search_terms (id)
+            )
+        ''')
+        
+        cursor.execute('PRAGMA table_info(crawl_frontier)')
+        if 'search_term' in {row[1] for row in cursor.fetchall()}:
+            self.migrate_frontier_terms(cursor)
+        
+        # Indexes only reads use; a bulk load builds them once at the end instead
+        if self.bulk_load:
+            for name in DEFERRED_INDEXES:
+                cursor.execute(f'DROP INDEX IF EXISTS {name}')
+        else:
+            self.create_deferred_indexes(cursor)
+        
+        try:
+            self.create_search_index(cursor, sync=not self.bulk_load)
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: the viewers fall back to LIKE searches
+            logger.warning(f"Full-text search index not available: {e}")
+    
+    def migrate_search_terms(self, cursor):
+        """Move the comma-joined researchers.search_term column of older databases into researcher_terms"""
+        cursor.execute("SELECT id, search_term FROM researchers WHERE search_term IS NOT NULL AND search_term != ''")
+        rows = cursor.fetchall()
+        for researcher_id, search_term in rows:
+            self.link_search_terms(cursor, researcher_id, search_term)
+        cursor.execute('ALTER TABLE researchers DROP COLUMN search_term')
+        logger.info(f"Migrated search terms of {len(rows)} researchers to researcher_terms")
+    
+    def migrate_frontier_terms(self, cursor):
+        """Move the comma-joined crawl_frontier.search_term column of older databases into crawl_frontier_terms"""
+        cursor.execute("SELECT cnpq_id, search_term FROM crawl_frontier WHERE search_term IS NOT NULL AND search_term != ''")
+        rows = [(cnpq_id, term) for cnpq_id, search_term in cursor.fetchall() for term in split_search_terms(search_term)]
+        cursor.executemany('INSERT OR IGNORE INTO search_terms (term) VALUES (?)', {(term,) for _, term in rows})
+        cursor.executemany('''
+            INSERT OR IGNORE INTO crawl_frontier_terms (cnpq_id, term_id)
+            SELECT ?, id FROM search_terms WHERE term = ?
+        ''', rows)
+        cursor.execute('ALTER TABLE crawl_frontier DROP COLUMN search_term')
+        logger.info(f"Migrated {len(rows)} crawl frontier search terms to crawl_frontier_terms")
+    
+    def migrate_project_hashes(self, cursor):
+        """Add projects.content_hash to older databases and fill it in for the stored projects"""
+        cursor.execute('ALTER TABLE projects ADD COLUMN content_hash TEXT')
+        cursor.execute(f"SELECT id, {', '.join(PROJECT_FIELDS)} FROM projects")
+        rows = [(project_content_hash(dict(zip(PROJECT_FIELDS, fields))), project_id)
+                for project_id, *fields in cursor.fetchall()]
+        cursor.executemany('UPDATE projects SET content_hash = ? WHERE id = ?', rows)
+        logger.info(f"Computed content hashes of {len(rows)} stored projects")
+    
+    def create_deferred_indexes(self, cursor):
+        """Create the DEFERRED_INDEXES (runs on the DB writer)"""
+        for name, columns in DEFERRED_INDEXES.items():
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {columns}')
+    
+    def create_search_index(self, cursor, sync=True):
+        """Create the SEARCH_INDEXES FTS5 tables and the triggers that keep them in sync (runs on the DB writer)
+        
+        The FTS tables index their content tables in place (content=...), with
+        accents and case folded. They are rebuilt whenever the triggers are missing:
+        on databases that predate them, and after a bulk load, which drops the
+        triggers (sync=False) so rows are indexed once at the end.
+        """
+        for fts_table, (table, columns) in SEARCH_INDEXES.items():
+            column_list = ', '.join(columns)
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                    {column_list}, content='{table}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            ''')
+            
+            if not sync:
+                for event in ('insert', 'delete', 'update'):
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {fts_table}_{event}')
+                continue
+            
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (f'{fts_table}_insert',))
+            if cursor.fetchone():
+                continue
+            
+            new_values = ', '.join(f'new.{column}' for column in columns)
+            old_values = ', '.join(f'old.{column}' for column in columns)
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                END
+            ''')
+            # The researcher upsert sets every column, so only reindex when one really changed
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {column_list} ON {table}
+                WHEN {' OR '.join(f'old.{column} IS NOT new.{column}' for column in columns)} BEGIN
+                    INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+                END
+            ''')
+            cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+    
+    def finish_bulk_load(self):
+        """Build the indexes a bulk load deferred, full-text included (close() calls it before the writer stops)"""
+        if not self.bulk_load:
+            return
+        started = time.time()
+        self.db_writer.execute(self.create_deferred_indexes)
+        try:
+            self.db_writer.execute(self.create_search_index)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text search index not available: {e}")
+        self.bulk_load = False
+        self.progress.print_status(
+            f"🗂️ Bulk load finished: built {len(DEFERRED_INDEXES)} deferred indexes and the search index "
+            f"in {time.time() - started:.1f}s", "🗂️"
+        )
+    
+    def get_event_loop(self):
+        """Return the scraper's own event loop (the shared aiohttp session is bound to it)"""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+    
+    async def get_aio_session(self):
+        """Return the long-lived aiohttp session, creating it and its connector on first use"""
+        if self._aio_session is None or self._aio_session.closed:
+            # Create SSL context similar to sync version
+            ssl_context = ssl.create_default_context()
+            ssl_context.set_ciphers('DEFAULT@SECLEVEL=1')
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+            
+            # One pooled connector for the whole run so keep-alive connections
+            # (and their TLS sessions) are reused across pages
+            connector = aiohttp.TCPConnector(
+                ssl=ssl_context,
+                limit=self.pool_size,
+                limit_per_host=self.pool_size_per_host,
+                keepalive_timeout=30,
+                ttl_dns_cache=300
+            )
+            
+            self._aio_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers=dict(self.session.headers),
+                cookies=self.session.cookies,
+                connector=connector
+            )
+        return self._aio_session
+    
+    def get_host_semaphore(self, url):
+        """Return the semaphore limiting concurrent async requests to the URL's host"""
+        host = urlparse(url).hostname or ''
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            limit = self.host_concurrency.get(host, self.pool_size_per_host)
+            semaphore = asyncio.Semaphore(limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+    
+    async def fetch_text_async(self, url, params=None, data=None, method='GET', headers=None, timeout=15):
+        """Fetch a URL on the shared session (respecting the per-host limit) and return its text"""
+        if self.cache and method == 'GET':
+            cached = await asyncio.get_running_loop().run_in_executor(None, self.cache.get, url, params)
+            if cached is not None:
+                return cached
+        
+        html_content = await self._fetch_text_network_async(url, params, data, method, headers, timeout)
+        
+        if self.cache and method == 'GET' and not self.is_captcha_page(html_content):
+            await asyncio.get_running_loop().run_in_executor(None, self.cache.put, url, params, html_content)
+        return html_content
+    
+    async def _fetch_text_network_async(self, url, params, data, method, headers, timeout):
+        session = await self.get_aio_session()
+        status = None
+        
+        # Sit out any backoff window opened by 429s/captchas, then wait for the rate limit
+        # before taking a concurrency slot, so waiting doesn't hold one
+        await self.concurrency.cooldown_async()
+        await self.rate_limiter.acquire_async(url)
+        await self.concurrency.acquire_async()
+        try:
+            async with self.get_host_semaphore(url):
+                started = time.monotonic()
+                async with session.request(method, url, params=params, data=data, headers=headers,
+                                           timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    status = response.status
+                    html_content = await response.text() if status < 400 else None
+                    latency = time.monotonic() - started
+                    self.metrics.record_request(latency)
+                    captcha = html_content is not None and self.is_captcha_page(html_content)
+                    self.concurrency.record(latency, status, captcha=captcha and self.signals_congestion(url))
+                    response.raise_for_status()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if status is None:
+                self.concurrency.record(error=True)
+            raise
+        finally:
+            self.concurrency.release()
+        
+        if self.archive and not captcha:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.archive.put, url, params, data, html_content
+            )
+        return html_content
+    
+    def signals_congestion(self, url):
+        """Whether a captcha from this URL should slow the crawl down (not for CAPTCHA_GATED_ENDPOINTS)"""
+        return self.rate_limiter.endpoint_for(url) not in self.CAPTCHA_GATED_ENDPOINTS
+    
+    def http_request(self, method, url, **kwargs):
+        """Send a request on self.session holding an adaptive concurrency slot, and report the outcome
+        
+        GET responses are served from / stored in the disk cache when it is enabled.
+        """
+        params = kwargs.get('params')
+        if self.cache and method == 'GET':
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                response = requests.Response()
+                response.status_code = 200
+                response._content = cached.encode('utf-8')
+                response.encoding = 'utf-8'
+                response.url = url
+                return response
+        
+        response = self._http_request_network(method, url, **kwargs)
+        
+        if self.cache and method == 'GET' and response.ok and not self.is_captcha_page(response.text):
+            self.cache.put(url, params, response.text)
+        return response
+    
+    def _http_request_network(self, method, url, **kwargs):
+        self.rate_limiter.acquire(url)
+        self.concurrency.acquire()
+        try:
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException:
+                self.concurrency.record(error=True)
+                raise
+            latency = time.monotonic() - started
+            self.metrics.record_request(latency)
+            captcha = self.is_captcha_page(response.text)
+            self.concurrency.record(latency, response.status_code, captcha=captcha and self.signals_congestion(url))
+            if self.archive and response.ok and not captcha:
+                self.archive.put(url, kwargs.get('params'), kwargs.get('data'), response.text)
+            return response
+        finally:
+            self.concurrency.release()
+    
+    async def close_async(self):
+        """Close the shared aiohttp session and its pooled connections"""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+            # Let the connector finish closing the underlying SSL transports
+            await asyncio.sleep(0.25)
+        self._aio_session = None
+        self._host_semaphores = {}
+    
+    def get_parse_pool(self):
+        """Create the parse process pool on first use (None when parse_workers is 0)"""
+        if self._parse_pool is None and self.parse_workers > 0:
+            # spawn: forking a process that already runs I/O threads is unsafe
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._parse_pool
+    
+    async def parse_async(self, page_type, body, **context):
+        """Parse a fetched page in the process pool, keeping the event loop free for I/O
+        
+        page_type is a PAGE_PARSERS key; context carries search_term, cnpq_id or
+        known_update_date. Records come back as plain dicts and lists.
+        """
+        loop = asyncio.get_running_loop()
+        if self.memo:
+            memo_key = ParseMemo.key(page_type, body, context)
+            records = await loop.run_in_executor(None, self.memo.get, memo_key)
+            if records is not None:
+                return records
+        
+        pool = self.get_parse_pool()
+        if pool is None:
+            records = PAGE_PARSERS[page_type](self, body, context)
+        else:
+            records, cpu_seconds = await loop.run_in_executor(pool, parse_page, page_type, body, context)
+            self.metrics.record_parse(page_type, cpu_seconds)
+        
+        if self.memo:
+            await loop.run_in_executor(None, self.memo.put, memo_key, page_type, records)
+        return records
+    
+    def test_connection(self):
+        """Test connection to CNPq website"""
+        try:
+            logger.info("Testing connection to CNPq...")
+            site = urlparse(self.base_url)
+            response = self.http_request('GET', f"{site.scheme}://{site.netloc}/", timeout=10)
+            response.raise_for_status()
+            logger.info("Connection test successful!")
+            
+            logger.info("Connection test successful!")
+            
+            return True
+        except Exception as e:
+            logger.error(f"Connection test failed: {e}")
+            return False
+    
+    def build_search_query(self, search_term):
+        """Build the busca.do query expression for a search term"""
+        terms = search_term.split()
+        if len(terms) >= 2:
+            # For multiple terms, search for both
+            return f"(+idx_assunto:({terms[0]})+idx_assunto:({terms[1]})+idx_particao:1)"
+        # For single term
+        return f"(+idx_assunto:({terms[0]})+idx_particao:1)"
+    
+    async def search_researchers_async(self, search_term="metodos formais", max_pages=None, max_concurrent=5):
+        """Async version of search_researchers with parallel page fetching"""
+        all_researchers = []
+        
+        async def collect(researchers, page, total_pages):
+            all_researchers.extend(researchers)
+        
+        total_records = await self.search_term_pages_async(search_term, collect, max_pages, max_concurrent)
+        
+        if total_records:
+            percentage = (len(all_researchers) / total_records) * 100
+            self.progress.print_status(f"✅ Collected {len(all_researchers)} researchers out of {total_records} total available ({percentage:.1f}%) for '{search_term}'", "✅")
+        
+        return all_researchers
+    
+    async def search_term_pages_async(self, search_term, on_page, max_pages=None, max_concurrent=5,
+                                      skip_pages=None, known_total_pages=None):
+        """Fetch all results pages of a term, awaiting on_page(researchers, page, total_pages) as each arrives
+        
+        Pages are pulled by max_concurrent workers, so a slow on_page (e.g. a full
+        bounded queue) slows fetching down instead of piling up results in memory.
+        Pages in skip_pages are not fetched; when page 0 is among them,
+        known_total_pages replaces the pagination info it would have provided.
+        Returns the total number of records reported by the first page.
+        """
+        self.progress.print_status(f"🚀 Async searching for: '{search_term}' (max {max_concurrent} concurrent)", "🚀")
+        query = self.build_search_query(search_term)
+        skip_pages = skip_pages or set()
+        researchers = []
+        
+        if 0 in skip_pages and known_total_pages:
+            total_records = 0
+            total_pages = min(known_total_pages, max_pages) if max_pages else known_total_pages
+            self.progress.print_status(f"⏩ Resuming '{search_term}': {len(skip_pages)}/{total_pages} pages already fetched", "⏩")
+        else:
+            # First, get the total number of pages from page 1
+            first_page_data = await self.fetch_page_async(0, query, search_term)
+            if not first_page_data:
+                return 0
+            
+            researchers, pagination_info = first_page_data
+            total_records = pagination_info.get('total_records', 0) if pagination_info else 0
+            page_size = pagination_info.get('page_size', 10) if pagination_info else 10
+            total_pages = (total_records + page_size - 1) // page_size if total_records > 0 else 1
+            
+            self.progress.print_status(f"📊 Found {total_records} total records ({total_pages} pages) for '{search_term}'", "📊")
+            
+            # Apply max_pages limit if specified
+            if max_pages and total_pages > max_pages:
+                total_pages = max_pages
+                estimated_records = max_pages * page_size
+                self.progress.print_status(f"⚠️ Limiting to {max_pages} pages ({estimated_records} records) as requested", "⚠️")
+            else:
+                self.progress.print_status(f"🎯 Will fetch ALL {total_pages} pages ({total_records} records) in parallel", "🎯")
+            
+            await on_page(researchers, 0, total_pages)
+        
+        pending_pages = [page for page in range(1, total_pages) if page not in skip_pages]  # Page 0 handled above
+        
+        if pending_pages:
+            remaining_pages = iter(pending_pages)
+            total_remaining = len(pending_pages)
+            completed = 0
+            collected = len(researchers)
+            
+            async def page_worker():
+                nonlocal completed, collected
+                for page in remaining_pages:
+                    result = await self.fetch_page_async(page, query, search_term)
+                    if result:
+                        page_researchers, _ = result
+                        collected += len(page_researchers)
+                        await on_page(page_researchers, page, total_pages)
+                    
+                    completed += 1
+                    # Show progress every 10 completions or at key intervals
+                    if completed % 10 == 0 or completed == total_remaining or completed <= 5:
+                        percentage = (completed / total_remaining) * 100
+                        self.progress.print_status(f"📄 Progress: {completed}/{total_remaining} pages ({percentage:.1f}%) - Total researchers: {collected}", "📄")
+            
+            self.progress.print_status(f"🧵 Fetching {total_remaining} pages in parallel (max {max_concurrent} concurrent)", "🧵")
+            await asyncio.gather(*(page_worker() for _ in range(min(max_concurrent, total_remaining))))
+        
+        return total_records
+    
+    async def fetch_page_async(self, page, query, search_term):
+        """Fetch a single page asynchronously"""
+        start_record = page * 10
+        url = f"{self.base_url}/busca.do"
+        
+        params = {
+            'metodo': 'forwardPaginaResultados',
+            'registros': f'{start_record};10',
+            'query': query,
+            'analise': 'cv',
+            'tipoOrdenacao': 'null',
+            'paginaOrigem': 'index.do',
+            'mostrarScore': 'true',
+            'mostrarBandeira': 'true',
+            'modoIndAdhoc': 'null'
+        }
+        
+        try:
+            html_content = await self.fetch_text_async(url, params=params, timeout=30)
+            return await self.parse_async('search_results', html_content, search_term=search_term)
+        
+        except Exception as e:
+            logger.error(f"Error fetching page {page + 1}: {e}")
+            return None
+    
+    def search_researchers(self, search_term="metodos formais", max_pages=None):
+        """Enhanced search with async support - wrapper for backward compatibility"""
+        # Try async version first for better performance
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop running: use async version on the scraper's own loop, so
+            # every term reuses the same pooled session
+            return self.get_event_loop().run_until_complete(
+                self.search_researchers_async(search_term, max_pages, max_concurrent=self.concurrency.max_limit)
+            )
+        
+        # If we're already in an async context, use the sync version
+        return self.search_researchers_sync(search_term, max_pages)
+    
+    def search_researchers_sync(self, search_term="metodos formais", max_pages=None):
+        """Search for researchers based on the search term"""
+        self.progress.print_status(f"🔍 Searching for: '{search_term}'", "🔍")
+        
+        # Test connection first
+        if not self.test_connection():
+            logger.error("Cannot connect to CNPq website. Please check your internet connection.")
+            return []
+        
+        # Build the search query URL - use simpler format that works
+        query = self.build_search_query(search_term)
+        
+        all_researchers = []
+        total_records = None
+        total_pages = None
+        spinner_count = 0
+        page = 0
+        
+        while True:
+            start_record = page * 10
+            url = f"{self.base_url}/busca.do"
+            
+            params = {
+                'metodo': 'forwardPaginaResultados',
+                'registros': f'{start_record};10',
+                'query': query,
+                'analise': 'cv',
+                'tipoOrdenacao': 'null',
+                'paginaOrigem': 'index.do',
+                'mostrarScore': 'true',
+                'mostrarBandeira': 'true',
+                'modoIndAdhoc': 'null'
+            }
+            
+            try:
+                # Show progress while fetching
+                progress_msg = f"Fetching page {page + 1}"
+                if total_pages:
+                    progress_msg += f"/{total_pages}"
+                progress_msg += f" for '{search_term}'"
+                self.progress.show_spinner(progress_msg, spinner_count)
+                spinner_count += 1
+                
+                response = self.http_request('GET', url, params=params)
+                response.raise_for_status()
+                
+                # Extract pagination info from the first page
+                if page == 0:
+                    pagination_info = self.extract_pagination_info(response.text)
+                    if pagination_info:
+                        total_records = pagination_info['total_records']
+                        page_size = pagination_info['page_size']
+                        total_pages = (total_records + page_size - 1) // page_size  # Round up
+                        
+                        self.progress.print_status(f"📊 Found {total_records} total records ({total_pages} pages) for '{search_term}'", "📊")
+                        
+                        # Apply max_pages limit only if specified by user
+                        if max_pages and total_pages > max_pages:
+                            total_pages = max_pages
+                            estimated_records = max_pages * page_size
+                            self.progress.print_status(f"⚠️ Limiting to {max_pages} pages ({estimated_records} records) as requested", "⚠️")
+                        else:
+                            self.progress.print_status(f"🎯 Will fetch ALL {total_pages} pages ({total_records} records)", "🎯")
+                
+                researchers = self.parse_search_results(response.text, search_term)
+                
+                # Check if we have pagination info to make better decisions
+                pagination_info = self.extract_pagination_info(response.text)
+                
+                if not researchers:
+                    # If we have pagination info, check if there should be more pages
+                    if pagination_info and pagination_info['has_more']:
+                        self.progress.print_status(f"⚠️ Expected more results but found none on page {page + 1}. Continuing...", "⚠️")
+                        self.concurrency.wait_for_cooldown()
+                        page += 1
+                        continue
+                    else:
+                        self.progress.print_status(f"✅ Reached end of results on page {page + 1}", "✅")
+                        break
+                
+                all_researchers.extend(researchers)
+                self.progress.print_status(f"📋 Found {len(researchers)} researchers on page {page + 1} (Total: {len(all_researchers)})", "📋")
+                
+                # Check if we should continue based on pagination info
+                if pagination_info and not pagination_info['has_more']:
+                    self.progress.print_status(f"🏁 Reached last page ({page + 1}) based on pagination info", "🏁")
+                    break
+                
+                # Check if we've reached the user-specified max_pages limit
+                if max_pages and page + 1 >= max_pages:
+                    self.progress.print_status(f"🛑 Reached user-specified limit of {max_pages} pages", "🛑")
+                    break
+                
+                # Check if we've reached the total pages available
+                if total_pages and page + 1 >= total_pages:
+                    self.progress.print_status(f"🏁 Reached all available pages ({total_pages})", "🏁")
+                    break
+                
+                # Be respectful to the server: back off only while CNPq signals overload
+                self.concurrency.wait_for_cooldown()
+                page += 1
+                
+            except requests.RequestException as e:
+                self.progress.print_status(f"❌ Error fetching page {page + 1}: {e}", "❌")
+                break
+        
+        if total_records:
+            percentage = (len(all_researchers) / total_records) * 100
+            self.progress.print_status(f"✅ Collected {len(all_researchers)} researchers out of {total_records} total available ({percentage:.1f}%) for '{search_term}'", "✅")
+        
+        return all_researchers
+    
+    def get_researcher_details(self, cnpq_id):
+        """Get detailed information from the researcher's CV page using multiple approaches"""
+        try:
+            # First approach: Try the preview page which already has all the info we need
+            # This bypasses the reCaptcha issue completely
+            logger.info(f"Trying preview-based extraction for {cnpq_id}")
+            preview_details = self.get_researcher_details_from_preview(cnpq_id)
+            
+            if preview_details and preview_details.get('name'):
+                logger.info(f"Successfully extracted details from preview for {cnpq_id}")
+                return preview_details
+            
+            # If preview extraction fails, fall back to the complex reCaptcha approach
+            logger.info(f"Preview extraction failed, trying reCaptcha approach for {cnpq_id}")
+            return self.get_researcher_details_with_captcha(cnpq_id)
+            
+        except Exception as e:
+            logger.error(f"Error in get_researcher_details for {cnpq_id}: {e}")
+            return {}
+    
+    def get_researcher_details_with_captcha(self, cnpq_id):
+        """Original method that deals with reCaptcha - kept as fallback"""
+        try:
+            # First, try to access the CV directly using the simple GET method (sometimes works)
+            logger.info(f"Attempting direct CV access for {cnpq_id}")
+            direct_cv_url = f"{self.base_url}/visualizacv.do"
+            direct_params = {
+                'metodo': 'apresentar',
+                'id': cnpq_id
+            }
+            
+            try:
+                direct_response = self.http_request('GET', direct_cv_url, params=direct_params, timeout=15)
+                direct_response.raise_for_status()
+                
+                # Check if this is a valid CV page (not a captcha page)
+                if self.is_valid_cv_page(direct_response.text):
+                    logger.info(f"Direct access successful for {cnpq_id}")
+                    return self.parse_cv_details(direct_response.text)
+                else:
+                    logger.info(f"Direct access returned captcha page for {cnpq_id}")
+            except Exception as e:
+                logger.warning(f"Direct access failed for {cnpq_id}: {e}")
+            
+            # If direct access fails, try the preview + token approach
+            logger.info(f"Trying preview + token approach for {cnpq_id}")
+            preview_url = f"{self.base_url}/preview.do"
+            preview_params = {
+                'metodo': 'apresentar',
+                'id': cnpq_id
+            }
+            
+            preview_response = self.http_request('GET', preview_url, params=preview_params, timeout=15)
+            preview_response.raise_for_status()
+            
+            # Check if preview page is also showing captcha
+            if not self.is_valid_cv_page(preview_response.text):
+                logger.warning(f"Preview page also shows captcha for {cnpq_id}")
+                # Save the HTML for debugging
+                self.save_debug_html(preview_response.text, f"debug_preview_{cnpq_id}.html")
+            
+            # Try multiple token extraction patterns
+            token = self.extract_token_from_html(preview_response.text)
+            
+            if not token:
+                logger.warning(f"No token found for {cnpq_id}, attempting without token")
+                token = ""
+            
+            # Now make the POST request to get the full CV using multipart form-data
+            cv_url = f"{self.base_url}/visualizacv.do"
+            
+            form_data = self.build_cv_form_data(cnpq_id, token)
+            
+            # Set the correct content-type for multipart form-data
+            cv_response = self.http_request('POST', cv_url, data=form_data, timeout=30)
+            cv_response.raise_for_status()
+            
+            # Check if the response is valid
+            if self.is_valid_cv_page(cv_response.text):
+                logger.info(f"Successfully fetched CV for {cnpq_id} using POST method")
+                return self.parse_cv_details(cv_response.text)
+            else:
+                logger.warning(f"POST method returned captcha page for {cnpq_id}")
+                # Save the HTML for debugging
+                self.save_debug_html(cv_response.text, f"debug_post_{cnpq_id}.html")
+                
+                # Try alternative approach: use the Lattes direct URL
+                return self.try_alternative_access(cnpq_id)
+            
+        except requests.RequestException as e:
+            logger.error(f"Error fetching details for {cnpq_id}: {e}")
+            return self.try_alternative_access(cnpq_id)
+        
+        return {}
+    
+    def build_cv_form_data(self, cnpq_id, token):
+        """Build the visualizacv.do POST form used to request a full CV with a captcha token"""
+        # Prepare the multipart form data based on the curl example
+        return {
+            'metodo': 'apresentar',
+            'id': cnpq_id,
+            'idiomaExibicao': '',
+            'tipo': '',
+            'tokenCaptchar': token,
+            'nomeCaptchar': 'V2',
+            'mostrarNroCitacoesScielo': '',
+            'mostrarNroCitacoesScopus': '',
+            'mostrarNroCitacoesISI': '',
+            # Add all the filter fields with default values
+            'filtros.paisAtividade': '0',
+            'filtros.regiaoAtividade': '0',
+            'filtros.ufAtividade': '0',
+            'filtros.siglaInstAtividade': '',
+            'filtros.nomeInstAtividade': '',
+            'filtros.naturezaAtividade': '0',
+            'filtros.atividadeAtual': 'false',
+            'filtros.paisFormacao': '0',
+            'filtros.regiaoFormacao': '0',
+            'filtros.ufFormacao': '0',
+            'filtros.siglaInstFormacao': '',
+            'filtros.nomeInstFormacao': '',
+            'filtros.nivelFormacao': '0',
+            'filtros.grdAreaFormacao': '0',
+            'filtros.areaFormacao': '0',
+            'filtros.idioma': '0',
+            'filtros.proeficienciaLeitura': '',
+            'filtros.proeficienciaEscrita': '',
+            'filtros.proeficienciaFala': '',
+            'filtros.proeficienciaCompreensao': '',
+            'filtros.grandeAreaAtuacao': '0',
+            'filtros.areaAtuacao': '0',
+            'filtros.subareaAtuacao': '0',
+            'filtros.especialidadeAtuacao': '0',
+            'filtros.codigoGrandeAreaAtuacao': '0',
+            'filtros.codigoAreaAtuacao': '0',
+            'filtros.codigoSubareaAtuacao': '0',
+            'filtros.codigoEspecialidadeAtuacao': '0',
+            'filtros.grandeAreaProducao': '0',
+            'filtros.areaProducao': '0',
+            'filtros.setorProducao': '0',
+            'filtros.subSetorProducao': '0',
+            'filtros.tipoRelacao': 'AND',
+            'filtros.categoriaNivelBolsa': '',
+            'filtros.orientadorCNPq': '',
+            'filtros.conceitoCurso': '',
+            'filtros.participaDGP': 'false',
+            'filtros.modalidadeBolsa': '0',
+            'filtros.buscaNome': 'false',
+            'filtros.buscaAssunto': 'false',
+            'filtros.buscaCPF': 'false',
+            'filtros.buscaAtuacao': 'false',
+            'filtros.tipoOrdenacao': 'SCR',
+            'filtros.atualizacaoCurriculo': '48',
+            'filtros.quantidadeRegistros': '25',
+            'filtros.registroInicial': '1',
+            'filtros.registroFinal': '25',
+            'textoBuscaTodas': '',
+            'textoBuscaFrase': '',
+            'textoBuscaQualquer': '',
+            'textoBuscaNenhuma': '',
+            'textoExpressao': '',
+            'particaoProcura': '',
+            'buscarDoutores': 'false',
+            'buscarDemais': 'false',
+            'buscarDoutoresAvancada': 'false',
+            'buscarDemaisAvancada': 'false',
+            'textoBuscaAssunto': '',
+            'tipoConector': 'AND',
+            'resumoFormacao': '',
+            'resumoAtividade': '',
+            'resumoAtuacao': '',
+            'resumoProducao': '',
+            'resumoPesquisador': '',
+            'resumoIdioma': '',
+            'resumoPresencaDGP': '',
+            'resumoModalidade': '',
+            'intCPaginaAtual': '1',
+            'parametrosBusca': '',
+            'strCNavegador': '',
+            'strCSistemaOperacional': '',
+            'strCIP': '',
+            'buscaAvancada': '0',
+            'moduloIndicacaoAdhoc': 'false',
+            'query': '',
+            'modoIndAdhoc': '',
+            'tipoFuncaoIndicacaoAdHoc': '',
+            'buscarBrasileirosAvancada': 'false',
+            'buscarEstrangeirosAvancada': 'false',
+            'buscarBrasileiros': 'false',
+            'buscarEstrangeiros': 'false',
+            'g-recaptcha-response': token  # Use the same token for reCaptcha
+        }
+    
+    def save_debug_html(self, html_content, filename):
+        """Save HTML content for debugging purposes"""
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+            logger.info(f"Debug HTML saved to {filename}")
+        except Exception as e:
+            logger.warning(f"Failed to save debug HTML: {e}")
+    
+    def try_alternative_access(self, cnpq_id):
+        """Try alternative methods to access the CV"""
+        logger.info(f"Trying alternative access methods for {cnpq_id}")
+        
+        # Method 1: Try direct Lattes URL
+        try:
+            lattes_url = f"{self.lattes_url}/{cnpq_id}"
+            logger.info(f"Trying direct Lattes URL: {lattes_url}")
+            
+            response = self.http_request('GET', lattes_url, timeout=15)
+            response.raise_for_status()
+            
+            if self.is_valid_cv_page(response.text):
+                logger.info(f"Direct Lattes access successful for {cnpq_id}")
+                return self.parse_cv_details(response.text)
+            else:
+                logger.warning(f"Direct Lattes also shows captcha for {cnpq_id}")
+                self.save_debug_html(response.text, f"debug_lattes_{cnpq_id}.html")
+                
+        except Exception as e:
+            logger.error(f"Direct Lattes access failed for {cnpq_id}: {e}")
+        
+        # Method 2: Try different user agent
+        try:
+            logger.info(f"Trying with different user agent for {cnpq_id}")
+            old_user_agent = self.session.headers.get('User-Agent')
+            
+            # Use a simpler user agent
+            self.session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            })
+            
+            cv_url = f"{self.base_url}/visualizacv.do"
+            params = {
+                'metodo': 'apresentar',
+                'id': cnpq_id
+            }
+            
+            response = self.http_request('GET', cv_url, params=params, timeout=15)
+            response.raise_for_status()
+            
+            # Restore original user agent
+            if old_user_agent:
+                self.session.headers.update({'User-Agent': old_user_agent})
+            
+            if self.is_valid_cv_page(response.text):
+                logger.info(f"Alternative user agent successful for {cnpq_id}")
+                return self.parse_cv_details(response.text)
+                
+        except Exception as e:
+            logger.error(f"Alternative user agent failed for {cnpq_id}: {e}")
+            # Restore original user agent
+            if old_user_agent:
+                self.session.headers.update({'User-Agent': old_user_agent})
+        
+        logger.error(f"All access methods failed for {cnpq_id}")
+        return {}
+    
+    def process_researcher_with_details(self, researcher):
+        """Process a single researcher with details (for threading)"""
+        try:
+            # Get detailed information
+            details = self.get_researcher_details(researcher['cnpq_id'])
+            researcher.update(details)
+            
+            # Save to database (including projects)
+            self.save_researcher(researcher)
+            
+            project_count = len(details.get('projects', []))
+            fm_projects = sum(1 for p in details.get('projects', []) if p.get('is_formal_methods_related'))
+            
+            return {
+                'researcher': researcher,
+                'project_count': project_count,
+                'fm_projects': fm_projects,
+                'success': True
+            }
+        except Exception as e:
+            logger.error(f"Error processing researcher {researcher.get('name', 'Unknown')}: {e}")
+            return {
+                'researcher': researcher,
+                'project_count': 0,
+                'fm_projects': 0,
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def process_researcher_with_details_async(self, researcher, known_update_date=None):
+        """Async version of process_researcher_with_details; saving is left to the batch writer"""
+        try:
+            details = await self.get_researcher_details_async(researcher['cnpq_id'], known_update_date)
+            unchanged = details.pop('unchanged', False)
+            researcher.update(details)
+            
+            project_count = len(details.get('projects', []))
+            fm_projects = sum(1 for p in details.get('projects', []) if p.get('is_formal_methods_related'))
+            
+            return {
+                'researcher': researcher,
+                'project_count': project_count,
+                'fm_projects': fm_projects,
+                'success': True,
+                'unchanged': unchanged
+            }
+        except Exception as e:
+            logger.error(f"Error processing researcher {researcher.get('name', 'Unknown')}: {e}")
+            return {
+                'researcher': researcher,
+                'project_count': 0,
+                'fm_projects': 0,
+                'success': False,
+                'unchanged': False,
+                'error': str(e)
+            }
+    
+    def save_researcher(self, researcher_data):
+        """Queue a researcher and its projects for the DB writer; returns the write's Future"""
+        return self.db_writer.submit(lambda cursor: self.write_researcher(cursor, researcher_data), records=1)
+    
+    def upsert_researcher(self, cursor, researcher_data):
+        """Insert a researcher or merge it into the stored row in one statement; returns its id
+        
+        A known researcher gets every non-null field overwritten without a separate
+        lookup; the search terms are added to researcher_terms.
+        """
+        cnpq_id = researcher_data.get('cnpq_id')
+        cursor.execute('''
+            INSERT INTO researchers 
+            (cnpq_id, name, institution, area, city, state, country, lattes_url, last_update_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(cnpq_id) DO UPDATE SET
+                name = COALESCE(excluded.name, researchers.name),
+                institution = COALESCE(excluded.institution, researchers.institution),
+                area = COALESCE(excluded.area, researchers.area),
+                city = COALESCE(excluded.city, researchers.city),
+                state = COALESCE(excluded.state, researchers.state),
+                country = COALESCE(excluded.country, researchers.country),
+                last_update_date = COALESCE(excluded.last_update_date, researchers.last_update_date),
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING id
+        ''', (
+            cnpq_id,
+            researcher_data.get('name'),
+            researcher_data.get('institution'),
+            researcher_data.get('area'),
+            researcher_data.get('city'),
+            researcher_data.get('state'),
+            researcher_data.get('country'),
+            f"{self.lattes_url}/{cnpq_id}" if cnpq_id else None,
+            researcher_data.get('last_update_date')
+        ))
+        researcher_id = cursor.fetchone()[0]
+        self.link_search_terms(cursor, researcher_id, researcher_data.get('search_term'))
+        return researcher_id
+    
+    def link_search_terms(self, cursor, researcher_id, search_term):
+        """Record every term of a comma-joined search_term as having found the researcher"""
+        terms = split_search_terms(search_term)
+        if not terms:
+            return
+        cursor.executemany('INSERT OR IGNORE INTO search_terms (term) VALUES (?)', [(term,) for term in terms])
+        cursor.executemany('''
+            INSERT OR IGNORE INTO researcher_terms (researcher_id, term_id)
+            SELECT ?, id FROM search_terms WHERE term = ?
+        ''', [(researcher_id, term) for term in terms])
+    
+    def write_researcher(self, cursor, researcher_data):
+        """Save researcher data and projects to the database (runs on the DB writer)"""
+        researcher_id = self.upsert_researcher(cursor, researcher_data)
+        logger.info(f"Saved researcher: {researcher_data.get('name')} ({researcher_data.get('cnpq_id')})")
+        
+        # Save projects if they exist
+        projects = researcher_data.get('projects', [])
+        if projects and researcher_id:
+            if self.sync_projects(cursor, researcher_id, researcher_data.get('cnpq_id'), projects):
+                self.link_canonical_projects(cursor, researcher_data.get('cnpq_id'))
+            
+            formal_methods_projects = sum(1 for p in projects if p.get('is_formal_methods_related'))
+            logger.info(f"Saved {len(projects)} projects for {researcher_data.get('name')} ({formal_methods_projects} formal methods related)")
+    
+    def sync_projects(self, cursor, researcher_id, cnpq_id, projects):
+        """Bring a researcher's stored projects in line with projects, writing only the rows that changed
+        
+        Projects whose content_hash is already stored are left alone. A changed
+        project is updated in place when a stored one has the same title key, so
+        it keeps its id and created_at; the rest are inserted or deleted.
+        Returns True if any row was written.
+        """
+        cursor.execute('SELECT id, content_hash, title FROM projects WHERE cnpq_id = ?', (cnpq_id,))
+        stored = defaultdict(list)
+        for project_id, content_hash, title in cursor.fetchall():
+            stored[content_hash].append((project_id, project_title_key(title)))
+        
+        changed = []
+        for project in projects:
+            content_hash = project_content_hash(project)
+            if stored.get(content_hash):
+                stored[content_hash].pop()
+                self.project_changes['unchanged'] += 1
+            else:
+                changed.append((content_hash, project))
+        
+        leftover = {}
+        for rows in stored.values():
+            for project_id, title_key in rows:
+                leftover.setdefault(title_key, []).append(project_id)
+        
+        inserts, updates = [], []
+        for content_hash, project in changed:
+            values = [project.get(field) for field in PROJECT_FIELDS]
+            values[-1] = project.get('is_formal_methods_related', False)
+            same_title = leftover.get(project_title_key(project.get('title')))
+            if same_title:
+                updates.append((researcher_id, *values, content_hash, same_title.pop()))
+            else:
+                inserts.append((researcher_id, cnpq_id, *values, content_hash))
+        deletes = [(project_id,) for project_ids in leftover.values() for project_id in project_ids]
+        
+        if updates:
+            cursor.executemany(f'''
+                UPDATE projects SET researcher_id = ?, {', '.join(f'{field} = ?' for field in PROJECT_FIELDS)},
+                content_hash = ? WHERE id = ?
+            ''', updates)
+        if inserts:
+            cursor.executemany(f'''
+                INSERT INTO projects (researcher_id, cnpq_id, {', '.join(PROJECT_FIELDS)}, content_hash)
+                VALUES ({', '.join('?' * (len(PROJECT_FIELDS) + 3))})
+            ''', inserts)
+        if deletes:
+            cursor.executemany('DELETE FROM projects WHERE id = ?', deletes)
+        
+        self.project_changes['inserted'] += len(inserts)
+        self.project_changes['updated'] += len(updates)
+        self.project_changes['deleted'] += len(deletes)
+        return bool(inserts or updates or deletes)
+    
+    def scrape_all(self, search_terms=None, max_pages_per_term=None, get_details=True, use_threading=True, batch_size=100,
+                   use_async=True, search_concurrency=None, detail_concurrency=None, queue_size=500, incremental=False,
+                   resume=False):
+        """Main method to scrape all researchers through the streaming search → detail → store pipeline
+        
+        Returns the list of unique CNPq IDs seen; researcher records are written to
+        the database as they flow through the pipeline instead of being kept in memory.
+        With incremental=True, researchers whose certification date is unchanged are
+        not re-extracted or rewritten, and the rest are fetched stalest first.
+        With resume=True, the crawl checkpoint of the previous run is picked up:
+        recorded search pages are not fetched again and only researchers not yet
+        stored are processed. use_async is accepted for compatibility; the
+        pipeline always runs on the event loop.
+        """
+        print("\n🚀 Starting CNPq Lattes Enhanced Research Aggregator v3.0 (TURBO)")
+        print("=" * 70)
+        
+        if search_terms is None:
+            search_terms = SEARCH_TERMS
+        
+        # Worker counts are only upper bounds; the adaptive controller decides how many requests are in flight
+        if search_concurrency is None:
+            search_concurrency = self.concurrency.max_limit
+        if detail_concurrency is None:
+            detail_concurrency = self.concurrency.max_limit
+        if not use_async:
+            logger.warning("use_async=False is ignored: the streaming pipeline always runs on the event loop")
+        if not use_threading:
+            detail_concurrency = 1  # Sequential detail fetching
+        
+        self.progress.print_status(f"🎯 Will process {len(search_terms)} search term pairs", "🎯")
+        
+        if max_pages_per_term:
+            self.progress.print_status(f"📄 Limited to max {max_pages_per_term} pages per term", "📄")
+        else:
+            self.progress.print_status(f"🌐 Will fetch ALL available pages per term (ASYNC PARALLEL)", "🌐")
+        
+        self.progress.print_status(
+            f"⚡ Pipeline: {search_concurrency} search / {detail_concurrency if get_details else 0} detail workers, "
+            f"1 DB writer (batch size: {batch_size}, queue size: {queue_size})", "⚡"
+        )
+        
+        if incremental:
+            self.progress.print_status("♻️ Incremental mode: unchanged CVs are skipped, stalest refreshed first", "♻️")
+        
+        if resume:
+            self.progress.print_status("⏩ Resuming previous crawl from its checkpoint", "⏩")
+        
+        print(f"\n📍 STREAMING PIPELINE: Search → Details → Database (TURBO MODE)")
+        print("-" * 50)
+        
+        loop = self.get_event_loop()
+        try:
+            stats = loop.run_until_complete(self.scrape_all_async(
+                search_terms, max_pages_per_term, get_details, batch_size,
+                search_concurrency, detail_concurrency, queue_size, incremental=incremental, resume=resume
+            ))
+        except BaseException:
+            # Ctrl-C escapes run_until_complete with the pipeline still pending; cancel it so the
+            # loop can be closed cleanly (the checkpoint already holds everything committed so far)
+            pending = asyncio.all_tasks(loop)
+            while pending:
+                for task in pending:
+                    task.cancel()
+                try:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                except BaseException:
+                    pass  # Parent tasks re-raise the interrupt once more as they unwind
+                pending = asyncio.all_tasks(loop)
+            self.progress.print_status("⏸️ Crawl interrupted - run again with --resume to continue", "⏸️")
+            raise
+        
+        if not get_details:
+            self.progress.print_status("💾 Basic information saved to database (BATCH)", "💾")
+            return stats['cnpq_ids']
+        
+        errors = stats['processed'] - stats['successful']
+        
+        # Final summary
+        print(f"\n📍 COMPLETION SUMMARY (TURBO MODE)")
+        print("-" * 50)
+        elapsed_total = time.time() - self.progress.start_time
+        
+        self.progress.print_status(f"✅ Processing completed!", "✅")
+        self.progress.print_status(f"📊 Found {len(stats['cnpq_ids'])} unique researchers total (removed {stats['found'] - len(stats['cnpq_ids'])} duplicates)", "📊")
+        self.progress.print_status(f"👥 Researchers: {stats['successful']}/{stats['processed']} processed successfully", "👥")
+        if incremental:
+            self.progress.print_status(f"♻️ Unchanged CVs skipped: {stats['unchanged']}", "♻️")
+        if resume:
+            self.progress.print_status(f"⏩ Resumed: {stats['resumed']} researchers re-queued, {stats['pages_skipped']} pages skipped", "⏩")
+        crawl_summary = self.crawl_state.summary()
+        if crawl_summary.get('failed'):
+            self.progress.print_status(f"⚠️ {crawl_summary['failed']} researchers failed (retried by --resume)", "⚠️")
+        self.progress.print_status(f"📋 Projects: {stats['projects']} extracted", "📋")
+        self.progress.print_status(f"🎯 FM Projects: {stats['fm_projects']} identified", "🎯")
+        self.progress.print_status(f"❌ Errors: {errors}", "❌" if errors > 0 else "✅")
+        if stats['first_stored_at'] is not None:
+            self.progress.print_status(f"⏱️ First researcher stored after {stats['first_stored_at']:.1f}s", "⏱️")
+        concurrency = self.concurrency.snapshot()
+        self.progress.print_status(
+            f"🎚️ Concurrency: final limit {concurrency['limit']} "
+            f"({concurrency['throttled']} throttled, {concurrency['server_errors']} server errors, "
+            f"{concurrency['captchas']} captchas, {concurrency['decreases']} slowdowns)", "🎚️"
+        )
+        for endpoint, limiter_stats in self.rate_limiter.snapshot().items():
+            self.progress.print_status(
+                f"🚦 {endpoint}: {limiter_stats['requests']} requests, "
+                f"{limiter_stats['waited']:.1f}s waiting for rate limit (max {limiter_stats['max_wait']:.2f}s)", "🚦"
+            )
+        if self.cache:
+            self.progress.print_status(
+                f"🗄️ HTTP cache: {self.cache.stats['hits']} hits, {self.cache.stats['misses']} misses, "
+                f"{self.cache.stats['evictions']} evictions", "🗄️"
+            )
+        writer_stats = self.db_writer.stats
+        if writer_stats['commits']:
+            self.progress.print_status(
+                f"💾 DB writer: {writer_stats['writes']} writes in {writer_stats['commits']} commits, "
+                f"avg {writer_stats['commit_seconds'] / writer_stats['commits'] * 1000:.1f}ms "
+                f"(max {writer_stats['max_commit_seconds'] * 1000:.1f}ms), max queue depth {writer_stats['max_queue_depth']}", "💾"
+            )
+        if self.project_changes:
+            self.progress.print_status(
+                f"🧾 Project rows: {self.project_changes['inserted']} inserted, {self.project_changes['updated']} updated, "
+                f"{self.project_changes['deleted']} deleted, {self.project_changes['unchanged']} unchanged", "🧾"
+            )
+        if self.memo:
+            self.progress.print_status(
+                f"🧠 Parse memo: {self.memo.stats['memory_hits']} memory hits, {self.memo.stats['disk_hits']} disk hits, "
+                f"{self.memo.stats['misses']} misses", "🧠"
+            )
+        self.progress.print_status(f"⏱️ Total time: {int(elapsed_total//60)}:{int(elapsed_total%60):02d}", "⏱️")
+        self.progress.print_status(f"🚀 Speed: {len(stats['cnpq_ids'])/(elapsed_total/60):.1f} researchers/minute", "🚀")
+        self.progress.print_status(f"💾 Data saved to '{self.db_path}' (BATCH MODE)", "💾")
         
-        for project in projects:
-            title = project.get('title', '').strip()
-            if not title:
-                continue
-                
-            # Check if this project is too similar to any existing project
-            is_duplicate = False
+        return stats['cnpq_ids']
+    
+    async def scrape_all_async(self, search_terms, max_pages_per_term=None, get_details=True, batch_size=100,
+                               search_concurrency=8, detail_concurrency=32, queue_size=500, flush_interval=2.0,
+                               incremental=False, resume=False, max_attempts=3):
+        """Run search, detail and store stages concurrently, connected by bounded queues
+        
+        Result pages feed newly seen cnpq_ids straight to the detail workers, which
+        feed the single DB writer. A full queue blocks the stage upstream of it, so
+        memory stays bounded by the queue sizes instead of the number of terms.
+        In incremental mode the detail queue is a priority queue: never-stored
+        researchers first, then by oldest updated_at (within the queue window).
+        Progress is checkpointed in the crawl tables as it happens; with resume=True
+        fetched pages are skipped and unfinished researchers (pending, in flight or
+        failed fewer than max_attempts times) are fed to the pipeline again.
+        """
+        loop = asyncio.get_running_loop()
+        started_at = time.time()
+        stored = await loop.run_in_executor(None, self.load_stored_researchers) if incremental else {}
+        detail_queue = asyncio.PriorityQueue(maxsize=queue_size) if incremental else asyncio.Queue(maxsize=queue_size)
+        store_queue = asyncio.Queue(maxsize=queue_size)
+        sequence = itertools.count()  # FIFO tie-breaker for the priority queue
+        seen_ids = set()
+        unsaved = {}  # cnpq_id -> researcher still travelling through the pipeline
+        failed_ids = set()  # Detail fetch failed: left to --resume, never written as a stub
+        stats = {
+            'found': 0, 'processed': 0, 'successful': 0, 'projects': 0,
+            'fm_projects': 0, 'stored': 0, 'unchanged': 0, 'first_stored_at': None,
+            'resumed': 0, 'pages_skipped': 0,
+        }
+        
+        if resume:
+            # Everything already seen is known; only unfinished researchers go through the pipeline again
+            seen_ids.update(row[0] for row in await loop.run_in_executor(None, self.crawl_state.frontier))
+            resumed = await loop.run_in_executor(None, self.crawl_state.unfinished, max_attempts)
+            failed_ids.update(await loop.run_in_executor(None, self.crawl_state.exhausted, max_attempts))
+            self.crawl_state.mark_dispatched([r['cnpq_id'] for r in resumed])
+            # In the pipeline from the start, so sightings before resume_stage reaches them merge terms in place
+            unsaved.update((researcher['cnpq_id'], researcher) for researcher in resumed)
+            stats['resumed'] = len(resumed)
+        else:
+            await loop.run_in_executor(None, self.crawl_state.reset)
+            resumed = []
+        
+        async def enqueue_detail(researcher):
+            if not incremental:
+                await detail_queue.put(researcher)
+                return
+            state = stored.get(researcher['cnpq_id'])
+            priority = (1, state[1] or '') if state else (0, '')
+            await detail_queue.put((priority, next(sequence), researcher))
+        
+        async def next_detail():
+            item = await detail_queue.get()
+            return item[2] if incremental else item
+        
+        async def stop_detail_workers():
+            for _ in detail_tasks:
+                # Sentinels sort after every real item in the priority queue
+                await detail_queue.put(((2, ''), next(sequence), None) if incremental else None)
+        
+        async def on_page(term, researchers, page, total_pages):
+            new_ids = [r['cnpq_id'] for r in researchers if r['cnpq_id'] not in seen_ids]
+            seen_ids.update(new_ids)
             
-            for existing_project in unique_projects:
-                existing_title = existing_project.get('title', '').strip()
+            # Checkpoint before dispatching; the DB writer applies writes in order, so
+            # no id can be marked done ahead of this
+            self.crawl_state.record_page(term, self.build_search_query(term), page, total_pages, researchers, new_ids)
+            new_ids = set(new_ids)
+            
+            for researcher in researchers:
+                stats['found'] += 1
+                cnpq_id = researcher['cnpq_id']
                 
-                # Check for exact duplicates
-                if title.lower() == existing_title.lower():
-                    is_duplicate = True
+                if cnpq_id in new_ids:
+                    new_ids.discard(cnpq_id)  # Repeated on the same page: treat as a repeat sighting
+                    unsaved[cnpq_id] = researcher
+                    if get_details:
+                        await enqueue_detail(researcher)
+                    else:
+                        await store_queue.put(researcher)
+                elif cnpq_id in unsaved:
+                    # Still in the pipeline: merge search terms in place
+                    pending = unsaved[cnpq_id]
+                    if researcher['search_term'] not in split_search_terms(pending['search_term']):
+                        pending['search_term'] = f"{pending['search_term']}, {researcher['search_term']}"
+                elif cnpq_id in failed_ids:
+                    pass  # record_page already added the term to its crawl_frontier_terms
+                else:
+                    # Already handed to the writer: only record the extra search term
+                    await store_queue.put({'cnpq_id': cnpq_id, 'search_term': researcher['search_term'], 'term_only': True})
+        
+        async def search_stage():
+            for term_progress, (english_term, portuguese_term) in enumerate(search_terms, 1):
+                print(f"\n🔍 [{term_progress}/{len(search_terms)}] Processing: '{english_term}' / '{portuguese_term}'")
+                
+                # Try Portuguese term first, then English if no results
+                for term_lang, term in [("PT", portuguese_term.lower()), ("EN", english_term.lower())]:
+                    checkpoint = await loop.run_in_executor(None, self.crawl_state.term_progress, term) if resume else None
+                    found_before = stats['found']
+                    
+                    if checkpoint and checkpoint['complete']:
+                        self.progress.print_status(f"⏩ '{term}' already fully fetched ({term_lang})", "⏩")
+                        stats['pages_skipped'] += len(checkpoint['pages'])
+                    else:
+                        self.progress.print_status(f"🌐 Trying {term_lang}: '{term}' (ASYNC)", "🌐")
+                        if checkpoint:
+                            stats['pages_skipped'] += len(checkpoint['pages'])
+                        await self.search_term_pages_async(
+                            term, functools.partial(on_page, term), max_pages_per_term, search_concurrency,
+                            skip_pages=checkpoint['pages'] if checkpoint else None,
+                            known_total_pages=checkpoint['total_pages'] if checkpoint else None
+                        )
+                    found = stats['found'] - found_before + (checkpoint['found'] if checkpoint else 0)
+                    
+                    if found:
+                        self.progress.print_status(f"✅ Found {found} researchers for '{term}' ({term_lang})", "✅")
+                        break  # Found results, no need to try the other language
+                    else:
+                        self.progress.print_status(f"❌ No results for '{term}' ({term_lang})", "❌")
+        
+        async def resume_stage():
+            for researcher in resumed:
+                if get_details:
+                    await enqueue_detail(researcher)
+                else:
+                    await store_queue.put(researcher)
+        
+        async def detail_worker():
+            while True:
+                researcher = await next_detail()
+                if researcher is None:
                     break
                 
-                # Check for substantial overlap (considering one title contained in another)
-                if len(title) >= 15 and len(existing_title) >= 15:
-                    # If one title is completely contained in the other, it's likely a duplicate
-                    if title.lower() in existing_title.lower() or existing_title.lower() in title.lower():
-                        # Keep the longer, more descriptive title
-                        if len(title) > len(existing_title):
-                            unique_projects.remove(existing_project)
-                            break  # Will add the current (longer) title
-                        else:
-                            is_duplicate = True
-                            break
+                state = stored.get(researcher['cnpq_id'])
+                result = await self.process_researcher_with_details_async(researcher, state[0] if state else None)
+                stats['processed'] += 1
                 
-                # Check for high word overlap
-                similarity = self.title_similarity(title, existing_title)
-                if similarity > 0.7:  # 70% similarity threshold
-                    # Keep the more descriptive title (longer or with more specific terms)
-                    if self.is_more_descriptive(title, existing_title):
-                        unique_projects.remove(existing_project)
-                        break  # Will add the current (more descriptive) title
-                    else:
-                        is_duplicate = True
-                        break
+                if result['unchanged']:
+                    stats['successful'] += 1
+                    stats['unchanged'] += 1
+                    unsaved.pop(researcher['cnpq_id'], None)
+                    self.crawl_state.mark_done([researcher['cnpq_id']])
+                    # Nothing to rewrite unless it was found under a search term not stored yet
+                    new_terms = [t for t in split_search_terms(researcher['search_term']) if t not in state[2]]
+                    for term in new_terms:
+                        await store_queue.put({'cnpq_id': researcher['cnpq_id'], 'search_term': term, 'term_only': True})
+                elif result['success']:
+                    stats['successful'] += 1
+                    stats['projects'] += result['project_count']
+                    stats['fm_projects'] += result['fm_projects']
+                    await store_queue.put(researcher)
+                else:
+                    unsaved.pop(researcher['cnpq_id'], None)
+                    failed_ids.add(researcher['cnpq_id'])
+                    self.crawl_state.mark_failed(researcher['cnpq_id'], result.get('error', 'unknown error'))
+        
+        def uncount_stored(count, error):
+            stats['stored'] -= count
+            if not stats['stored']:
+                stats['first_stored_at'] = None
+            logger.error(f"{count} records were not stored{f': {error}' if error else ''}; --resume retries them")
+        
+        def on_saved(count, future):
+            # Runs on the DB writer thread; stats belong to the event loop
+            error = future.exception()
+            failed = count if error else len(future.result())
+            if failed:
+                loop.call_soon_threadsafe(uncount_stored, failed, error)
+        
+        async def store_stage():
+            batch = []
+            finished = False
             
-            if not is_duplicate:
-                unique_projects.append(project)
+            while not finished:
+                try:
+                    item = await asyncio.wait_for(store_queue.get(), timeout=flush_interval)
+                    timed_out = False
+                except asyncio.TimeoutError:
+                    item, timed_out = False, True
+                
+                if item is None:
+                    finished = True
+                elif item:
+                    # From here on the record belongs to the writer
+                    unsaved.pop(item['cnpq_id'], None)
+                    batch.append(item)
+                
+                if batch and (finished or timed_out or len(batch) >= batch_size):
+                    # Marked done in the same write, so a failed batch stays resumable;
+                    # extra-term records belong to researchers already done
+                    future = self.save_researchers_batch(batch, done_ids=[item['cnpq_id'] for item in batch if not item.get('term_only')])
+                    future.add_done_callback(functools.partial(on_saved, len(batch)))
+                    
+                    if stats['first_stored_at'] is None:
+                        stats['first_stored_at'] = time.time() - started_at
+                    previous = stats['stored']
+                    stats['stored'] += len(batch)
+                    batch = []
+                    
+                    if stats['stored'] // 100 > previous // 100:
+                        self.progress.print_status(f"💾 Stored {stats['stored']} records ({len(seen_ids)} unique researchers seen)", "💾")
         
-        return unique_projects
+        detail_tasks = [asyncio.ensure_future(detail_worker()) for _ in range(detail_concurrency if get_details else 0)]
+        store_task = asyncio.ensure_future(store_stage())
+        
+        try:
+            await asyncio.gather(resume_stage(), search_stage())
+            
+            # Drain the pipeline stage by stage
+            await stop_detail_workers()
+            await asyncio.gather(*detail_tasks)
+            await store_queue.put(None)
+            await store_task
+            await loop.run_in_executor(None, self.db_writer.flush)
+        finally:
+            for task in detail_tasks + [store_task]:
+                if not task.done():
+                    task.cancel()
+        
+        stats['cnpq_ids'] = list(seen_ids)
+        return stats
     
-    def is_more_descriptive(self, title1, title2):
-        """Check if title1 is more descriptive than title2"""
-        # Longer titles are generally more descriptive
-        if len(title1) > len(title2) + 10:  # Significantly longer
-            return True
-        elif len(title2) > len(title1) + 10:
-            return False
+    def load_stored_researchers(self):
+        """Map cnpq_id -> (last_update_date, updated_at, set of search terms) for incremental refreshes"""
+        def run(cursor):
+            stored = {cnpq_id: (last_update_date, updated_at, set()) for cnpq_id, last_update_date, updated_at in
+                      cursor.execute('SELECT cnpq_id, last_update_date, updated_at FROM researchers')}
+            cursor.execute('''
+                SELECT r.cnpq_id, t.term FROM researcher_terms rt
+                JOIN researchers r ON r.id = rt.researcher_id
+                JOIN search_terms t ON t.id = rt.term_id
+            ''')
+            for cnpq_id, term in cursor.fetchall():
+                stored[cnpq_id][2].add(term)
+            return stored
+        return self.db_writer.execute(run)
+    
+    def reparse_archive(self, batch_size=500):
+        """Re-run the current extractors over the HTML archive and update the database, without network I/O
+        
+        As in a crawl, each researcher's latest preview page is parsed, and the
+        latest CV page is used when the preview yields no name. Pages are parsed
+        in the parse process pool. Returns {'researchers', 'reparsed', 'projects'}.
+        """
+        if not self.archive:
+            raise ValueError("reparse_archive needs an HTML archive (archive_dir is None)")
+        
+        start_time = time.time()
+        latest = self.archive.latest_pages()
+        cnpq_ids = sorted(latest)
+        stats = {'researchers': len(cnpq_ids), 'reparsed': 0, 'projects': 0}
+        self.progress.print_status(f"🗃️ Reparsing archived pages of {len(cnpq_ids)} researchers", "🗃️")
+        
+        for start in range(0, len(cnpq_ids), batch_size):
+            chunk = cnpq_ids[start:start + batch_size]
+            details = self.parse_archived_pages(chunk, latest, 'preview', ('preview.do',))
+            without_name = [cnpq_id for cnpq_id in chunk if not details.get(cnpq_id, {}).get('name')]
+            details.update(self.parse_archived_pages(without_name, latest, 'cv', ('visualizacv.do', 'lattes')))
+            
+            batch = []
+            for cnpq_id in chunk:
+                if not details.get(cnpq_id):
+                    continue
+                # Its search terms are already in researcher_terms
+                researcher = {'cnpq_id': cnpq_id, 'search_term': ''}
+                researcher.update(details[cnpq_id])
+                batch.append(researcher)
+                stats['projects'] += len(researcher.get('projects', []))
+            
+            self.save_researchers_batch(batch)
+            stats['reparsed'] += len(batch)
+            self.progress.print_status(
+                f"🗃️ Reparsed {min(start + batch_size, len(cnpq_ids))}/{len(cnpq_ids)} researchers", "🗃️"
+            )
         
-        # Count technical terms
-        tech_terms = ['software', 'system', 'algorithm', 'network', 'data', 'artificial', 
-                     'machine', 'computer', 'computing', 'programming', 'development', 
-                     'technology', 'digital', 'information', 'cyber', 'security', 'database',
-                     'sistemas', 'algoritmo', 'dados', 'inteligência', 'computação', 'tecnologia']
+        self.db_writer.flush()
+        elapsed = time.time() - start_time
+        self.progress.print_status(
+            f"✅ Reparse done: {stats['reparsed']} researchers, {stats['projects']} projects in {elapsed:.1f}s", "✅"
+        )
+        return stats
+    
+    def parse_archived_pages(self, cnpq_ids, latest, page_type, endpoints):
+        """Parse the latest archived page from the first of endpoints each researcher has; {cnpq_id: records}"""
+        jobs = []
+        for cnpq_id in cnpq_ids:
+            location = next((latest[cnpq_id][endpoint] for endpoint in endpoints if endpoint in latest[cnpq_id]), None)
+            if location:
+                jobs.append((cnpq_id, self.archive.read_blob(*location)))
+        
+        args = ([page_type] * len(jobs), [blob for _, blob in jobs], [{'cnpq_id': cnpq_id} for cnpq_id, _ in jobs])
+        pool = self.get_parse_pool()
+        results = pool.map(parse_archived_page, *args, chunksize=16) if pool else map(parse_archived_page, *args)
+        
+        parsed = {}
+        for (cnpq_id, _), (records, cpu_seconds) in zip(jobs, results):
+            self.metrics.record_parse(page_type, cpu_seconds)
+            parsed[cnpq_id] = records
+        return parsed
+    
+    def close(self):
+        """Close the HTTP sessions, the event loop and the database connection"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.close_async())
+            self._loop.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(cancel_futures=True)
+            self._parse_pool = None
+        self.session.close()
+        if self.cache:
+            self.cache.close()
+        if self.archive:
+            self.archive.close()
+        if self.memo:
+            self.memo.close()
+        self.finish_bulk_load()
+        self.db_writer.close()
+
+    def get_researcher_details_from_preview(self, cnpq_id):
+        """Extract researcher details from the preview page which has all the info we need"""
+        try:
+            logger.info(f"Extracting details from preview page for {cnpq_id}")
+            
+            preview_url = f"{self.base_url}/preview.do"
+            preview_params = {
+                'metodo': 'apresentar',
+                'id': cnpq_id
+            }
+            
+            response = self.http_request('GET', preview_url, params=preview_params, timeout=15)
+            response.raise_for_status()
+            
+            return self.parse_preview_details(response.text, cnpq_id)
+            
+        except Exception as e:
+            logger.error(f"Error fetching preview details for {cnpq_id}: {e}")
+            return {}
+    
+    async def get_researcher_details_async(self, cnpq_id, known_update_date=None):
+        """Async version of get_researcher_details running on the shared event loop
         
-        title1_tech_count = sum(1 for term in tech_terms if term in title1.lower())
-        title2_tech_count = sum(1 for term in tech_terms if term in title2.lower())
+        If known_update_date matches the preview's certification date, the CV is
+        unchanged and {'unchanged': True, 'last_update_date': ...} is returned unparsed.
+        """
+        try:
+            logger.info(f"Trying preview-based extraction for {cnpq_id}")
+            preview_details = await self.get_researcher_details_from_preview_async(cnpq_id, known_update_date)
+            
+            if preview_details.get('unchanged'):
+                logger.info(f"CV unchanged since {known_update_date} for {cnpq_id}, skipping extraction")
+                return preview_details
+            
+            if preview_details and preview_details.get('name'):
+                logger.info(f"Successfully extracted details from preview for {cnpq_id}")
+                return preview_details
+            
+            logger.info(f"Preview extraction failed, trying reCaptcha approach for {cnpq_id}")
+            return await self.get_researcher_details_with_captcha_async(cnpq_id)
+            
+        except Exception as e:
+            logger.error(f"Error in get_researcher_details_async for {cnpq_id}: {e}")
+            return {}
+    
+    async def get_researcher_details_from_preview_async(self, cnpq_id, known_update_date=None):
+        """Async version of get_researcher_details_from_preview"""
+        try:
+            logger.info(f"Extracting details from preview page for {cnpq_id}")
+            
+            preview_url = f"{self.base_url}/preview.do"
+            preview_params = {
+                'metodo': 'apresentar',
+                'id': cnpq_id
+            }
+            
+            html_content = await self.fetch_text_async(preview_url, params=preview_params)
+            return await self.parse_async(
+                'preview', html_content, cnpq_id=cnpq_id, known_update_date=known_update_date
+            )
+            
+        except Exception as e:
+            logger.error(f"Error fetching preview details for {cnpq_id}: {e}")
+            return {}
+    
+    async def get_researcher_details_with_captcha_async(self, cnpq_id):
+        """Async version of get_researcher_details_with_captcha (visualizacv.do fallbacks)"""
+        cv_url = f"{self.base_url}/visualizacv.do"
         
-        return title1_tech_count > title2_tech_count
+        try:
+            # First, try to access the CV directly using the simple GET method (sometimes works)
+            logger.info(f"Attempting direct CV access for {cnpq_id}")
+            try:
+                html_content = await self.fetch_text_async(cv_url, params={'metodo': 'apresentar', 'id': cnpq_id})
+                if self.is_valid_cv_page(html_content):
+                    logger.info(f"Direct access successful for {cnpq_id}")
+                    return await self.parse_async('cv', html_content)
+                else:
+                    logger.info(f"Direct access returned captcha page for {cnpq_id}")
+            except Exception as e:
+                logger.warning(f"Direct access failed for {cnpq_id}: {e}")
+            
+            # If direct access fails, try the preview + token approach
+            logger.info(f"Trying preview + token approach for {cnpq_id}")
+            preview_html = await self.fetch_text_async(
+                f"{self.base_url}/preview.do", params={'metodo': 'apresentar', 'id': cnpq_id}
+            )
+            
+            if not self.is_valid_cv_page(preview_html):
+                logger.warning(f"Preview page also shows captcha for {cnpq_id}")
+                self.save_debug_html(preview_html, f"debug_preview_{cnpq_id}.html")
+            
+            token = self.extract_token_from_html(preview_html)
+            if not token:
+                logger.warning(f"No token found for {cnpq_id}, attempting without token")
+                token = ""
+            
+            cv_html = await self.fetch_text_async(
+                cv_url, data=self.build_cv_form_data(cnpq_id, token), method='POST', timeout=30
+            )
+            
+            if self.is_valid_cv_page(cv_html):
+                logger.info(f"Successfully fetched CV for {cnpq_id} using POST method")
+                return await self.parse_async('cv', cv_html)
+            
+            logger.warning(f"POST method returned captcha page for {cnpq_id}")
+            self.save_debug_html(cv_html, f"debug_post_{cnpq_id}.html")
+            return await self.try_alternative_access_async(cnpq_id)
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching details for {cnpq_id}: {e}")
+            return await self.try_alternative_access_async(cnpq_id)
     
-    def title_similarity(self, title1, title2):
-        """Calculate similarity between two titles (simple word overlap)"""
-        if not title1 or not title2:
-            return 0
+    async def try_alternative_access_async(self, cnpq_id):
+        """Async version of try_alternative_access"""
+        logger.info(f"Trying alternative access methods for {cnpq_id}")
         
-        words1 = set(title1.lower().split())
-        words2 = set(title2.lower().split())
+        # Method 1: Try direct Lattes URL
+        try:
+            lattes_url = f"{self.lattes_url}/{cnpq_id}"
+            logger.info(f"Trying direct Lattes URL: {lattes_url}")
+            
+            html_content = await self.fetch_text_async(lattes_url)
+            if self.is_valid_cv_page(html_content):
+                logger.info(f"Direct Lattes access successful for {cnpq_id}")
+                return await self.parse_async('cv', html_content)
+            
+            logger.warning(f"Direct Lattes also shows captcha for {cnpq_id}")
+            self.save_debug_html(html_content, f"debug_lattes_{cnpq_id}.html")
+        except Exception as e:
+            logger.error(f"Direct Lattes access failed for {cnpq_id}: {e}")
         
-        if not words1 or not words2:
-            return 0
+        # Method 2: Try different user agent (per request, the shared session stays untouched)
+        try:
+            logger.info(f"Trying with different user agent for {cnpq_id}")
+            html_content = await self.fetch_text_async(
+                f"{self.base_url}/visualizacv.do",
+                params={'metodo': 'apresentar', 'id': cnpq_id},
+                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+            )
+            if self.is_valid_cv_page(html_content):
+                logger.info(f"Alternative user agent successful for {cnpq_id}")
+                return await self.parse_async('cv', html_content)
+        except Exception as e:
+            logger.error(f"Alternative user agent failed for {cnpq_id}: {e}")
         
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        logger.error(f"All access methods failed for {cnpq_id}")
+        return {}
+    
+    def save_researchers_batch(self, researchers_data_list, done_ids=None):
+        """Queue researchers and their projects for the DB writer as one write; returns its Future
         
-        return len(intersection) / len(union) if union else 0
-
-    def save_researchers_batch(self, researchers_data_list):
-        """Save multiple researchers and their projects in a single transaction (much faster)"""
+        done_ids are marked done in crawl_frontier by the same write, except the
+        researchers that failed to save. The Future's result is their cnpq_ids.
+        """
         if not researchers_data_list:
-            return
+            return None
+        
+        def run(cursor):
+            failed = self.write_researchers_batch(cursor, researchers_data_list)
+            if done_ids:
+                CrawlState.mark_done_with(cursor, [cnpq_id for cnpq_id in done_ids if cnpq_id not in failed])
+            return failed
         
-        with self.db_lock:  # Ensure thread-safe database operations
+        return self.db_writer.submit(run, records=len(researchers_data_list))
+    
+    def write_researchers_batch(self, cursor, researchers_data_list):
+        """Save multiple researchers and their projects (runs on the DB writer)
+        
+        Each researcher is written in its own savepoint, so one that fails leaves
+        nothing behind. Returns the set of cnpq_ids that failed.
+        """
+        failed = set()
+        saved_count = 0
+        updated_count = 0
+        projects_count = 0
+        # AUTOINCREMENT ids only grow, so rows above this one were inserted by this batch
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM researchers')
+        last_id_before = cursor.fetchone()[0]
+        inserted_ids = set()
+        
+        for researcher_data in researchers_data_list:
+            cursor.execute('SAVEPOINT researcher')
             try:
-                # Create a new connection for thread safety
-                conn = sqlite3.connect('cnpq_researchers.db')
-                cursor = conn.cursor()
-                
-                # Begin transaction
-                cursor.execute('BEGIN TRANSACTION')
-                
-                saved_count = 0
-                updated_count = 0
-                projects_count = 0
+                researcher_id = self.upsert_researcher(cursor, researcher_data)
+                if researcher_id > last_id_before and researcher_id not in inserted_ids:
+                    inserted_ids.add(researcher_id)
+                    saved_count += 1
+                else:
+                    updated_count += 1
                 
-                for researcher_data in researchers_data_list:
-                    try:
-                        # Check if researcher already exists
-                        cursor.execute('SELECT id, cnpq_id FROM researchers WHERE cnpq_id = ?', 
-                                      (researcher_data.get('cnpq_id'),))
-                        existing = cursor.fetchone()
-                        
-                        researcher_id = None
-                        
-                        if existing:
-                            researcher_id = existing[0]
-                            # Update existing record
-                            cursor.execute('''
-                                UPDATE researchers 
-                                SET search_term = CASE 
-                                    WHEN search_term LIKE '%' || ? || '%' THEN search_term
-                                    ELSE search_term || ', ' || ?
-                                END,
-                                name = COALESCE(?, name),
-                                institution = COALESCE(?, institution),
-                                area = COALESCE(?, area),
-                                city = COALESCE(?, city),
-                                state = COALESCE(?, state),
-                                country = COALESCE(?, country),
-                                last_update_date = COALESCE(?, last_update_date),
-                                updated_at = CURRENT_TIMESTAMP
-                                WHERE cnpq_id = ?
-                            ''', (
-                                researcher_data.get('search_term'),
-                                researcher_data.get('search_term'),
-                                researcher_data.get('name'),
-                                researcher_data.get('institution'),
-                                researcher_data.get('area'),
-                                researcher_data.get('city'),
-                                researcher_data.get('state'),
-                                researcher_data.get('country'),
-                                researcher_data.get('last_update_date'),
-                                researcher_data.get('cnpq_id')
-                            ))
-                            updated_count += 1
-                        else:
-                            # Insert new researcher
-                            cursor.execute('''
-                                INSERT INTO researchers 
-                                (cnpq_id, name, institution, area, city, state, country, lattes_url, search_term, last_update_date)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            ''', (
-                                researcher_data.get('cnpq_id'),
-                                researcher_data.get('name'),
-                                researcher_data.get('institution'),
-                                researcher_data.get('area'),
-                                researcher_data.get('city'),
-                                researcher_data.get('state'),
-                                researcher_data.get('country'),
-                                f"http://lattes.cnpq.br/{researcher_data.get('cnpq_id')}" if researcher_data.get('cnpq_id') else None,
-                                researcher_data.get('search_term'),
-                                researcher_data.get('last_update_date')
-                            ))
-                            researcher_id = cursor.lastrowid
-                            saved_count += 1
-                        
-                        # Save projects if they exist
-                        projects = researcher_data.get('projects', [])
-                        if projects and researcher_id:
-                            # Delete existing projects for this researcher to avoid duplicates
-                            cursor.execute('DELETE FROM projects WHERE cnpq_id = ?', (researcher_data.get('cnpq_id'),))
-                            
-                            # Prepare batch insert for projects
-                            project_data = []
-                            for project in projects:
-                                project_data.append((
-                                    researcher_id,
-                                    researcher_data.get('cnpq_id'),
-                                    project.get('title'),
-                                    project.get('start_date'),
-                                    project.get('end_date'),
-                                    project.get('status'),
-                                    project.get('description'),
-                                    project.get('funding_sources'),
-                                    project.get('coordinator_name'),
-                                    project.get('team_members'),
-                                    project.get('industry_cooperation'),
-                                    project.get('formal_methods_concepts'),
-                                    project.get('formal_methods_tools'),
-                                    project.get('is_formal_methods_related', False)
-                                ))
-                            
-                            # Batch insert projects
-                            cursor.executemany('''
-                                INSERT INTO projects 
-                                (researcher_id, cnpq_id, title, start_date, end_date, status, description, 
-                                 funding_sources, coordinator_name, team_members, industry_cooperation, 
-                                 formal_methods_concepts, formal_methods_tools, is_formal_methods_related)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            ''', project_data)
-                            
-                            projects_count += len(projects)
+                # Save projects if they exist
+                projects = researcher_data.get('projects', [])
+                if projects and researcher_id:
+                    if self.sync_projects(cursor, researcher_id, researcher_data.get('cnpq_id'), projects):
+                        self.link_canonical_projects(cursor, researcher_data.get('cnpq_id'))
                     
-                    except Exception as e:
-                        logger.error(f"Error saving researcher {researcher_data.get('name', 'Unknown')}: {e}")
-                        continue
-                
-                # Commit the transaction
-                conn.commit()
-                conn.close()
-                
-                logger.info(f"Batch saved: {saved_count} new researchers, {updated_count} updated, {projects_count} total projects")
-                
-            except sqlite3.Error as e:
-                logger.error(f"Database batch error: {e}")
-                if conn:
-                    conn.rollback()
-                    conn.close()
+                    projects_count += len(projects)
+                cursor.execute('RELEASE researcher')
+            
+            except Exception as e:
+                logger.error(f"Error saving researcher {researcher_data.get('name', 'Unknown')}: {e}")
+                cursor.execute('ROLLBACK TO researcher')
+                cursor.execute('RELEASE researcher')
+                failed.add(researcher_data.get('cnpq_id'))
+                continue
+        
+        logger.info(f"Batch saved: {saved_count} new researchers, {updated_count} updated, {projects_count} total projects")
+        return failed
+    
+    CANONICAL_FIELDS = ('title', 'start_date', 'end_date', 'status', 'description', 'funding_sources',
+                        'industry_cooperation', 'formal_methods_concepts', 'formal_methods_tools',
+                        'is_formal_methods_related')
+    
+    def link_canonical_projects(self, cursor, cnpq_id):
+        """Link a researcher's saved projects to canonical projects by project_title_key, creating unseen ones"""
+        cursor.execute('SELECT canonical_project_id FROM researcher_projects WHERE cnpq_id = ?', (cnpq_id,))
+        affected = {row[0] for row in cursor.fetchall()}
+        cursor.execute('DELETE FROM researcher_projects WHERE cnpq_id = ?', (cnpq_id,))
+        
+        cursor.execute(f"SELECT id, {', '.join(self.CANONICAL_FIELDS)} FROM projects WHERE cnpq_id = ?", (cnpq_id,))
+        for project_id, *fields in cursor.fetchall():
+            title_key = project_title_key(fields[0])
+            if not title_key:
+                continue
+            
+            cursor.execute('SELECT canonical_project_id FROM project_title_keys WHERE title_key = ?', (title_key,))
+            row = cursor.fetchone()
+            if row:
+                canonical_id = row[0]
+            else:
+                cursor.execute(f'''
+                    INSERT INTO canonical_projects ({', '.join(self.CANONICAL_FIELDS)})
+                    VALUES ({', '.join('?' * len(self.CANONICAL_FIELDS))})
+                ''', fields)
+                canonical_id = cursor.lastrowid
+                cursor.execute('INSERT INTO project_title_keys (title_key, canonical_project_id) VALUES (?, ?)',
+                               (title_key, canonical_id))
+            
+            cursor.execute(
+                'INSERT OR IGNORE INTO researcher_projects (cnpq_id, canonical_project_id, project_id) VALUES (?, ?, ?)',
+                (cnpq_id, canonical_id, project_id)
+            )
+            affected.add(canonical_id)
+        
+        self.refresh_canonical_projects(cursor, affected)
+    
+    def refresh_canonical_projects(self, cursor, canonical_ids):
+        """Recompute canonical projects from the projects rows linked to them, dropping unlinked ones
+        
+        Fields come from the linked project with the most descriptive title, and a
+        canonical project is formal-methods related while any linked project is.
+        """
+        columns = ', '.join(f'p.{field}' for field in self.CANONICAL_FIELDS)
+        for canonical_id in canonical_ids:
+            cursor.execute(f'''
+                SELECT p.id, {columns} FROM researcher_projects rp
+                LEFT JOIN projects p ON p.id = rp.project_id
+                WHERE rp.canonical_project_id = ?
+                ORDER BY p.id
+            ''', (canonical_id,))
+            links = cursor.fetchall()
+            if not links:
+                cursor.execute('DELETE FROM project_title_keys WHERE canonical_project_id = ?', (canonical_id,))
+                cursor.execute('DELETE FROM canonical_projects WHERE id = ?', (canonical_id,))
+                continue
+            
+            rows = [row[1:] for row in links if row[0] is not None]
+            if not rows:
+                cursor.execute('UPDATE canonical_projects SET researcher_count = ? WHERE id = ?',
+                               (len(links), canonical_id))
+                continue
+            best = rows[0]
+            for row in rows[1:]:
+                if self.is_more_descriptive(row[0] or '', best[0] or ''):
+                    best = row
+            fields = list(best)
+            fields[-1] = max(row[-1] or 0 for row in rows)
+            cursor.execute(
+                f"UPDATE canonical_projects SET {', '.join(f'{field} = ?' for field in self.CANONICAL_FIELDS)}, "
+                f"researcher_count = ? WHERE id = ?",
+                fields + [len(links), canonical_id]
+            )
+    
+    def cluster_projects(self, threshold=0.8, chunk_size=500):
+        """Batch job: merge canonical projects whose titles are near-duplicates anywhere in the corpus
+        
+        Projects saved before the canonical tables existed are linked first. Each
+        merged group keeps its lowest id, with the fields of its most descriptive
+        title. Linking and merging are committed chunk_size researchers or groups
+        at a time, so the DB writer is never held for the whole job; the title keys
+        are read on a separate connection. Returns {'canonical_before',
+        'canonical_after', 'merged_groups', 'linked_researchers'}.
+        """
+        start_time = time.time()
+        
+        def link(cursor, cnpq_ids):
+            for cnpq_id in cnpq_ids:
+                self.link_canonical_projects(cursor, cnpq_id)
+        
+        def merge(cursor, groups):
+            for group in groups:
+                self.merge_canonical_projects(cursor, sorted(group))
+        
+        # Reads below see everything queued before the job started
+        self.db_writer.flush()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            unlinked = [row[0] for row in conn.execute('''
+                SELECT DISTINCT p.cnpq_id FROM projects p
+                LEFT JOIN researcher_projects rp ON rp.project_id = p.id
+                WHERE rp.project_id IS NULL
+            ''')]
+            for start in range(0, len(unlinked), chunk_size):
+                self.db_writer.execute(functools.partial(link, cnpq_ids=unlinked[start:start + chunk_size]))
+            
+            canonical_before = conn.execute('SELECT COUNT(*) FROM canonical_projects').fetchone()[0]
+            keys = conn.execute('SELECT title_key, canonical_project_id FROM project_title_keys').fetchall()
+            self.progress.print_status(
+                f"🧩 Clustering {len(keys)} project titles ({canonical_before} canonical projects)", "🧩"
+            )
+            
+            groups = ProjectClusterer(threshold).clusters(keys)
+            for start in range(0, len(groups), chunk_size):
+                self.db_writer.execute(functools.partial(merge, groups=groups[start:start + chunk_size]))
+            
+            canonical_after = conn.execute('SELECT COUNT(*) FROM canonical_projects').fetchone()[0]
+        finally:
+            conn.close()
+        
+        result = {'canonical_before': canonical_before, 'canonical_after': canonical_after,
+                  'merged_groups': len(groups), 'linked_researchers': len(unlinked)}
+        self.progress.print_status(
+            f"🧩 Merged {result['merged_groups']} groups: {result['canonical_before']} → {result['canonical_after']} "
+            f"canonical projects in {time.time() - start_time:.1f}s", "🧩"
+        )
+        return result
+    
+    def merge_canonical_projects(self, cursor, canonical_ids):
+        """Fold canonical_ids[1:] into canonical_ids[0]
+        
+        Ids merged or dropped since the group was computed are skipped.
+        """
+        marks = ', '.join('?' * len(canonical_ids))
+        cursor.execute(f'SELECT id FROM canonical_projects WHERE id IN ({marks}) ORDER BY id', canonical_ids)
+        canonical_ids = [row[0] for row in cursor.fetchall()]
+        if len(canonical_ids) < 2:
+            return
+        survivor, others = canonical_ids[0], canonical_ids[1:]
+        for other in others:
+            # A researcher linked to both keeps its survivor link
+            cursor.execute('UPDATE OR IGNORE researcher_projects SET canonical_project_id = ? WHERE canonical_project_id = ?',
+                           (survivor, other))
+            cursor.execute('DELETE FROM researcher_projects WHERE canonical_project_id = ?', (other,))
+            cursor.execute('UPDATE project_title_keys SET canonical_project_id = ? WHERE canonical_project_id = ?',
+                           (survivor, other))
+            cursor.execute('DELETE FROM canonical_projects WHERE id = ?', (other,))
+        # Takes its fields from the most descriptive title across the merged links
+        self.refresh_canonical_projects(cursor, [survivor])
 
-    def process_researchers_batch(self, researchers_list, batch_size=50):
+    def process_researchers_batch(self, researchers_list, batch_size=50, use_async=True):
         """Process researchers in batches for better performance"""
         if not researchers_list:
             return []
         
+        if use_async:
+            return self.get_event_loop().run_until_complete(
+                self.process_researchers_batch_async(researchers_list, batch_size)
+            )
+        
         all_results = []
         total_batches = (len(researchers_list) + batch_size - 1) // batch_size
         
@@ -2265,12 +4936,83 @@ class CNPqScraper:
             
             # Be respectful to the server between batches
             if batch_num < total_batches:
-                time.sleep(1)
+                self.concurrency.wait_for_cooldown()
+        
+        self.db_writer.flush()
+        return all_results
+
+    async def process_researchers_batch_async(self, researchers_list, batch_size=50):
+        """Process researchers in batches with all detail requests in flight on the event loop"""
+        all_results = []
+        total_batches = (len(researchers_list) + batch_size - 1) // batch_size
+        
+        for batch_idx in range(0, len(researchers_list), batch_size):
+            batch = researchers_list[batch_idx:batch_idx + batch_size]
+            batch_num = (batch_idx // batch_size) + 1
+            
+            self.progress.print_status(f"🔄 Processing batch {batch_num}/{total_batches} ({len(batch)} researchers, async)", "🔄")
+            
+            # Concurrency is bounded by the per-host semaphores, not by a thread count
+            batch_results = await asyncio.gather(
+                *(self.process_researcher_with_details_async(researcher) for researcher in batch)
+            )
+            
+            successful_researchers = [
+                result['researcher'] for result in batch_results 
+                if result['success'] and result['researcher']
+            ]
+            
+            # Queued to the DB writer, off the event loop
+            if successful_researchers:
+                self.save_researchers_batch(successful_researchers)
+            
+            all_results.extend(batch_results)
+            
+            success_count = sum(1 for r in batch_results if r['success'])
+            self.progress.print_status(f"✅ Batch {batch_num} completed: {success_count}/{len(batch)} successful", "✅")
+            
+            # Be respectful to the server between batches
+            if batch_num < total_batches:
+                await self.concurrency.cooldown_async()
         
+        await asyncio.get_running_loop().run_in_executor(None, self.db_writer.flush)
         return all_results
 
+def parse_args(argv=None):
+    """Parse command line options for the scraper"""
+    parser = argparse.ArgumentParser(description="CNPq Lattes Enhanced Research Aggregator")
+    parser.add_argument('--incremental', action='store_true',
+                        help="skip researchers whose 'Certificado pelo autor em' date is unchanged "
+                             "and refresh the rest stalest first")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue the previous crawl from its checkpoint instead of starting over")
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help="processes for HTML parsing (default: one per CPU, 0 parses inline)")
+    parser.add_argument('--reparse', action='store_true',
+                        help="re-run the extractors over the HTML archive and update the database "
+                             "without fetching anything")
+    parser.add_argument('--archive-dir', default='html_archive',
+                        help="where fetched pages are archived for --reparse (default: html_archive)")
+    parser.add_argument('--cluster-projects', action='store_true',
+                        help="only run the batch job that merges near-duplicate projects across researchers")
+    parser.add_argument('--bulk-load', action='store_true',
+                        help="for big initial loads: skip fsyncs and build the read-only indexes once at the end")
+    return parser.parse_args(argv)
+
 def main():
-    scraper = CNPqScraper(max_workers=8)  # Increased workers for better performance
+    args = parse_args()
+    scraper = CNPqScraper(max_workers=8, parse_workers=args.parse_workers,  # Starting concurrency; adapts at runtime
+                          archive_dir=args.archive_dir, bulk_load=args.bulk_load)
+    
+    if args.reparse or args.cluster_projects:
+        try:
+            if args.reparse:
+                scraper.reparse_archive()
+            if args.cluster_projects:
+                scraper.cluster_projects()
+        finally:
+            scraper.close()
+        return
     
     try:
         print("🔬 CNPq Lattes Enhanced Research Aggregator v2.0")
@@ -2282,7 +5024,9 @@ def main():
             search_terms=SEARCH_TERMS,  # Use all formal methods terms
             max_pages_per_term=None,  # Fetch ALL available pages (no limit)
             get_details=True,
-            use_threading=True
+            use_threading=True,
+            incremental=args.incremental,
+            resume=args.resume
         )
         
         print("\n" + "=" * 70)
@@ -2293,13 +5037,13 @@ def main():
         total_researchers = len(researchers)
         
         # Get database statistics
-        conn = sqlite3.connect('cnpq_researchers.db')
+        conn = sqlite3.connect(scraper.db_path)
         cursor = conn.cursor()
         
-        cursor.execute("SELECT COUNT(*) FROM projects")
+        cursor.execute("SELECT COUNT(*) FROM canonical_projects")
         total_projects = cursor.fetchone()[0]
         
-        cursor.execute("SELECT COUNT(*) FROM projects WHERE is_formal_methods_related = 1")
+        cursor.execute("SELECT COUNT(*) FROM canonical_projects WHERE is_formal_methods_related = 1")
         fm_projects = cursor.fetchone()[0]
         
         cursor.execute("""
@@ -2316,7 +5060,7 @@ def main():
         
         print(f"📊 FINAL STATISTICS:")
         print(f"   👥 Unique researchers: {total_researchers}")
-        print(f"   📋 Total projects: {total_projects}")
+        print(f"   📋 Distinct projects: {total_projects}")
         print(f"   🎯 Formal methods projects: {fm_projects} ({fm_projects/total_projects*100:.1f}%)" if total_projects > 0 else "   🎯 Formal methods projects: 0")
         
         if top_institutions:
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the CNPq buscatextual and Lattes sites, for offline benchmarks and load tests.
+
+Serves busca.do result pages, preview.do pages and (captcha-protected) CV pages
+for a synthetic corpus of researchers, and can inject latency, 429 responses
+and captcha pages. In record mode it proxies to the real sites and saves every
+response, so a crawl can later be replayed faithfully without network access.
+
+Usage:
+    python mock_cnpq_server.py --researchers 2000 --latency 0.2 --rate-429 0.02
+    python mock_cnpq_server.py --record recordings/
+    python mock_cnpq_server.py --replay recordings/ --latency 0.1
+
+Point the scraper at it with:
+    CNPqScraper(base_url="http://127.0.0.1:8765/buscatextual", lattes_url="http://127.0.0.1:8765/lattes")
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import ssl
+import threading
+import time
+import zlib
+from urllib.parse import urlencode
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, web
+
+UPSTREAM_URL = "https://buscatextual.cnpq.br/buscatextual"
+UPSTREAM_LATTES_URL = "http://lattes.cnpq.br"
+
+FIRST_NAMES = [
+    'Ana', 'Bruno', 'Carla', 'Daniel', 'Eduardo', 'Fernanda', 'Gabriel', 'Helena', 'Igor', 'Juliana',
+    'Leonardo', 'Mariana', 'Nelson', 'Patrícia', 'Rafael', 'Sofia', 'Thiago', 'Vanessa', 'Alexandre', 'Márcio',
+]
+LAST_NAMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Carvalho', 'Ferreira', 'Almeida', 'Costa',
+    'Gomes', 'Ribeiro', 'Martins', 'Araújo', 'Barbosa', 'Cavalcanti', 'Mota', 'Sampaio', 'Filgueiras', 'Rocha',
+]
+INSTITUTIONS = [
+    'Universidade Federal de Pernambuco', 'Universidade de São Paulo', 'Universidade Estadual de Campinas',
+    'Universidade Federal do Rio de Janeiro', 'Universidade Federal do Rio Grande do Sul',
+    'Universidade Federal de Minas Gerais', 'Universidade de Brasília', 'Instituto Tecnológico de Aeronáutica',
+]
+RESEARCH_TOPICS = [
+    'métodos formais', 'verificação formal', 'model checking', 'provadores de teoremas como Coq e Isabelle',
+    'lógica temporal', 'análise estática de programas', 'semântica formal', 'especificação em Z e CSP',
+    'engenharia de software', 'sistemas concorrentes', 'refinamento de programas', 'testes baseados em modelos',
+]
+PROJECT_SUBJECTS = [
+    'Verificação Formal de Sistemas Embarcados Críticos', 'Desenvolvimento de Ferramentas para Model Checking',
+    'Semântica de Linguagens de Especificação Formal', 'Análise Estática de Software Ferroviário',
+    'Desenvolvimento de Sistemas Ciberfísicos Seguros', 'Provas Mecanizadas de Compiladores Verificados',
+]
+PARTNERS = ['Embraer', 'Petrobras', 'Motorola', 'Samsung', 'IBM', 'Microsoft']
+AGENCIES = ['CNPq', 'CAPES', 'FAPESP', 'FACEPE', 'FINEP', 'H2020']
+
+CAPTCHA_PAGE = """<html><head><title>Currículo Lattes</title>
+<script src="https://www.google.com/recaptcha/api.js"></script></head>
+<body><form id="formCaptcha" method="post" action="visualizacv.do">
+<p>Digite o código de segurança para visualizar o currículo.</p>
+<div class="g-recaptcha" data-sitekey="6LdLmock"></div>
+<input type="hidden" name="tokenCaptchar" value="{token}">
+<input type="hidden" name="id" value="{cnpq_id}">
+</form></body></html>"""
+
+
+def build_corpus(count, seed=42):
+    """Generate a deterministic list of synthetic researchers"""
+    rng = random.Random(seed)
+    corpus = []
+
+    for index in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+        institution = rng.choice(INSTITUTIONS)
+        topics = rng.sample(RESEARCH_TOPICS, 3)
+        project = rng.choice(PROJECT_SUBJECTS)
+        start_year = rng.randint(2005, 2022)
+
+        summary = (
+            f"Possui doutorado em Ciência da Computação pela {institution} ({start_year - rng.randint(3, 10)}). "
+            f"Atualmente é professor associado da {institution}. "
+            f"Tem experiência na área de Ciência da Computação, com ênfase em {topics[0]}, "
+            f"atuando principalmente nos seguintes temas: {topics[1]} e {topics[2]}. "
+            f"Coordena o projeto de pesquisa {project}, iniciado em {start_year}, "
+            f"financiado pelo {rng.choice(AGENCIES)}, em cooperação com a {rng.choice(PARTNERS)}."
+        )
+
+        corpus.append({
+            'cnpq_id': f"K{4000000 + index * 7919 % 1000000:07d}E{index % 10}",
+            'number': 10000000 + index,
+            'name': name,
+            'institution': institution,
+            'summary': summary,
+            'updated': f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2019, 2025)}",
+        })
+
+    return corpus
+
+
+def query_terms(query):
+    """Extract the idx_assunto words of a busca.do query expression"""
+    return [term.lower() for term in re.findall(r'idx_assunto:\(([^)]*)\)', query or '')]
+
+
+def recording_key(method, path, query, body=''):
+    """Stable key for a request, independent of query parameter order"""
+    canonical = f"{method.upper()} {path}?{urlencode(sorted(query))}\n{body}"
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+class RecordingStore:
+    """Responses recorded from the real sites: bodies under bodies/, metadata in index.jsonl"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.bodies_dir = os.path.join(directory, 'bodies')
+        self.index_path = os.path.join(directory, 'index.jsonl')
+        self.entries = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry['key']] = entry  # Later recordings win
+
+    def get(self, key):
+        """Return (status, content_type, body bytes) for a recorded request, or None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        with open(os.path.join(self.bodies_dir, f"{key}.z"), 'rb') as f:
+            return entry['status'], entry['content_type'], zlib.decompress(f.read())
+
+    def put(self, key, method, path, query, status, content_type, body):
+        """Save a response body and append its metadata to the index"""
+        entry = {
+            'key': key, 'method': method, 'path': path, 'query': query,
+            'status': status, 'content_type': content_type, 'recorded_at': time.time(),
+        }
+        with self._lock:
+            os.makedirs(self.bodies_dir, exist_ok=True)
+            with open(os.path.join(self.bodies_dir, f"{key}.z"), 'wb') as f:
+                f.write(zlib.compress(body))
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.entries[key] = entry
+
+
+class MockCNPqServer:
+    """aiohttp application imitating buscatextual.cnpq.br (under /buscatextual) and lattes.cnpq.br (under /lattes)
+
+    By default pages are generated from a synthetic corpus in which each
+    researcher matches a query with probability match_ratio. With record_dir the
+    server proxies to the real sites and records every response; with replay_dir
+    it serves only recorded responses. Fault injection applies in every mode.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, researchers=1000, seed=42, match_ratio=0.3,
+                 latency=0.0, latency_jitter=0.0, rate_429=0.0, captcha_rate=0.0, max_rps=None,
+                 record_dir=None, replay_dir=None, upstream_url=UPSTREAM_URL, upstream_lattes_url=UPSTREAM_LATTES_URL):
+        self.host = host
+        self.port = port
+        self.seed = seed
+        self.match_ratio = match_ratio
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.rate_429 = rate_429
+        self.captcha_rate = captcha_rate
+        self.max_rps = max_rps  # Above this request rate every request gets a 429
+        self.upstream_url = upstream_url.rstrip('/')
+        self.upstream_lattes_url = upstream_lattes_url.rstrip('/')
+        self.record_store = RecordingStore(record_dir) if record_dir else None
+        self.replay_store = RecordingStore(replay_dir) if replay_dir else None
+        self.corpus = [] if (record_dir or replay_dir) else build_corpus(researchers, seed)
+        self.by_id = {researcher['cnpq_id']: researcher for researcher in self.corpus}
+        self._matches = {}  # Normalized query words -> matching researchers, built on first request
+        self._rng = random.Random(seed)
+        self._tokens = float(max_rps or 0)
+        self._last_refill = time.monotonic()
+        self._upstream_session = None
+        self._runner = None
+        self._thread = None
+        self._thread_loop = None
+        self.stats = {'requests': 0, 'by_endpoint': {}, 'by_status': {}, 'injected_429': 0,
+                      'throttled_429': 0, 'injected_captchas': 0, 'replay_misses': 0}
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/buscatextual"
+
+    @property
+    def lattes_url(self):
+        return f"http://{self.host}:{self.port}/lattes"
+
+    def create_app(self):
+        """Build the aiohttp application"""
+        app = web.Application()
+        app.router.add_get('/__stats', self.handle_stats)
+        app.router.add_route('*', '/{path:.*}', self.handle)
+        app.on_cleanup.append(self._close_upstream)
+        return app
+
+    # ------------------------------------------------------------------ request handling
+
+    async def handle(self, request):
+        endpoint = request.path.rstrip('/').rsplit('/', 1)[-1]
+        if request.path.startswith('/lattes/'):
+            endpoint = 'lattes'
+        self.stats['requests'] += 1
+        self.stats['by_endpoint'][endpoint] = self.stats['by_endpoint'].get(endpoint, 0) + 1
+
+        response = await self._respond(request, endpoint)
+        self.stats['by_status'][response.status] = self.stats['by_status'].get(response.status, 0) + 1
+        return response
+
+    async def _respond(self, request, endpoint):
+        if self.latency or self.latency_jitter:
+            await asyncio.sleep(max(0.0, self._rng.gauss(self.latency, self.latency_jitter)))
+
+        if self._over_rate_limit():
+            self.stats['throttled_429'] += 1
+            return web.Response(status=429, text="Too Many Requests", headers={'Retry-After': '1'})
+        if self.rate_429 and self._rng.random() < self.rate_429:
+            self.stats['injected_429'] += 1
+            return web.Response(status=429, text="Too Many Requests", headers={'Retry-After': '1'})
+        if endpoint == 'preview.do' and self.captcha_rate and self._rng.random() < self.captcha_rate:
+            self.stats['injected_captchas'] += 1
+            return self._html(CAPTCHA_PAGE.format(token=self._token(), cnpq_id=request.query.get('id', '')))
+
+        if self.record_store:
+            return await self._proxy_and_record(request)
+        if self.replay_store:
+            return await self._replay(request)
+
+        if endpoint == 'busca.do':
+            return self._html(self.render_search_page(request.query))
+        if endpoint == 'preview.do':
+            researcher = self.by_id.get(request.query.get('id', ''))
+            if researcher is None:
+                return web.Response(status=404, text="Currículo não encontrado")
+            return self._html(self.render_preview_page(researcher))
+        if endpoint in ('visualizacv.do', 'lattes'):
+            # The real CV pages sit behind a reCaptcha
+            return self._html(CAPTCHA_PAGE.format(token=self._token(), cnpq_id=request.query.get('id', '')))
+        if request.path in ('/', '/buscatextual', '/buscatextual/'):
+            return self._html("<html><body><h1>Busca Textual (mock)</h1></body></html>")
+        return web.Response(status=404, text="Not Found")
+
+    async def handle_stats(self, request):
+        """Counters of requests served, as JSON"""
+        return web.json_response({**self.stats, 'by_status': {str(k): v for k, v in self.stats['by_status'].items()}})
+
+    def _over_rate_limit(self):
+        if not self.max_rps:
+            return False
+        now = time.monotonic()
+        self._tokens = min(float(self.max_rps), self._tokens + (now - self._last_refill) * self.max_rps)
+        self._last_refill = now
+        if self._tokens < 1.0:
+            return True
+        self._tokens -= 1.0
+        return False
+
+    def _token(self):
+        return f"{self._rng.getrandbits(64):016x}"
+
+    @staticmethod
+    def _html(text):
+        return web.Response(text=text, content_type='text/html', charset='utf-8')
+
+    # ------------------------------------------------------------------ synthetic pages
+
+    def matching_researchers(self, query):
+        """Researchers matching a query; deterministic per (query words, researcher) and cached per query words"""
+        terms = ' '.join(query_terms(query))
+        if not terms:
+            return []
+        if terms not in self._matches:
+            threshold = int(self.match_ratio * 1000)
+            self._matches[terms] = [
+                researcher for researcher in self.corpus
+                if zlib.crc32(f"{self.seed}|{terms}|{researcher['cnpq_id']}".encode('utf-8')) % 1000 < threshold
+            ]
+        return self._matches[terms]
+
+    def render_search_page(self, query):
+        """busca.do?metodo=forwardPaginaResultados result page with the pagination variables"""
+        matches = self.matching_researchers(query.get('query', ''))
+        start, _, size = query.get('registros', '0;10').partition(';')
+        start = int(start or 0)
+        size = int(size or 10)
+        page = matches[start:start + size]
+
+        items = []
+        for researcher in page:
+            items.append(
+                f"<li><b><a href=\"javascript:abreDetalhe('{researcher['cnpq_id']}',"
+                f"'{researcher['name'].replace(' ', '_')}',{researcher['number']},)\">{researcher['name']}</a></b>\n"
+                f"<br/>Doutorado em Ciência da Computação pela {researcher['institution']}, Brasil\n"
+                f"<br/>Professor Associado da {researcher['institution']}\n</li>"
+            )
+
+        body = f"<ol>\n{''.join(items)}\n</ol>" if items else "<p>Nenhum resultado foi encontrado para a busca.</p>"
+        return (
+            "<html><head><title>Busca Textual</title><script type=\"text/javascript\">\n"
+            f"var intLTotReg = {len(matches)};\nvar intLRegInicio = {start};\nvar intLRegPagina = {size};\n"
+            f"</script></head><body><div class=\"resultado\">\n{body}\n</div></body></html>"
+        )
+
+    def render_preview_page(self, researcher):
+        """preview.do?metodo=apresentar page with h1.name, p.resumo and the certification date"""
+        return (
+            "<html><head><title>Currículo Lattes</title></head><body><div class=\"infpessoa\">\n"
+            f"<h1 class=\"name\">{researcher['name']}</h1>\n"
+            "<ul class=\"informacoes-autor\">\n"
+            f"<li>Endereço para acessar este CV: http://lattes.cnpq.br/{researcher['number']}</li>\n"
+            f"<li>Certificado pelo autor em {researcher['updated']}</li>\n"
+            "</ul>\n"
+            f"<p class=\"resumo\">{researcher['summary']}</p>\n"
+            "</div></body></html>"
+        )
+
+    # ------------------------------------------------------------------ record / replay
+
+    def _upstream_for(self, path):
+        if path.startswith('/lattes/'):
+            return self.upstream_lattes_url + path[len('/lattes'):]
+        if path.startswith('/buscatextual'):
+            return self.upstream_url + path[len('/buscatextual'):]
+        return self.upstream_url.rsplit('/', 1)[0] + path
+
+    async def _request_key(self, request):
+        body = await request.text() if request.can_read_body else ''
+        return recording_key(request.method, request.path, list(request.query.items()), body), body
+
+    async def _replay(self, request):
+        key, _ = await self._request_key(request)
+        recorded = self.replay_store.get(key)
+        if recorded is None:
+            self.stats['replay_misses'] += 1
+            return web.Response(status=404, text=f"No recording for {request.method} {request.path_qs}")
+        status, content_type, body = recorded
+        return web.Response(status=status, body=body, content_type=content_type or 'text/html')
+
+    async def _proxy_and_record(self, request):
+        key, body = await self._request_key(request)
+        session = await self._get_upstream_session()
+        headers = {name: value for name, value in request.headers.items()
+                   if name.lower() not in ('host', 'content-length', 'accept-encoding')}
+
+        async with session.request(request.method, self._upstream_for(request.path), params=list(request.query.items()),
+                                   data=body or None, headers=headers) as upstream:
+            content = await upstream.read()
+            content_type = upstream.content_type
+            status = upstream.status
+
+        # Throttling responses are not worth replaying
+        if status != 429:
+            self.record_store.put(key, request.method, request.path, list(request.query.items()),
+                                  status, content_type, content)
+        return web.Response(status=status, body=content, content_type=content_type or 'text/html')
+
+    async def _get_upstream_session(self):
+        if self._upstream_session is None:
+            # The CNPq sites need the same permissive TLS settings as the scraper
+            ssl_context = ssl.create_default_context()
+            ssl_context.set_ciphers('DEFAULT@SECLEVEL=1')
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+            self._upstream_session = ClientSession(
+                connector=TCPConnector(ssl=ssl_context), timeout=ClientTimeout(total=30)
+            )
+        return self._upstream_session
+
+    async def _close_upstream(self, app):
+        if self._upstream_session is not None:
+            await self._upstream_session.close()
+            self._upstream_session = None
+
+    # ------------------------------------------------------------------ running
+
+    async def start_async(self):
+        """Start serving on the current event loop (port=0 picks a free port)"""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop_async(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self):
+        """Serve from a background thread with its own event loop, e.g. inside a benchmark"""
+        ready = threading.Event()
+
+        def run():
+            self._thread_loop = asyncio.new_event_loop()
+            self._thread_loop.run_until_complete(self.start_async())
+            ready.set()
+            self._thread_loop.run_forever()
+            self._thread_loop.run_until_complete(self.stop_async())
+            self._thread_loop.close()
+
+        self._thread = threading.Thread(target=run, name='mock-cnpq-server', daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        """Stop a server started with start_in_thread"""
+        if self._thread is not None:
+            self._thread_loop.call_soon_threadsafe(self._thread_loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def run(self):
+        """Serve until interrupted"""
+        web.run_app(self.create_app(), host=self.host, port=self.port, print=None)
+
+
+def parse_args(argv=None):
+    """Parse command line options for the mock server"""
+    parser = argparse.ArgumentParser(description="Local stand-in for the CNPq buscatextual and Lattes sites")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--researchers', type=int, default=1000, help="size of the synthetic corpus")
+    parser.add_argument('--seed', type=int, default=42, help="seed for the corpus and fault injection")
+    parser.add_argument('--match-ratio', type=float, default=0.3,
+                        help="fraction of the corpus matching each search query")
+    parser.add_argument('--latency', type=float, default=0.0, help="mean response latency in seconds")
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help="standard deviation of the latency")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="probability of answering 429")
+    parser.add_argument('--captcha-rate', type=float, default=0.0,
+                        help="probability of answering preview.do with a captcha page")
+    parser.add_argument('--max-rps', type=float, default=None, help="answer 429 above this many requests/second")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--record', metavar='DIR', help="proxy to the real sites and record responses into DIR")
+    mode.add_argument('--replay', metavar='DIR', help="serve only responses recorded in DIR")
+    parser.add_argument('--upstream-url', default=UPSTREAM_URL, help="buscatextual base URL used in record mode")
+    parser.add_argument('--upstream-lattes-url', default=UPSTREAM_LATTES_URL, help="Lattes URL used in record mode")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    server = MockCNPqServer(
+        host=args.host, port=args.port, researchers=args.researchers, seed=args.seed,
+        match_ratio=args.match_ratio, latency=args.latency, latency_jitter=args.latency_jitter,
+        rate_429=args.rate_429, captcha_rate=args.captcha_rate, max_rps=args.max_rps,
+        record_dir=args.record, replay_dir=args.replay,
+        upstream_url=args.upstream_url, upstream_lattes_url=args.upstream_lattes_url,
+    )
+
+    mode = 'recording' if args.record else 'replaying' if args.replay else f"{len(server.corpus)} synthetic researchers"
+    print(f"🧪 Mock CNPq server on http://{args.host}:{args.port} ({mode})")
+    print(f"   base_url:   {server.base_url}")
+    print(f"   lattes_url: {server.lattes_url}")
+    print(f"   stats:      http://{args.host}:{args.port}/__stats")
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,18 @@ Displays researchers and their formal methods projects with comprehensive detail
 
 import sqlite3
 import sys
+import re
 from datetime import datetime
 import json
 
+# The search terms that found researcher r, comma-joined
+SEARCH_TERMS_SQL = '''(SELECT group_concat(t.term, ', ') FROM researcher_terms rt
+                       JOIN search_terms t ON t.id = rt.term_id WHERE rt.researcher_id = r.id)'''
+
+def fts_query(text):
+    """FTS5 query matching every word of text as a prefix, e.g. 'verif form' -> '"verif"* "form"*'"""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
 class DetailedResultsViewer:
     def __init__(self, db_path='cnpq_researchers.db'):
         self.db_path = db_path
@@ -19,6 +28,20 @@ class DetailedResultsViewer:
             print(f"❌ Error connecting to database: {e}")
             sys.exit(1)
     
+    def project_table(self):
+        """canonical_projects (each project once, however many researchers list it) once built, else projects"""
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'canonical_projects'")
+        if self.cursor.fetchone():
+            self.cursor.execute("SELECT EXISTS (SELECT 1 FROM canonical_projects)")
+            if self.cursor.fetchone()[0]:
+                return 'canonical_projects'
+        return 'projects'
+    
+    def has_search_index(self):
+        """True if the scraper built the researchers_fts/projects_fts full-text tables"""
+        self.cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE name IN ('researchers_fts', 'projects_fts')")
+        return self.cursor.fetchone()[0] == 2
+    
     def show_menu(self):
         """Display the main menu"""
         print("\n" + "="*80)
@@ -34,6 +57,7 @@ class DetailedResultsViewer:
         print("8. 💡 Show projects by formal methods concepts")
         print("9. 📤 Export detailed data to JSON")
         print("10. 📈 Show project timeline analysis")
+        print("11. 🔎 Search projects by title, description, concepts or tools")
         print("0. 🚪 Exit")
         print("="*80)
     
@@ -42,8 +66,8 @@ class DetailedResultsViewer:
         print("\n📊 All Researchers with Project Information:")
         print("-" * 100)
         
-        query = '''
-        SELECT r.name, r.institution, r.last_update_date, r.search_term,
+        query = f'''
+        SELECT r.name, r.institution, r.last_update_date, {SEARCH_TERMS_SQL},
                COUNT(p.id) as total_projects,
                SUM(CASE WHEN p.is_formal_methods_related = 1 THEN 1 ELSE 0 END) as fm_projects,
                r.lattes_url
@@ -84,15 +108,22 @@ class DetailedResultsViewer:
         self.cursor.execute("SELECT COUNT(*) FROM researchers")
         total_researchers = self.cursor.fetchone()[0]
         
-        self.cursor.execute("SELECT COUNT(*) FROM projects")
+        project_table = self.project_table()
+        
+        self.cursor.execute(f"SELECT COUNT(*) FROM {project_table}")
         total_projects = self.cursor.fetchone()[0]
         
-        self.cursor.execute("SELECT COUNT(*) FROM projects WHERE is_formal_methods_related = 1")
+        self.cursor.execute(f"SELECT COUNT(*) FROM {project_table} WHERE is_formal_methods_related = 1")
         fm_projects = self.cursor.fetchone()[0]
         
+        self.cursor.execute("SELECT COUNT(*) FROM projects")
+        project_records = self.cursor.fetchone()[0]
+        
         print(f"📊 Basic Statistics:")
         print(f"   Total researchers: {total_researchers}")
         print(f"   Total projects: {total_projects}")
+        if project_table == 'canonical_projects':
+            print(f"   Project records across researchers: {project_records}")
         print(f"   Formal methods projects: {fm_projects} ({fm_projects/total_projects*100:.1f}%)" if total_projects > 0 else "   Formal methods projects: 0")
         
         # Top institutions
@@ -111,8 +142,8 @@ class DetailedResultsViewer:
             print(f"   {inst}: {count} researchers")
         
         # Projects with industry cooperation
-        self.cursor.execute('''
-            SELECT COUNT(*) FROM projects 
+        self.cursor.execute(f'''
+            SELECT COUNT(*) FROM {project_table} 
             WHERE industry_cooperation IS NOT NULL AND industry_cooperation != ""
         ''')
         industry_projects = self.cursor.fetchone()[0]
@@ -121,9 +152,9 @@ class DetailedResultsViewer:
         print(f"   Projects with industry cooperation: {industry_projects}")
         
         # Most common formal methods tools
-        self.cursor.execute('''
+        self.cursor.execute(f'''
             SELECT formal_methods_tools, COUNT(*) as count
-            FROM projects 
+            FROM {project_table} 
             WHERE formal_methods_tools IS NOT NULL AND formal_methods_tools != ""
             GROUP BY formal_methods_tools
             ORDER BY count DESC
@@ -136,9 +167,9 @@ class DetailedResultsViewer:
             print(f"   {tool}: {count} projects")
         
         # Project status distribution
-        self.cursor.execute('''
+        self.cursor.execute(f'''
             SELECT status, COUNT(*) as count
-            FROM projects 
+            FROM {project_table} 
             WHERE status IS NOT NULL AND status != ""
             GROUP BY status
             ORDER BY count DESC
@@ -156,19 +187,38 @@ class DetailedResultsViewer:
             print("No search term provided.")
             return
         
-        query = '''
-        SELECT r.name, r.institution, r.cnpq_id, r.last_update_date,
-               COUNT(p.id) as total_projects,
-               SUM(CASE WHEN p.is_formal_methods_related = 1 THEN 1 ELSE 0 END) as fm_projects
-        FROM researchers r
-        LEFT JOIN projects p ON r.cnpq_id = p.cnpq_id
-        WHERE r.name LIKE ? OR r.institution LIKE ?
-        GROUP BY r.cnpq_id
-        ORDER BY fm_projects DESC, total_projects DESC
-        '''
-        
-        search_pattern = f"%{search_term}%"
-        self.cursor.execute(query, (search_pattern, search_pattern))
+        match = fts_query(search_term)
+        if match and self.has_search_index():
+            # Ranked, accent-insensitive full-text match; name hits weigh most
+            query = '''
+            WITH hits AS (
+                SELECT rowid, bm25(researchers_fts, 10.0, 5.0, 1.0) AS score
+                FROM researchers_fts WHERE researchers_fts MATCH ?
+                ORDER BY score LIMIT 200
+            )
+            SELECT r.name, r.institution, r.cnpq_id, r.last_update_date,
+                   COUNT(p.id) as total_projects,
+                   SUM(CASE WHEN p.is_formal_methods_related = 1 THEN 1 ELSE 0 END) as fm_projects
+            FROM hits h
+            JOIN researchers r ON r.id = h.rowid
+            LEFT JOIN projects p ON r.cnpq_id = p.cnpq_id
+            GROUP BY r.id
+            ORDER BY h.score
+            '''
+            self.cursor.execute(query, (match,))
+        else:
+            query = '''
+            SELECT r.name, r.institution, r.cnpq_id, r.last_update_date,
+                   COUNT(p.id) as total_projects,
+                   SUM(CASE WHEN p.is_formal_methods_related = 1 THEN 1 ELSE 0 END) as fm_projects
+            FROM researchers r
+            LEFT JOIN projects p ON r.cnpq_id = p.cnpq_id
+            WHERE r.name LIKE ? OR r.institution LIKE ?
+            GROUP BY r.cnpq_id
+            ORDER BY fm_projects DESC, total_projects DESC
+            '''
+            search_pattern = f"%{search_term}%"
+            self.cursor.execute(query, (search_pattern, search_pattern))
         results = self.cursor.fetchall()
         
         if not results:
@@ -195,15 +245,30 @@ class DetailedResultsViewer:
             return
         
         # First find the researcher
-        query = '''
-        SELECT cnpq_id, name, institution, area, city, state, country, 
-               last_update_date, search_term, lattes_url
-        FROM researchers 
-        WHERE name LIKE ? OR cnpq_id = ?
-        '''
-        
-        search_pattern = f"%{search_term}%"
-        self.cursor.execute(query, (search_pattern, search_term))
+        columns = f'''r.cnpq_id, r.name, r.institution, r.area, r.city, r.state, r.country, 
+               r.last_update_date, {SEARCH_TERMS_SQL}, r.lattes_url'''
+        match = fts_query(search_term)
+        if match and self.has_search_index():
+            # An exact CNPq ID first, then name matches by rank
+            query = f'''
+            SELECT {columns} FROM researchers r WHERE r.cnpq_id = ?
+            UNION ALL
+            SELECT * FROM (
+                SELECT {columns}
+                FROM researchers_fts f JOIN researchers r ON r.id = f.rowid
+                WHERE researchers_fts MATCH ? AND r.cnpq_id != ?
+                ORDER BY f.rank
+            )
+            '''
+            self.cursor.execute(query, (search_term, f'name : ({match})', search_term))
+        else:
+            query = f'''
+            SELECT {columns}
+            FROM researchers r
+            WHERE r.name LIKE ? OR r.cnpq_id = ?
+            '''
+            search_pattern = f"%{search_term}%"
+            self.cursor.execute(query, (search_pattern, search_term))
         researchers = self.cursor.fetchall()
         
         if not researchers:
@@ -294,6 +359,53 @@ class DetailedResultsViewer:
         else:
             print(f"\n📋 No projects found for this researcher.")
     
+    def search_projects(self):
+        """Full-text search over project titles, descriptions, concepts and tools, best matches first"""
+        search_term = input("\n🔎 Enter words to look for in projects: ").strip()
+        if not search_term:
+            print("No search term provided.")
+            return
+        
+        match = fts_query(search_term)
+        if match and self.has_search_index():
+            query = '''
+            SELECT r.name, p.title, p.start_date, p.end_date,
+                   snippet(projects_fts, 1, '[', ']', '...', 12), p.is_formal_methods_related
+            FROM projects_fts
+            JOIN projects p ON p.id = projects_fts.rowid
+            JOIN researchers r ON r.cnpq_id = p.cnpq_id
+            WHERE projects_fts MATCH ?
+            ORDER BY bm25(projects_fts, 10.0, 1.0, 3.0, 3.0)
+            LIMIT 50
+            '''
+            self.cursor.execute(query, (match,))
+        else:
+            query = '''
+            SELECT r.name, p.title, p.start_date, p.end_date, substr(p.description, 1, 80), p.is_formal_methods_related
+            FROM projects p
+            JOIN researchers r ON r.cnpq_id = p.cnpq_id
+            WHERE p.title LIKE ? OR p.description LIKE ?
+               OR p.formal_methods_concepts LIKE ? OR p.formal_methods_tools LIKE ?
+            LIMIT 50
+            '''
+            self.cursor.execute(query, (f"%{search_term}%",) * 4)
+        projects = self.cursor.fetchall()
+        
+        if not projects:
+            print(f"No projects found matching '{search_term}'")
+            return
+        
+        print(f"\n📋 Projects matching '{search_term}':")
+        print("-" * 80)
+        
+        for i, (name, title, start_date, end_date, excerpt, is_fm) in enumerate(projects, 1):
+            print(f"{i}. {'🎯 ' if is_fm else ''}{title}")
+            print(f"   👤 Researcher: {name}")
+            print(f"   📅 Period: {start_date or '?'} - {end_date or '?'}")
+            if excerpt:
+                print(f"   📝 {excerpt}")
+            print()
+    
     def show_formal_methods_projects(self):
         """Show only formal methods related projects"""
         print("\n🎯 Formal Methods Projects:")
@@ -365,9 +477,9 @@ class DetailedResultsViewer:
         print("\n📤 Exporting data to JSON...")
         
         # Get all researchers with their projects
-        query = '''
+        query = f'''
         SELECT r.cnpq_id, r.name, r.institution, r.area, r.city, r.state, r.country,
-               r.last_update_date, r.search_term, r.lattes_url
+               r.last_update_date, {SEARCH_TERMS_SQL}, r.lattes_url
         FROM researchers r
         ORDER BY r.name
         '''
@@ -444,8 +556,10 @@ class DetailedResultsViewer:
         print("\n📈 Project Timeline Analysis:")
         print("-" * 60)
         
+        project_table = self.project_table()
+        
         # Projects by year
-        query = '''
+        query = f'''
         SELECT 
             CASE 
                 WHEN start_date LIKE '%-%' THEN substr(start_date, 1, 4)
@@ -454,7 +568,7 @@ class DetailedResultsViewer:
             END as year,
             COUNT(*) as total_projects,
             SUM(CASE WHEN is_formal_methods_related = 1 THEN 1 ELSE 0 END) as fm_projects
-        FROM projects 
+        FROM {project_table} 
         WHERE start_date IS NOT NULL AND start_date != ""
         GROUP BY year
         ORDER BY year DESC
@@ -474,8 +588,8 @@ class DetailedResultsViewer:
                 print(f"{year:<6} {total:<8} {fm:<6} {fm_percent:.1f}%")
         
         # Active projects
-        query = '''
-        SELECT COUNT(*) FROM projects 
+        query = f'''
+        SELECT COUNT(*) FROM {project_table} 
         WHERE status LIKE '%andamento%' OR status LIKE '%atual%' OR status LIKE '%current%'
         '''
         
@@ -515,6 +629,8 @@ class DetailedResultsViewer:
                     self.export_to_json()
                 elif choice == '10':
                     self.show_timeline_analysis()
+                elif choice == '11':
+                    self.search_projects()
                 else:
                     print("❌ Invalid option. Please try again.")
                 
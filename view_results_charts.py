@@ -18,6 +18,15 @@ from datetime import datetime
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
+# Researchers found per search term; a researcher found by several terms counts under each
+TERM_COUNTS_SQL = '''
+    SELECT t.term, COUNT(*) as count 
+    FROM researcher_terms rt
+    JOIN search_terms t ON t.id = rt.term_id
+    GROUP BY rt.term_id 
+    ORDER BY count DESC
+'''
+
 def connect_database():
     """Connect to the SQLite database"""
     try:
@@ -38,13 +47,7 @@ def generate_search_terms_chart(conn):
     print("📊 Generating search terms distribution chart...")
     
     cursor = conn.cursor()
-    cursor.execute('''
-        SELECT search_term, COUNT(*) as count 
-        FROM researchers 
-        GROUP BY search_term 
-        ORDER BY count DESC
-        LIMIT 15
-    ''')
+    cursor.execute(TERM_COUNTS_SQL + 'LIMIT 15')
     
     data = cursor.fetchall()
     terms = [row[0][:30] + '...' if len(row[0]) > 30 else row[0] for row in data]  # Truncate long terms
@@ -192,7 +195,7 @@ def generate_research_overview_chart(conn):
     cursor.execute('SELECT COUNT(*) FROM researchers')
     total_researchers = cursor.fetchone()[0]
     
-    cursor.execute('SELECT COUNT(DISTINCT search_term) FROM researchers')
+    cursor.execute('SELECT COUNT(*) FROM search_terms')
     total_terms = cursor.fetchone()[0]
     
     cursor.execute('SELECT COUNT(DISTINCT institution) FROM researchers WHERE institution != ""')
@@ -215,13 +218,7 @@ def generate_research_overview_chart(conn):
     ax1.axis('off')
     
     # Chart 2: Search terms pie chart (top 8)
-    cursor.execute('''
-        SELECT search_term, COUNT(*) as count 
-        FROM researchers 
-        GROUP BY search_term 
-        ORDER BY count DESC 
-        LIMIT 8
-    ''')
+    cursor.execute(TERM_COUNTS_SQL + 'LIMIT 8')
     term_data = cursor.fetchall()
     
     if term_data:
@@ -276,59 +273,34 @@ def generate_term_correlation_heatmap(conn):
     print("🔥 Generating search term correlation heatmap...")
     
     cursor = conn.cursor()
-    cursor.execute('SELECT cnpq_id, search_term FROM researchers')
-    data = cursor.fetchall()
-    
-    # Create a matrix of researchers vs terms
-    researcher_terms = {}
-    all_terms = set()
-    
-    for cnpq_id, search_term in data:
-        if cnpq_id not in researcher_terms:
-            researcher_terms[cnpq_id] = set()
-        
-        # Split multiple terms
-        terms = [term.strip() for term in search_term.split(',')]
-        for term in terms:
-            researcher_terms[cnpq_id].add(term)
-            all_terms.add(term)
     
     # Get top terms only (to make heatmap readable)
     cursor.execute('''
-        SELECT search_term, COUNT(*) as count 
-        FROM researchers 
-        GROUP BY search_term 
+        SELECT rt.term_id, t.term, COUNT(*) as count 
+        FROM researcher_terms rt
+        JOIN search_terms t ON t.id = rt.term_id
+        GROUP BY rt.term_id 
         ORDER BY count DESC 
         LIMIT 10
     ''')
-    
-    top_terms = [row[0] for row in cursor.fetchall()]
-    
-    # Create correlation matrix
+    top = cursor.fetchall()
+    top_terms = [term for _, term, _ in top]
+    index = {term_id: i for i, (term_id, _, _) in enumerate(top)}
+    
+    # Researchers found by both terms of each pair, counted with a self-join on researcher_terms
+    marks = ', '.join('?' * len(index))
+    cursor.execute(f'''
+        SELECT a.term_id, b.term_id, COUNT(*) 
+        FROM researcher_terms a
+        JOIN researcher_terms b ON b.researcher_id = a.researcher_id
+        WHERE a.term_id IN ({marks}) AND b.term_id IN ({marks})
+        GROUP BY a.term_id, b.term_id
+    ''', list(index) * 2)
+    
+    # Share of term1's researchers that term2 also found
     correlation_matrix = np.zeros((len(top_terms), len(top_terms)))
-    
-    for i, term1 in enumerate(top_terms):
-        for j, term2 in enumerate(top_terms):
-            if i == j:
-                correlation_matrix[i][j] = 1.0
-            else:
-                # Count researchers that have both terms
-                common_researchers = 0
-                term1_researchers = 0
-                
-                for cnpq_id, terms in researcher_terms.items():
-                    has_term1 = any(term1 in term for term in terms)
-                    has_term2 = any(term2 in term for term in terms)
-                    
-                    if has_term1:
-                        term1_researchers += 1
-                        if has_term2:
-                            common_researchers += 1
-                
-                if term1_researchers > 0:
-                    correlation_matrix[i][j] = common_researchers / term1_researchers
-                else:
-                    correlation_matrix[i][j] = 0
+    for term1, term2, common_researchers in cursor.fetchall():
+        correlation_matrix[index[term1]][index[term2]] = common_researchers / top[index[term1]][2]
     
     # Create heatmap
     plt.figure(figsize=(12, 10))
@@ -366,13 +338,13 @@ def generate_summary_report(conn):
     cursor.execute('SELECT COUNT(*) FROM researchers')
     total = cursor.fetchone()[0]
     
-    cursor.execute('SELECT COUNT(DISTINCT search_term) FROM researchers')
+    cursor.execute('SELECT COUNT(*) FROM search_terms')
     unique_terms = cursor.fetchone()[0]
     
     cursor.execute('SELECT COUNT(DISTINCT institution) FROM researchers WHERE institution != ""')
     unique_institutions = cursor.fetchone()[0]
     
-    cursor.execute('SELECT search_term, COUNT(*) FROM researchers GROUP BY search_term ORDER BY COUNT(*) DESC LIMIT 1')
+    cursor.execute(TERM_COUNTS_SQL + 'LIMIT 1')
     top_term_data = cursor.fetchone()
     
     cursor.execute('SELECT institution, COUNT(*) FROM researchers WHERE institution != "" GROUP BY institution ORDER BY COUNT(*) DESC LIMIT 1')
@@ -5,8 +5,17 @@ Script to view and analyze the scraped CNPq researcher data.
 
 import sqlite3
 import sys
+import re
 from datetime import datetime
 
+# The search terms that found researcher r, comma-joined
+SEARCH_TERMS_SQL = '''(SELECT group_concat(t.term, ', ') FROM researcher_terms rt
+                       JOIN search_terms t ON t.id = rt.term_id WHERE rt.researcher_id = r.id)'''
+
+def fts_query(text):
+    """FTS5 query matching every word of text as a prefix, e.g. 'verif form' -> '"verif"* "form"*'"""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
 def connect_database():
     """Connect to the SQLite database"""
     try:
@@ -24,10 +33,10 @@ def view_all_researchers(conn):
     
     print(f"\n=== Total Researchers: {total} ===\n")
     
-    cursor.execute("""
-        SELECT cnpq_id, name, institution, area, city, state, country, search_term 
-        FROM researchers 
-        ORDER BY name
+    cursor.execute(f"""
+        SELECT r.cnpq_id, r.name, r.institution, r.area, r.city, r.state, r.country, {SEARCH_TERMS_SQL}
+        FROM researchers r
+        ORDER BY r.name
     """)
     
     results = cursor.fetchall()
@@ -39,7 +48,7 @@ def view_all_researchers(conn):
         print(f"   Institution: {institution or 'N/A'}")
         print(f"   Area: {area or 'N/A'}")
         print(f"   Location: {', '.join(filter(None, [city, state, country])) or 'N/A'}")
-        print(f"   Search Term: {search_term}")
+        print(f"   Search Terms: {search_term}")
         print(f"   Lattes URL: http://lattes.cnpq.br/{cnpq_id}")
         print("-" * 80)
 
@@ -54,8 +63,12 @@ def view_statistics(conn):
     total = cursor.fetchone()[0]
     print(f"Total Researchers: {total}")
     
-    # By search term
-    cursor.execute("SELECT search_term, COUNT(*) FROM researchers GROUP BY search_term")
+    # By search term (a researcher found by several terms counts under each)
+    cursor.execute("""
+        SELECT t.term, COUNT(*) FROM researcher_terms rt
+        JOIN search_terms t ON t.id = rt.term_id
+        GROUP BY rt.term_id ORDER BY COUNT(*) DESC
+    """)
     search_terms = cursor.fetchall()
     print("\nBy Search Term:")
     for term, count in search_terms:
@@ -84,14 +97,25 @@ def view_statistics(conn):
         print(f"  {institution}: {count}")
 
 def search_researchers(conn, search_query):
-    """Search for researchers by name or institution"""
+    """Search for researchers by name, institution or area (ranked full-text search when indexed)"""
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT cnpq_id, name, institution, area, city, state, country 
-        FROM researchers 
-        WHERE name LIKE ? OR institution LIKE ?
-        ORDER BY name
-    """, (f"%{search_query}%", f"%{search_query}%"))
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'researchers_fts'")
+    match = fts_query(search_query)
+    if match and cursor.fetchone():
+        cursor.execute("""
+            SELECT r.cnpq_id, r.name, r.institution, r.area, r.city, r.state, r.country
+            FROM researchers_fts f
+            JOIN researchers r ON r.id = f.rowid
+            WHERE researchers_fts MATCH ?
+            ORDER BY bm25(researchers_fts, 10.0, 5.0, 1.0)
+        """, (match,))
+    else:
+        cursor.execute("""
+            SELECT cnpq_id, name, institution, area, city, state, country 
+            FROM researchers 
+            WHERE name LIKE ? OR institution LIKE ?
+            ORDER BY name
+        """, (f"%{search_query}%", f"%{search_query}%"))
     
     results = cursor.fetchall()
     
@@ -116,10 +140,11 @@ def export_to_csv(conn, filename="researchers.csv"):
     import csv
     
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT cnpq_id, name, institution, area, city, state, country, lattes_url, search_term, created_at
-        FROM researchers 
-        ORDER BY name
+    cursor.execute(f"""
+        SELECT r.cnpq_id, r.name, r.institution, r.area, r.city, r.state, r.country, r.lattes_url,
+               {SEARCH_TERMS_SQL}, r.created_at
+        FROM researchers r
+        ORDER BY r.name
     """)
     
     results = cursor.fetchall()